@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+Timing and consistency check for tracker.anomalies.
+
+Seeds a user with --rows expenses over several years in a throwaway test
+database, with a few planted outliers (single large expenses and days of
+heavy spending), then runs the detectors on every available backend:
+
+    python scripts/bench_anomalies.py               # 100k expenses
+    python scripts/bench_anomalies.py --rows 10000 --max-ms 500
+
+Prints the time to load the series and to score it, per backend. A second
+user has a short history: SHORT_HISTORY ordinary food expenses and one
+outlier, which must be flagged too. Exits with status 1 when the NumPy and
+``array`` backends disagree, a planted outlier is missed, or detection (load
+included) is slower than --max-ms.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from tracker import anomalies
+from tracker.models import Transaction
+
+YEARS = 5
+PLANTED_EXPENSES = 20
+PLANTED_DAYS = 5
+# fewer expenses than ANOMALY_STEP, but more than ANOMALY_MIN_HISTORY
+SHORT_HISTORY = 25
+
+
+def seed(rows, rnd):
+    """Create the user; returns (user, planted expense descriptions, planted days)."""
+    user = User.objects.create_user(username="bench_anomalies", password="bench-pw")
+    today = timezone.now().date()
+    categories = [code for code, _ in Transaction.CATEGORY_CHOICES]
+    span = 365 * YEARS
+
+    def expense(day, category, amount, description):
+        return Transaction(
+            user=user, amount=amount, type=Transaction.EXPENSE, category=category,
+            description=description, date=today - timedelta(days=day),
+        )
+
+    batch = []
+    for i in range(rows):
+        batch.append(expense(
+            rnd.randint(0, span), rnd.choice(categories),
+            Decimal(rnd.randint(5000, 50000)) / 100, f"bench expense {i}",
+        ))
+        if len(batch) >= 5000:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    # far above the 50-500 rupee range, late enough to have a baseline
+    for i in range(PLANTED_EXPENSES):
+        batch.append(expense(
+            rnd.randint(0, span // 2), rnd.choice(categories), Decimal("25000.00"), f"planted {i}",
+        ))
+    # one extra expense per planted day that alone dwarfs a normal day
+    planted_days = set()
+    for i in range(PLANTED_DAYS):
+        day = rnd.randint(0, span // 2)
+        planted_days.add(today - timedelta(days=day))
+        batch.append(expense(day, rnd.choice(categories), Decimal("400000.00"), f"spike {i}"))
+    Transaction.objects.bulk_create(batch)
+    planted = set(
+        Transaction.objects.filter(user=user, description__startswith="planted").values_list("id", flat=True)
+    )
+    return user, planted, planted_days
+
+
+def seed_short_history(rnd):
+    """A user with a short food history and one 50x outlier; returns (user, outlier id)."""
+    user = User.objects.create_user(username="bench_anomalies_short", password="bench-pw")
+    today = timezone.now().date()
+    Transaction.objects.bulk_create([
+        Transaction(
+            user=user, amount=Decimal(rnd.randint(15000, 25000)) / 100, type=Transaction.EXPENSE,
+            category=Transaction.CATEGORY_FOOD, date=today - timedelta(days=SHORT_HISTORY - i),
+        )
+        for i in range(SHORT_HISTORY)
+    ])
+    outlier = Transaction.objects.create(
+        user=user, amount=Decimal("10000.00"), type=Transaction.EXPENSE,
+        category=Transaction.CATEGORY_FOOD, date=today,
+    )
+    return user, outlier.pk
+
+
+def run(user):
+    started = time.perf_counter()
+    series = anomalies.load_expense_series(user)
+    loaded = time.perf_counter()
+    unusual = anomalies.unusual_expenses(series)
+    spikes = anomalies.spending_spikes(series)
+    done = time.perf_counter()
+    return unusual, spikes, (loaded - started) * 1000, (done - loaded) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--max-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    user, planted, planted_days = seed(args.rows, random.Random(11))
+    short_user, short_outlier = seed_short_history(random.Random(12))
+
+    numpy = anomalies.np
+    backends = [("numpy", numpy)] if numpy is not None else []
+    backends.append(("array", None))
+
+    failures, results = [], {}
+    for name, module in backends:
+        anomalies.np = module
+        try:
+            run(user)  # warm the page cache and the import
+            unusual, spikes, load_ms, score_ms = run(user)
+        finally:
+            anomalies.np = numpy
+        results[name] = (unusual, spikes)
+        print(f"{name:6} load {load_ms:8.1f}ms  score {score_ms:8.1f}ms  "
+              f"unusual={len(unusual)} spikes={len(spikes)}")
+        if args.max_ms and load_ms + score_ms > args.max_ms:
+            failures.append(f"{name}: {load_ms + score_ms:.1f}ms > {args.max_ms:.1f}ms")
+
+        anomalies.np = module
+        try:
+            short_unusual = anomalies.unusual_expenses(anomalies.load_expense_series(short_user))
+        finally:
+            anomalies.np = numpy
+        if short_outlier not in {item["id"] for item in short_unusual}:
+            failures.append(f"{name}: outlier in a {SHORT_HISTORY}-expense history not flagged")
+
+        missed = planted - {item["id"] for item in unusual}
+        if missed:
+            failures.append(f"{name}: {len(missed)} planted expenses not flagged")
+        missed_days = planted_days - {item["date"] for item in spikes}
+        if missed_days:
+            failures.append(f"{name}: {len(missed_days)} planted spending days not flagged")
+
+    if len(results) > 1 and results["numpy"] != results["array"]:
+        failures.append("numpy and array backends disagree")
+
+    if failures:
+        print("\nFAILED:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("\nAnomalies OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
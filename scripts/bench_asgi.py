@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+"""
+Throughput of the async dashboard (/tracker/dashboard/full/) under WSGI and
+ASGI, with concurrent HTTP clients against real local servers.
+
+A fresh database file is migrated and seeded with --users users. Then each
+configuration is started in turn and loaded by --clients keep-alive clients
+for --seconds. Every client cycles through the users' sessions:
+
+    wsgi-serial  manage.py runserver (threaded WSGI), one dashboard thread,
+                 so the panels are built one after the other
+    wsgi         manage.py runserver, --threads dashboard threads
+    asgi         uvicorn, one event loop, --threads dashboard threads
+
+    python scripts/bench_asgi.py
+    python scripts/bench_asgi.py --clients 16 --seconds 20 --cache locmem
+
+By default the servers run with SAVIFY_CACHE_BACKEND=dummy, so every request
+builds every panel. Requires uvicorn (``pip install uvicorn``).
+"""
+import argparse
+import http.client
+import importlib.util
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+URL = "/tracker/dashboard/full/"
+
+
+def seed(users, transactions):
+    """Create the users with history; returns their session cookies."""
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from django.utils import timezone
+
+    from tracker import health, ledger, rollups
+    from tracker.badges import evaluate_badges
+    from tracker.models import MonthlyBudget, SavingsGoal, Transaction
+
+    rnd = random.Random(5)
+    today = timezone.now().date()
+    categories = [code for code, _ in Transaction.CATEGORY_CHOICES]
+    user_ids, cookies = [], []
+    for n in range(users):
+        user = User.objects.create_user(username=f"bench_asgi_{n}", password="bench-pw")
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    user=user,
+                    amount=Decimal(rnd.randint(100, 500000)) / 100,
+                    type=Transaction.INCOME if rnd.random() < 0.25 else Transaction.EXPENSE,
+                    category=rnd.choice(categories),
+                    description=f"bench transaction {i}",
+                    date=today - timedelta(days=rnd.randint(0, 365 * 3)),
+                )
+                for i in range(transactions)
+            ],
+            batch_size=5000,
+        )
+        MonthlyBudget.objects.create(
+            user=user, year=today.year, month=today.month, budget_amount=Decimal("20000")
+        )
+        SavingsGoal.objects.create(
+            user=user, name="Laptop", target_amount=Decimal("50000"),
+            start_date=today - timedelta(days=60), end_date=today + timedelta(days=180),
+        )
+        client = Client()
+        client.force_login(user)
+        cookies.append(f"sessionid={client.cookies['sessionid'].value}")
+        user_ids.append(user.pk)
+    rollups.rebuild(user_ids)
+    ledger.rebuild(user_ids)
+    evaluate_badges(user_ids)
+    health.refresh_snapshots(user_ids)
+    return cookies
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(port, server, timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server did not listen on port {port}")
+
+
+def load(port, cookies, clients, seconds):
+    """Drive the server with ``clients`` threads; returns (latencies in ms, errors)."""
+    latencies, errors = [], Counter()
+    lock = threading.Lock()
+    deadline = time.time() + seconds
+
+    def client(index):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        mine, failed = [], Counter()
+        request = index
+        while time.time() < deadline:
+            cookie = cookies[request % len(cookies)]
+            request += clients
+            started = time.perf_counter()
+            try:
+                connection.request("GET", URL, headers={"Cookie": cookie})
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                failed[type(exc).__name__] += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+                continue
+            if response.status != 200:
+                failed[f"HTTP {response.status}"] += 1
+                continue
+            mine.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(mine)
+            errors.update(failed)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
+
+
+def server_command(kind, port):
+    if kind == "asgi":
+        return [
+            sys.executable, "-m", "uvicorn", "student_budget_tracker.asgi:application",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ]
+    return [
+        sys.executable, os.path.join(ROOT, "manage.py"), "runserver",
+        "--noreload", "--skip-checks", f"127.0.0.1:{port}",
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--transactions", type=int, default=3000, help="history rows per user")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--threads", type=int, default=4, help="SAVIFY_DASHBOARD_THREADS")
+    parser.add_argument("--cache", default="dummy", help="SAVIFY_CACHE_BACKEND of the servers")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("uvicorn") is None:
+        print("uvicorn is not installed: pip install uvicorn")
+        return 1
+
+    configs = [
+        ("wsgi-serial", "wsgi", 1),
+        ("wsgi", "wsgi", args.threads),
+        ("asgi", "asgi", args.threads),
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["SAVIFY_DB_PATH"] = os.path.join(directory, "bench.sqlite3")
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+        import django
+
+        django.setup()
+        from django.core.management import call_command
+        from django.db import connections
+
+        call_command("migrate", verbosity=0)
+        started = time.perf_counter()
+        cookies = seed(args.users, args.transactions)
+        connections.close_all()
+        print(f"Seeded {args.users} users x {args.transactions} transactions "
+              f"in {time.perf_counter() - started:.1f}s\n")
+
+        for name, kind, threads in configs:
+            port = free_port()
+            env = {
+                **os.environ,
+                "SAVIFY_CACHE_BACKEND": args.cache,
+                "SAVIFY_DASHBOARD_THREADS": str(threads),
+                "PYTHONUNBUFFERED": "1",
+            }
+            server = subprocess.Popen(
+                server_command(kind, port), cwd=ROOT, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for(port, server)
+                load(port, cookies[:1], 1, 1.0)  # warm-up: imports, templates
+                latencies, errors = load(port, cookies, args.clients, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{name:12} {len(latencies) / args.seconds:7.1f} req/s  "
+                  f"p50 {percentile(latencies, 50):8.1f}ms  p95 {percentile(latencies, 95):8.1f}ms  "
+                  f"failed {sum(errors.values())}")
+            for message, count in errors.most_common():
+                print(f"             {count:5} x {message}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
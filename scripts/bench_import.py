@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+"""
+Throughput check for the bank statement importer.
+
+Writes a synthetic statement (bank layout: date, narration, withdrawal and
+deposit columns) to a temporary file, imports it into a throwaway test
+database, imports it again to exercise deduplication, and checks that the
+incrementally maintained rollups and balance ledger match a full rebuild.
+It also imports a small statement of same-day rows and pages through it
+with the keyset cursor, which must return every row. Last, two processes
+import one statement into a database file at the same moment, and each row
+must be created once and skipped once, without errors:
+
+    python scripts/bench_import.py                    # 100k rows
+    python scripts/bench_import.py --rows 20000 --min-rate 8000
+
+The accepted throughput is the default --min-rate, MIN_RATE rows a second
+for the first import. On the single-core reference machine, 100k rows
+import at about 5.5k to 7k rows/s. Nearly half of that time is the FTS5
+search triggers indexing each inserted row (tracker.search). Mapping,
+validating and fingerprinting the rows in Python take about a quarter.
+
+Exits with status 1 when the derived tables disagree, the re-import inserts
+anything, paging skips an imported row, the concurrent imports fail or
+duplicate a row, or the first import is slower than --min-rate rows per
+second.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import setup_test_environment
+
+from tracker import ledger, rollups
+from tracker.importer import import_transactions
+from tracker.models import DailyBalance, MonthlyRollup, Transaction
+from tracker.pagination import keyset_page
+
+SAME_DAY_ROWS = 7
+PAGE_SIZE = 3
+CONCURRENT_ROWS = 5000
+MIN_RATE = 4000
+
+
+def write_statement(path, rows, rnd):
+    start = date.today() - timedelta(days=365 * 4)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["Txn Date", "Narration", "Withdrawal Amt", "Deposit Amt"])
+        for i in range(rows):
+            day = start + timedelta(days=rnd.randint(0, 365 * 4))
+            amount = f"{rnd.randint(100, 900000) / 100:,.2f}"
+            credit = rnd.random() < 0.3
+            writer.writerow([
+                day.strftime("%d/%m/%Y"),
+                f"UPI/{rnd.randint(1, 500)}/merchant",
+                "" if credit else amount,
+                amount if credit else "",
+            ])
+
+
+def rollup_state(user):
+    return sorted(
+        MonthlyRollup.objects.filter(user=user)
+        .values_list("year", "month", "category", "type", "total", "count")
+    )
+
+
+def ledger_state(user):
+    return list(DailyBalance.objects.filter(user=user).order_by("date").values_list("date", "net", "balance"))
+
+
+def same_day_paging_problem(path):
+    """
+    Import SAME_DAY_ROWS rows dated the same day (one insert, so one
+    ``created_at``) and page through them PAGE_SIZE at a time. The cursor
+    compares ``created_at`` for equality, so it only works when bulk-inserted
+    timestamps are stored like ORM-saved ones.
+    """
+    user = User.objects.create_user(username="bench_import_paging", password="bench-pw")
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["Txn Date", "Narration", "Withdrawal Amt", "Deposit Amt"])
+        for i in range(SAME_DAY_ROWS):
+            writer.writerow([date.today().strftime("%d/%m/%Y"), f"same day {i}", f"{i + 1}.00", ""])
+    with open(path, newline="", encoding="utf-8") as stream:
+        import_transactions(user, stream)
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = keyset_page(Transaction.objects.filter(user=user), cursor, PAGE_SIZE)
+        seen.extend(tx.pk for tx in rows)
+        if not cursor:
+            break
+    if sorted(seen) != sorted(Transaction.objects.filter(user=user).values_list("pk", flat=True)):
+        return f"paging returned {len(set(seen))} of {SAME_DAY_ROWS} same-day imported rows"
+    return None
+
+
+def run_concurrent_child(role, path, start_at):
+    """
+    In a child process on the SAVIFY_DB_PATH file: ``setup`` migrates it and
+    creates the importing user; ``import`` imports ``path`` at ``start_at``
+    and prints the outcome as one JSON line.
+    """
+    from django.core.management import call_command
+
+    if role == "setup":
+        call_command("migrate", verbosity=0)
+        User.objects.create_user(username="bench_import_concurrent", password="bench-pw")
+        return 0
+    user = User.objects.get(username="bench_import_concurrent")
+    time.sleep(max(0.0, start_at - time.time()))
+    try:
+        with open(path, newline="", encoding="utf-8") as stream:
+            result = import_transactions(user, stream)
+    except Exception as exc:
+        print(json.dumps({"error": f"{type(exc).__name__}: {exc}"}))
+    else:
+        print(json.dumps({"created": result.created, "duplicates": result.duplicates}))
+    return 0
+
+
+def concurrent_import_problem(tmp):
+    """
+    Two processes import the same CONCURRENT_ROWS-row statement into one
+    database file at once. The duplicate check and the insert share one
+    transaction, so one import must create every row and the other skip
+    every row as a duplicate.
+    """
+    path = os.path.join(tmp, "concurrent.csv")
+    write_statement(path, CONCURRENT_ROWS, random.Random(20))
+    env = {**os.environ, "SAVIFY_DB_PATH": os.path.join(tmp, "concurrent.sqlite3")}
+    command = [sys.executable, os.path.abspath(__file__), "--concurrent-child"]
+    subprocess.run([*command, "setup", path, "0"], env=env, check=True, stdout=subprocess.DEVNULL)
+    start_at = str(time.time() + 3)
+    children = [
+        subprocess.Popen([*command, "import", path, start_at], env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(2)
+    ]
+    outcomes = [json.loads(child.communicate()[0].splitlines()[-1]) for child in children]
+    errors = [outcome["error"] for outcome in outcomes if "error" in outcome]
+    if errors:
+        return f"concurrent import failed: {errors[0]}"
+    if sum(outcome["created"] for outcome in outcomes) != CONCURRENT_ROWS:
+        return f"concurrent imports created {[outcome['created'] for outcome in outcomes]} rows"
+    return None
+
+
+def timed_import(user, path):
+    started = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as stream:
+        result = import_transactions(user, stream)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--min-rate", type=float, default=MIN_RATE)
+    parser.add_argument("--concurrent-child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.concurrent_child:
+        return run_concurrent_child(*args.concurrent_child[:2], float(args.concurrent_child[2]))
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    user = User.objects.create_user(username="bench_import", password="bench-pw")
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statement.csv")
+        write_statement(path, args.rows, random.Random(7))
+
+        result, elapsed = timed_import(user, path)
+        rate = result.rows / elapsed
+        print(f"import     {result.rows:8} rows {elapsed:7.2f}s {rate:9.0f} rows/s  "
+              f"created={result.created} skipped={result.error_count}")
+        if rate < args.min_rate:
+            failures.append(f"import rate {rate:.0f} rows/s < {args.min_rate:.0f}")
+
+        incremental = rollup_state(user)
+        rollups.rebuild([user.pk])
+        if incremental != rollup_state(user):
+            failures.append("incremental rollups differ from a full rebuild")
+        incremental = ledger_state(user)
+        ledger.rebuild([user.pk])
+        if incremental != ledger_state(user):
+            failures.append("incremental balance ledger differs from a full rebuild")
+
+        again, elapsed = timed_import(user, path)
+        print(f"re-import  {again.rows:8} rows {elapsed:7.2f}s {again.rows / elapsed:9.0f} rows/s  "
+              f"created={again.created} duplicates={again.duplicates}")
+        if again.created:
+            failures.append(f"re-import created {again.created} duplicate transactions")
+
+        problem = same_day_paging_problem(os.path.join(tmp, "same_day.csv"))
+        print(f"paging     {SAME_DAY_ROWS:8} same-day rows, {PAGE_SIZE} per page: {problem or 'ok'}")
+        if problem:
+            failures.append(problem)
+
+        problem = concurrent_import_problem(tmp)
+        print(f"concurrent {CONCURRENT_ROWS:8} rows, 2 imports at once: {problem or 'ok'}")
+        if problem:
+            failures.append(problem)
+
+    if failures:
+        print("\nFAILED:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("\nImport OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Throughput check for materialize_recurring (tracker.recurring).
+
+Seeds --users users with --rules recurring transactions in total in a
+throwaway test database, all due today, as at a month rollover, and
+materializes them:
+
+    python scripts/bench_recurring.py                 # 100k rules, 50k users
+    python scripts/bench_recurring.py --rules 20000 --min-rate 2000
+
+Then it runs again (nothing is due) and runs once more with every
+``next_run_date`` rewound, so each occurrence is dropped by its dedupe key.
+Exits with status 1 when a run creates the wrong number of transactions,
+the ledger or rollups differ from a rebuild, or the first run is slower
+than --min-rate transactions a second.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from tracker import ledger, recurring, rollups
+from tracker.models import DailyBalance, MonthlyRollup, RecurringTransaction, Transaction
+
+
+def seed(rules, users, rnd):
+    today = timezone.now().date()
+    User.objects.bulk_create(
+        [User(username=f"bench_recurring_{i}", password="!") for i in range(users)], batch_size=5000
+    )
+    user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+    batch = []
+    for i in range(rules):
+        income = i % 4 == 0
+        start = today - timedelta(days=rnd.choice([0, 31, 61, 92]))
+        batch.append(RecurringTransaction(
+            user_id=user_ids[i % users],
+            amount=Decimal(rnd.randint(50000, 1500000)) / 100,
+            type=Transaction.INCOME if income else Transaction.EXPENSE,
+            category=Transaction.CATEGORY_OTHER if income else Transaction.CATEGORY_RENT,
+            description="Stipend" if income else "Hostel rent",
+            start_date=start,
+            next_run_date=today,
+        ))
+        if len(batch) >= 5000:
+            RecurringTransaction.objects.bulk_create(batch)
+            batch = []
+    RecurringTransaction.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def run(label, batch_size):
+    started = time.perf_counter()
+    rules = created = 0
+    for batch_rules, batch_created in recurring.materialize_due(batch_size=batch_size):
+        rules += batch_rules
+        created += batch_created
+    elapsed = time.perf_counter() - started
+    rate = created / elapsed if elapsed else 0
+    print(f"{label:10} {rules:8d} rules  {created:8d} created  {elapsed:7.2f}s  {rate:8.0f} rows/s")
+    return created, rate
+
+
+def derived_rows():
+    return (
+        sorted(DailyBalance.objects.values_list("user_id", "date", "net", "balance", "count")),
+        sorted(MonthlyRollup.objects.values_list("user_id", "year", "month", "category", "type", "total", "count")),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=recurring.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--min-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    seed(args.rules, args.users, random.Random(25))
+
+    failures = []
+    created, rate = run("rollover", args.batch_size)
+    if created != args.rules:
+        failures.append(f"rollover created {created}, expected {args.rules}")
+    if args.min_rate and rate < args.min_rate:
+        failures.append(f"{rate:.0f} rows/s < {args.min_rate:.0f} rows/s")
+
+    created, _ = run("rerun", args.batch_size)
+    if created:
+        failures.append(f"rerun created {created}, expected 0")
+
+    today = timezone.now().date()
+    RecurringTransaction.objects.update(next_run_date=today)
+    created, _ = run("rewound", args.batch_size)
+    if created:
+        failures.append(f"rewound run created {created} duplicates")
+
+    before = derived_rows()
+    ledger.rebuild()
+    rollups.rebuild()
+    if derived_rows() != before:
+        failures.append("ledger or rollups differ from a rebuild")
+
+    if failures:
+        print("\nFAILED:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("\nRecurring OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Timing and consistency check for tracker.search.
+
+Seeds --users users with --rows transactions in total in a throwaway test
+database, with descriptions drawn from a merchant vocabulary. It then runs a
+set of searches for one user, once through the FTS5 index and once through
+the ``icontains`` fallback:
+
+    python scripts/bench_search.py                  # 200k rows, 20 users
+    python scripts/bench_search.py --rows 50000 --max-ms 50
+
+Prints the median time of a first page per query and path. Exits with status
+1 when the two paths find different transactions, or when a search through
+the index is slower than --max-ms.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from tracker import search
+from tracker.models import Transaction
+
+YEARS = 3
+REPEATS = 5
+# no word is a substring of another, so icontains and word-prefix matching agree
+MERCHANTS = [
+    "swiggy", "zomato", "uber", "ola", "metro", "amazon", "flipkart", "myntra",
+    "starbucks", "dominos", "netflix", "spotify", "jio", "airtel", "rent", "hostel",
+    "canteen", "stationery", "pharmacy", "gym", "bookstore", "salary", "stipend", "refund",
+]
+EXTRAS = ["order", "ride", "recharge", "subscription", "payment", "monthly", "weekend", "campus"]
+RARE = "quokka"
+
+
+def seed(rows, users, rnd):
+    today = timezone.now().date()
+    categories = [code for code, _ in Transaction.CATEGORY_CHOICES]
+    owners = [
+        User.objects.create_user(username=f"bench_search_{i}", password="bench-pw")
+        for i in range(users)
+    ]
+    batch = []
+    for i in range(rows):
+        words = [rnd.choice(MERCHANTS), rnd.choice(EXTRAS)]
+        if i % 5000 == 0:
+            words.append(RARE)
+        batch.append(Transaction(
+            user=owners[i % users],
+            amount=Decimal(rnd.randint(1000, 500000)) / 100,
+            type=rnd.choice([Transaction.EXPENSE, Transaction.EXPENSE, Transaction.INCOME]),
+            category=rnd.choice(categories),
+            date=today - timedelta(days=rnd.randint(0, 365 * YEARS)),
+            description=" ".join(words),
+        ))
+        if len(batch) >= 5000:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    Transaction.objects.bulk_create(batch)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return owners[0]
+
+
+def timed(fn):
+    times = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    started = time.perf_counter()
+    user = seed(args.rows, args.users, random.Random(24))
+    print(f"seeded {args.rows} rows for {args.users} users in {time.perf_counter() - started:.1f}s "
+          f"(FTS index maintained by triggers)")
+    if not search.fts_available():
+        print("FTS5 is not available on this database")
+        return 1
+
+    since = timezone.now().date() - timedelta(days=180)
+    queries = [
+        ("common word", "swiggy", {}),
+        ("two words", "uber ride", {}),
+        ("prefix", "star", {}),
+        ("rare word", RARE, {}),
+        ("filtered", "amazon", {"type": Transaction.EXPENSE, "category": "SHOPPING"}),
+        ("date range", "netflix", {"start_date": since}),
+        ("no match", "nothinglikethis", {}),
+    ]
+
+    failures = []
+    print(f"\n{'query':14} {'fts':>10} {'scan':>10}  matches")
+    for label, query, filters in queries:
+        terms = search.search_terms(query)
+        # every match, so the two paths can be compared as sets
+        fts_ids = {tx.pk for tx in search._fts_search(user, terms, filters, args.rows, 0)}
+        scan_ids = {tx.pk for tx in search._scan_search(user, terms, filters, args.rows, 0)}
+        if fts_ids != scan_ids:
+            failures.append(f"{label}: fts found {len(fts_ids)}, scan found {len(scan_ids)}")
+
+        _, fts_ms = timed(lambda: search.search_transactions(user, query, filters))
+        available = search.fts_available
+        search.fts_available = lambda using=None: False
+        try:
+            _, scan_ms = timed(lambda: search.search_transactions(user, query, filters))
+        finally:
+            search.fts_available = available
+        print(f"{label:14} {fts_ms:8.1f}ms {scan_ms:8.1f}ms  {len(fts_ids)}")
+        if args.max_ms and fts_ms > args.max_ms:
+            failures.append(f"{label}: {fts_ms:.1f}ms > {args.max_ms:.1f}ms")
+
+    if failures:
+        print("\nFAILED:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print("\nSearch OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
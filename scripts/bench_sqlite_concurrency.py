@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+"""
+Concurrent read/write benchmark for the SQLite configuration in
+student_budget_tracker/db.py.
+
+For each configuration, a fresh database file is migrated and seeded with
+one user per worker. Then --workers processes, each logged in as its own
+user, send a mix of dashboard/list reads and transaction creates through the
+Django test client for --seconds:
+
+    python scripts/bench_sqlite_concurrency.py
+    python scripts/bench_sqlite_concurrency.py --workers 8 --seconds 20 --write-ratio 0.5
+
+The configurations are Django's defaults (rollback journal, DEFERRED
+transactions, a connection per request) and the tuned settings (WAL,
+pragmas, IMMEDIATE transactions, persistent connections). For each one the
+script prints the throughput, the read and write latency percentiles and the
+failed requests, such as "database is locked". It exits with status 1 when
+the tuned configuration has any failed request.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONFIGS = [
+    ("default", {"SAVIFY_SQLITE_TUNING": "0", "SAVIFY_DB_CONN_MAX_AGE": "0"}),
+    ("tuned", {}),
+]
+READ_URLS = [
+    "/tracker/dashboard/panels/summary/",
+    "/tracker/dashboard/panels/health/",
+    "/tracker/dashboard/panels/transactions/",
+    "/tracker/transactions/",
+]
+
+
+def seed(workers, transactions):
+    """One user per worker with ``transactions`` rows of history; returns their pks."""
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+
+    from tracker import health, ledger, rollups
+    from tracker.badges import evaluate_badges
+    from tracker.models import Transaction
+
+    rnd = random.Random(7)
+    today = timezone.now().date()
+    categories = [code for code, _ in Transaction.CATEGORY_CHOICES]
+    user_ids = []
+    for n in range(workers):
+        user = User.objects.create_user(username=f"bench_concurrency_{n}", password="bench-pw")
+        Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    user=user,
+                    amount=Decimal(rnd.randint(100, 500000)) / 100,
+                    type=Transaction.INCOME if rnd.random() < 0.25 else Transaction.EXPENSE,
+                    category=rnd.choice(categories),
+                    description=f"bench transaction {i}",
+                    date=today - timedelta(days=rnd.randint(0, 730)),
+                )
+                for i in range(transactions)
+            ],
+            batch_size=5000,
+        )
+        user_ids.append(user.pk)
+    rollups.rebuild(user_ids)
+    ledger.rebuild(user_ids)
+    evaluate_badges(user_ids)
+    health.refresh_snapshots(user_ids)
+    return user_ids
+
+
+def worker(user_id, start_at, seconds, write_ratio, results):
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from django.utils import timezone
+
+    from tracker.models import Transaction
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    client = Client()
+    client.force_login(User.objects.get(pk=user_id))
+    rnd = random.Random(user_id)
+    payload = {
+        "amount": "123.45",
+        "type": Transaction.EXPENSE,
+        "category": Transaction.CATEGORY_FOOD,
+        "description": "bench concurrent write",
+        "date": timezone.now().date().isoformat(),
+    }
+    reads, writes, errors = [], [], Counter()
+
+    time.sleep(max(0.0, start_at - time.time()))
+    while time.time() < start_at + seconds:
+        is_write = rnd.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if is_write:
+                response = client.post("/tracker/transactions/add/", payload)
+            else:
+                response = client.get(rnd.choice(READ_URLS))
+        except Exception as exc:  # the test client re-raises view errors
+            errors[f"{type(exc).__name__}: {exc}"] += 1
+            continue
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            errors[f"HTTP {response.status_code}"] += 1
+            continue
+        (writes if is_write else reads).append(elapsed)
+    results.put({"reads": reads, "writes": writes, "errors": dict(errors)})
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
+
+
+def run_child(args):
+    """Benchmark the configuration in this process's environment; prints one JSON line."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connections
+
+    call_command("migrate", verbosity=0)
+    user_ids = seed(args.workers, args.transactions)
+    # each worker must open its own connection
+    connections.close_all()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    start_at = time.time() + 2.0
+    processes = [
+        context.Process(target=worker, args=(user_id, start_at, args.seconds, args.write_ratio, results))
+        for user_id in user_ids
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    reads = [ms for item in collected for ms in item["reads"]]
+    writes = [ms for item in collected for ms in item["writes"]]
+    errors = Counter()
+    for item in collected:
+        errors.update(item["errors"])
+    print(json.dumps({
+        "requests_per_s": round((len(reads) + len(writes)) / args.seconds, 1),
+        "reads": len(reads),
+        "writes": len(writes),
+        "read_p50": round(percentile(reads, 50), 1),
+        "read_p95": round(percentile(reads, 95), 1),
+        "write_p50": round(percentile(writes, 50), 1),
+        "write_p95": round(percentile(writes, 95), 1),
+        "errors": dict(errors),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--transactions", type=int, default=2000, help="history rows per user")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+        return 0
+
+    base_env = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith(("SAVIFY_DB_", "SAVIFY_SQLITE_"))
+    }
+    reports = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, overrides in CONFIGS:
+            env = {**base_env, **overrides, "SAVIFY_DB_PATH": os.path.join(directory, f"{name}.sqlite3")}
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", *sys.argv[1:]],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            report = reports[name] = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{name:8} {report['requests_per_s']:7.1f} req/s  "
+                  f"read p50 {report['read_p50']:7.1f}ms p95 {report['read_p95']:7.1f}ms  "
+                  f"write p50 {report['write_p50']:7.1f}ms p95 {report['write_p95']:7.1f}ms  "
+                  f"failed {sum(report['errors'].values())}")
+            for message, count in sorted(report["errors"].items(), key=lambda item: -item[1]):
+                print(f"           {count:5} x {message[:100]}")
+
+    if reports["tuned"]["errors"]:
+        print("\nFAILED: requests failed with the tuned configuration")
+        return 1
+    print("\nSQLite concurrency OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
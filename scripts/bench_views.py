@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+"""
+Query-count, latency and memory regression benchmark for the tracker views.
+
+Seeds synthetic users with 1k, 10k and 100k transactions spread over several
+years in a throwaway test database, drives every tracker view through the
+Django test client and records, per view and dataset size:
+
+    queries   number of SQL queries issued
+    ms        median wall time over --repeat runs
+    peak_kb   peak Python memory allocated while serving (tracemalloc)
+
+Results are compared with scripts/bench_baseline.json and the script exits
+with status 1 when a view regresses:
+
+    python scripts/bench_views.py                    # compare with baseline
+    python scripts/bench_views.py --sizes 1000       # quick run
+    python scripts/bench_views.py --update-baseline  # record a new baseline
+
+Query counts must not grow at all. Wall time and memory are machine
+dependent, so they only fail beyond --tolerance times the baseline (plus a
+small absolute slack); record the baseline on the machine that runs the check.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.utils import timezone
+
+from tracker import health, ledger, rollups
+from tracker.badges import evaluate_badges
+from tracker.models import MonthlyBudget, SavingsGoal, Transaction
+from tracker.pagination import encode_cursor
+from tracker.views import DASHBOARD_PANELS
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+DEFAULT_SIZES = [1000, 10000, 100000]
+YEARS = 5
+TIME_SLACK_MS = 5.0
+MEMORY_SLACK_KB = 256.0
+
+
+def seed_user(size, rnd):
+    """Create a user with ``size`` transactions over YEARS years, budgets and goals."""
+    user = User.objects.create_user(username=f"bench_{size}", password="bench-pw")
+    today = timezone.now().date()
+    categories = [code for code, _ in Transaction.CATEGORY_CHOICES]
+
+    batch = []
+    for i in range(size):
+        is_income = rnd.random() < 0.25
+        batch.append(Transaction(
+            user=user,
+            amount=Decimal(rnd.randint(100, 500000)) / 100,
+            type=Transaction.INCOME if is_income else Transaction.EXPENSE,
+            category=rnd.choice(categories),
+            description=f"bench transaction {i}",
+            date=today - timedelta(days=rnd.randint(0, 365 * YEARS)),
+        ))
+        if len(batch) >= 5000:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    Transaction.objects.bulk_create(batch)
+
+    for offset in range(12 * YEARS):
+        year, month = today.year, today.month - offset
+        while month <= 0:
+            month += 12
+            year -= 1
+        MonthlyBudget.objects.create(
+            user=user, year=year, month=month, budget_amount=Decimal(rnd.randint(5000, 40000))
+        )
+    for n in range(3):
+        SavingsGoal.objects.create(
+            user=user,
+            name=f"Goal {n}",
+            target_amount=Decimal("50000"),
+            start_date=today - timedelta(days=30 * (n + 1)),
+            end_date=today + timedelta(days=120 * (n + 1)),
+            monthly_commitment=Decimal("2500"),
+        )
+
+    # bulk_create bypasses the signal handlers, so build derived data in bulk
+    rollups.rebuild([user.pk])
+    ledger.rebuild([user.pk])
+    evaluate_badges([user.pk])
+    health.refresh_snapshots([user.pk])
+    return user
+
+
+def scenarios(user):
+    """(name, callable(client) -> response, clear_cache) for each benchmarked view."""
+    today = timezone.now().date()
+    tx = Transaction.objects.filter(user=user).first()
+    tx_payload = {
+        "amount": "123.45",
+        "type": Transaction.EXPENSE,
+        "category": Transaction.CATEGORY_FOOD,
+        "description": "bench",
+        "date": today.isoformat(),
+    }
+    goal_payload = {
+        "name": "Bench goal",
+        "target_amount": "10000",
+        "start_date": today.isoformat(),
+        "end_date": (today + timedelta(days=90)).isoformat(),
+    }
+
+    # cursor for a page near the end of the history, where OFFSET would hurt most
+    oldest = Transaction.objects.filter(user=user).order_by("date", "created_at", "id")[30]
+    deep_cursor = encode_cursor(oldest)
+
+    def export(fmt):
+        def action(client):
+            response = client.get(f"/tracker/reports/export/{fmt}/")
+            # consume the stream so time and peak memory cover the whole export
+            for _ in response.streaming_content:
+                pass
+            return response
+        return action
+
+    def revalidate(url):
+        # the warm-up call fetches the ETag; measured calls should get 304s
+        etag = {}
+
+        def action(client):
+            if "value" not in etag:
+                response = client.get(url)
+                etag["value"] = response["ETag"]
+                return response
+            return client.get(url, HTTP_IF_NONE_MATCH=etag["value"])
+        return action
+
+    def create_and_delete(client):
+        response = client.post("/tracker/transactions/add/", tx_payload)
+        created = Transaction.objects.filter(user=user, description="bench").first()
+        client.post(f"/tracker/transactions/{created.pk}/delete/")
+        return response
+
+    return [
+        ("dashboard_cold", lambda c: c.get("/tracker/dashboard/"), True),
+        ("dashboard_warm", lambda c: c.get("/tracker/dashboard/"), False),
+        # panels are built on pool threads whose queries are not captured here;
+        # the panel_* scenarios count them
+        ("dashboard_full_cold", lambda c: c.get("/tracker/dashboard/full/"), True),
+        *(
+            (f"panel_{name}_cold", lambda c, name=name: c.get(f"/tracker/dashboard/panels/{name}/"), True)
+            for name in DASHBOARD_PANELS
+        ),
+        ("panel_insights_warm", lambda c: c.get("/tracker/dashboard/panels/insights/"), False),
+        ("reports", lambda c: c.get("/tracker/reports/"), False),
+        ("reports_month", lambda c: c.get(f"/tracker/reports/?month={today.month}&year={today.year}"), False),
+        ("reports_not_modified", revalidate("/tracker/reports/"), False),
+        ("chart_categories_cold", lambda c: c.get("/tracker/api/charts/categories/"), True),
+        ("chart_spend_daily_cold", lambda c: c.get("/tracker/api/charts/spend-daily/"), True),
+        ("chart_spend_weekly_cold", lambda c: c.get("/tracker/api/charts/spend-weekly/"), True),
+        ("chart_spend_monthly_cold", lambda c: c.get("/tracker/api/charts/spend-monthly/"), True),
+        ("panel_insights_not_modified", revalidate("/tracker/dashboard/panels/insights/"), False),
+        ("transaction_list", lambda c: c.get("/tracker/transactions/"), False),
+        ("transaction_api_deep_page", lambda c: c.get(f"/tracker/api/transactions/?cursor={deep_cursor}"), False),
+        ("transaction_search", lambda c: c.get("/tracker/transactions/search/?q=bench"), False),
+        ("transaction_search_api", lambda c: c.get("/tracker/api/transactions/search/?q=transaction&type=EXPENSE"), False),
+        ("export_csv", export("csv"), False),
+        ("export_jsonl", export("jsonl"), False),
+        ("manage_budget", lambda c: c.get("/tracker/budget/"), False),
+        ("transaction_add_form", lambda c: c.get("/tracker/transactions/add/"), False),
+        ("transaction_create_delete", create_and_delete, False),
+        ("transaction_edit_form", lambda c: c.get(f"/tracker/transactions/{tx.pk}/edit/"), False),
+        ("transaction_update", lambda c: c.post(
+            f"/tracker/transactions/{tx.pk}/edit/", {**tx_payload, "date": tx.date.isoformat()}
+        ), False),
+        ("goal_list_cold", lambda c: c.get("/tracker/goals/"), True),
+        ("goal_api_cold", lambda c: c.get("/tracker/api/goals/"), True),
+        ("goal_create", lambda c: c.post("/tracker/goals/add/", goal_payload), False),
+    ]
+
+
+def measure(client, action, clear_cache, repeat):
+    """Time ``repeat`` untraced runs, then one run under tracemalloc for memory."""
+    timings = []
+    queries = 0
+    for _ in range(repeat):
+        if clear_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = action(client)
+            timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f"unexpected status {response.status_code}")
+        queries = max(queries, len(ctx.captured_queries))
+
+    if clear_cache:
+        cache.clear()
+    tracemalloc.start()
+    action(client)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "queries": queries,
+        "ms": round(statistics.median(timings), 2),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, views in results.items():
+        for view, current in views.items():
+            base = baseline.get(size, {}).get(view)
+            if not base:
+                continue
+            if current["queries"] > base["queries"]:
+                regressions.append(f"{view}@{size}: queries {base['queries']} -> {current['queries']}")
+            if current["ms"] > base["ms"] * tolerance + TIME_SLACK_MS:
+                regressions.append(f"{view}@{size}: time {base['ms']}ms -> {current['ms']}ms")
+            if current["peak_kb"] > base["peak_kb"] * tolerance + MEMORY_SLACK_KB:
+                regressions.append(f"{view}@{size}: memory {base['peak_kb']}KB -> {current['peak_kb']}KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=2.0)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    rnd = random.Random(42)
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",") if s]:
+        started = time.perf_counter()
+        user = seed_user(size, rnd)
+        print(f"\nSeeded {size} transactions in {time.perf_counter() - started:.1f}s")
+        client = Client()
+        client.force_login(user)
+
+        results[str(size)] = {}
+        for name, action, clear_cache in scenarios(user):
+            # warm-up so one-off imports and template compilation don't count
+            action(client)
+            stats = measure(client, action, clear_cache, args.repeat)
+            results[str(size)][name] = stats
+            print(f"  {name:28} {stats['queries']:4} queries {stats['ms']:9.2f} ms {stats['peak_kb']:10.1f} KB")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fh:
+                baseline = json.load(fh)
+        baseline.update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline first.")
+        return 1
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
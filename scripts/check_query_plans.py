@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""
+Verify with EXPLAIN QUERY PLAN that the dashboard and reports queries on
+Transaction and SavingsGoal are served by the composite indexes, and that
+searches go through the FTS5 index.
+
+Runs against a throwaway test database, so the project db.sqlite3 is untouched:
+
+    python scripts/check_query_plans.py
+
+Exits with status 1 if any query falls back to a full table scan or to the
+plain foreign key index.
+"""
+import os
+import sys
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_budget_tracker.settings")
+
+import django
+
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+from tracker.models import DailyBalance, HealthScoreSnapshot, MonthlyBudget, SavingsGoal, Transaction
+from tracker.charts import CHARTS
+from tracker.search import FTS_TABLE
+from tracker.views import DASHBOARD_PANELS
+
+CHECKED_TABLES = {
+    Transaction._meta.db_table: ("tracker_tx_",),
+    SavingsGoal._meta.db_table: ("tracker_goal_",),
+    DailyBalance._meta.db_table: ("tracker_dailybalance_user_id_date",),
+    HealthScoreSnapshot._meta.db_table: ("tracker_healthscoresnapshot_user_id_year_month",),
+    FTS_TABLE: ("0:M",),  # the MATCH constraint
+}
+
+
+def seed(user):
+    today = timezone.now().date()
+    rows = []
+    for i in range(400):
+        rows.append(Transaction(
+            user=user,
+            amount=Decimal(100 + i),
+            type=Transaction.EXPENSE if i % 3 else Transaction.INCOME,
+            category=Transaction.CATEGORY_CHOICES[i % 5][0],
+            date=today - timedelta(days=i * 2),
+            description=f"coffee order {i}" if i % 4 else f"metro card {i}",
+        ))
+    Transaction.objects.bulk_create(rows)
+    MonthlyBudget.objects.create(
+        user=user, month=today.month, year=today.year, budget_amount=Decimal("5000")
+    )
+    SavingsGoal.objects.create(
+        user=user,
+        name="Laptop",
+        target_amount=Decimal("50000"),
+        start_date=today - timedelta(days=20),
+        end_date=today + timedelta(days=200),
+        monthly_commitment=Decimal("2000"),
+    )
+    from tracker import health, ledger, rollups
+    rollups.rebuild([user.pk])
+    ledger.rebuild([user.pk])
+    health.refresh_snapshots([user.pk])
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def capture(client, url):
+    queries = []
+
+    def wrapper(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    # cold cache, so every query behind the view is captured
+    cache.clear()
+    with connection.execute_wrapper(wrapper):
+        response = client.get(url)
+    assert response.status_code == 200, f"{url} returned {response.status_code}"
+    return queries
+
+
+def plan_problems(sql, params):
+    """Plan lines for checked tables that don't use one of our indexes."""
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        plan = [row[-1] for row in cursor.fetchall()]
+    problems = []
+    for line in plan:
+        for table, prefixes in CHECKED_TABLES.items():
+            if f" {table} " not in f" {line} ":
+                continue
+            # search results are joined to their transactions by id
+            if "USING INTEGER PRIMARY KEY" in line:
+                continue
+            if not any(f"INDEX {prefix}" in line for prefix in prefixes):
+                problems.append(line)
+    return plan, problems
+
+
+def main():
+    settings.ALLOWED_HOSTS = ["testserver"]
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    user = User.objects.create_user(username="plan_check", password="plan-check-pw")
+    seed(user)
+    client = Client()
+    client.login(username="plan_check", password="plan-check-pw")
+
+    today = timezone.now().date()
+    urls = [
+        "/tracker/dashboard/",
+        *(f"/tracker/dashboard/panels/{name}/" for name in DASHBOARD_PANELS),
+        "/tracker/reports/",
+        f"/tracker/reports/?month={today.month}&year={today.year}",
+        f"/tracker/reports/?year={today.year}",
+        *(f"/tracker/api/charts/{name}/" for name in CHARTS),
+        f"/tracker/api/charts/spend-daily/?month={today.month}&year={today.year}",
+        "/tracker/transactions/",
+        "/tracker/api/transactions/?type=EXPENSE",
+        "/tracker/transactions/search/?q=coffee",
+        "/tracker/api/transactions/search/?q=metro&type=EXPENSE&category=FOOD",
+        "/tracker/goals/",
+    ]
+    cursor = client.get("/tracker/api/transactions/").json()["next_cursor"]
+    urls.append(f"/tracker/api/transactions/?cursor={cursor}")
+
+    print("=" * 60)
+    print("QUERY PLAN CHECK")
+    print("=" * 60)
+    failures = 0
+    for url in urls:
+        print(f"\n{url}")
+        for sql, params in capture(client, url):
+            if not any(table in sql for table in CHECKED_TABLES):
+                continue
+            plan, problems = plan_problems(sql, params)
+            status = "FAIL" if problems else "ok"
+            print(f"  [{status}] {sql[:90]}...")
+            for line in plan:
+                print(f"         {line}")
+            failures += bool(problems)
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"{failures} queries are not using the composite indexes")
+        return 1
+    print("All dashboard, reports, history and search queries use their indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Database configuration for the SQLite deployment.
+
+Out of the box SQLite runs in rollback-journal mode, syncs to disk on every
+commit and starts transactions as DEFERRED. The last one means two requests
+that both read and then write can deadlock, and one of them fails at once
+with "database is locked", whatever the busy timeout. Django also opens a new
+connection for every request.
+
+:func:`sqlite_database` builds the ``DATABASES["default"]`` entry with
+persistent connections and IMMEDIATE transactions. :func:`configure_sqlite`
+is a ``connection_created`` receiver that applies the pragmas from
+:func:`sqlite_pragmas` once per new connection: WAL, so readers never block
+the writer and commits only append to the log, ``synchronous=NORMAL``, which
+is durable in WAL mode except across a power loss, a busy timeout, memory
+mapping and a larger page cache. Everything can be overridden from the
+environment:
+
+    SAVIFY_DB_PATH                   database file (default: db.sqlite3, made by `manage.py migrate`)
+    SAVIFY_DB_CONN_MAX_AGE           seconds to keep a connection (0: per request)
+    SAVIFY_SQLITE_TUNING=0           skip the pragmas and IMMEDIATE transactions
+    SAVIFY_SQLITE_TRANSACTION_MODE   DEFERRED, IMMEDIATE (default) or EXCLUSIVE
+    SAVIFY_SQLITE_JOURNAL_MODE       default WAL
+    SAVIFY_SQLITE_SYNCHRONOUS        default NORMAL
+    SAVIFY_SQLITE_BUSY_TIMEOUT_MS    default 5000
+    SAVIFY_SQLITE_MMAP_SIZE          bytes, default 256 MiB
+    SAVIFY_SQLITE_CACHE_SIZE_KB      default 20000
+"""
+import os
+
+from django.db.backends.signals import connection_created
+
+
+def _env(name, default):
+    return os.environ.get(name, default)
+
+
+def tuning_enabled():
+    return _env("SAVIFY_SQLITE_TUNING", "1") != "0"
+
+
+def sqlite_pragmas():
+    """The ``(pragma, value)`` pairs applied to every new connection."""
+    if not tuning_enabled():
+        return []
+    return [
+        ("journal_mode", _env("SAVIFY_SQLITE_JOURNAL_MODE", "WAL")),
+        ("synchronous", _env("SAVIFY_SQLITE_SYNCHRONOUS", "NORMAL")),
+        ("busy_timeout", int(_env("SAVIFY_SQLITE_BUSY_TIMEOUT_MS", "5000"))),
+        ("mmap_size", int(_env("SAVIFY_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))),
+        # negative: a size in KiB rather than in pages
+        ("cache_size", -int(_env("SAVIFY_SQLITE_CACHE_SIZE_KB", "20000"))),
+    ]
+
+
+def sqlite_database(default_path):
+    """The ``DATABASES["default"]`` entry."""
+    options = {}
+    if tuning_enabled():
+        options["transaction_mode"] = _env("SAVIFY_SQLITE_TRANSACTION_MODE", "IMMEDIATE")
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": _env("SAVIFY_DB_PATH", str(default_path)),
+        "CONN_MAX_AGE": int(_env("SAVIFY_DB_CONN_MAX_AGE", "60")),
+        # a reused connection is pinged first, so a broken one is replaced
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": options,
+    }
+
+
+# pragmas that only apply to a database file
+FILE_ONLY_PRAGMAS = {"journal_mode", "mmap_size"}
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    in_memory = connection.is_in_memory_db()
+    with connection.cursor() as cursor:
+        for pragma, value in sqlite_pragmas():
+            if in_memory and pragma in FILE_ONLY_PRAGMAS:
+                continue
+            if pragma == "journal_mode":
+                # switching needs an exclusive lock; the mode is stored in the
+                # file, so only the first connection ever has to do it
+                cursor.execute("PRAGMA journal_mode")
+                if cursor.fetchone()[0].lower() == str(value).lower():
+                    continue
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+
+
+connection_created.connect(configure_sqlite, dispatch_uid="savify.configure_sqlite")
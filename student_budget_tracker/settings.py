@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from .db import sqlite_database
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = "replace-this-with-a-secure-secret-key"
@@ -19,6 +22,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # outermost so it sees every query; inert unless TRACKER_PROFILING_ENABLED
+    "tracker.middleware.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -48,13 +53,65 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "student_budget_tracker.wsgi.application"
 
+# WAL, pragmas and persistent connections; see db.py for the SAVIFY_DB_* and
+# SAVIFY_SQLITE_* environment variables.
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": sqlite_database(BASE_DIR / "db.sqlite3"),
 }
 
+# Cache used for per-user analytics. locmem is fine for a single process; set
+# SAVIFY_CACHE_BACKEND=file (or db, after `manage.py createcachetable`) when
+# running several worker processes so they share cached entries.
+CACHE_BACKEND = os.environ.get("SAVIFY_CACHE_BACKEND", "locmem")
+# Each user needs a version key plus a few entries; Django's default cap of
+# 300 entries would cull them as soon as a few dozen users are active.
+CACHE_MAX_ENTRIES = int(os.environ.get("SAVIFY_CACHE_MAX_ENTRIES", "50000"))
+
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("SAVIFY_CACHE_LOCATION", str(BASE_DIR / ".cache")),
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    }
+elif CACHE_BACKEND == "db":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": os.environ.get("SAVIFY_CACHE_LOCATION", "tracker_cache"),
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    }
+elif CACHE_BACKEND == "dummy":
+    # no caching at all; for benchmarking the uncached code paths
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "savify",
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    }
+
+# Seconds a computed dashboard analytics entry may live in the cache; entries
+# are also invalidated whenever the user's data changes.
+TRACKER_ANALYTICS_CACHE_TIMEOUT = 60 * 60
+
+# Threads the async dashboard (dashboard/full/) builds its panels on, per
+# process; each holds its own database connection.
+TRACKER_DASHBOARD_THREADS = int(os.environ.get("SAVIFY_DASHBOARD_THREADS", "4"))
+
+# Request profiling (Server-Timing headers + staff page at /tracker/profiling/).
+# Cheap enough for production when sampled, e.g. SAVIFY_PROFILING_SAMPLE_RATE=0.05.
+TRACKER_PROFILING_ENABLED = os.environ.get("SAVIFY_PROFILING", "0") == "1"
+TRACKER_PROFILING_SAMPLE_RATE = float(os.environ.get("SAVIFY_PROFILING_SAMPLE_RATE", "1.0"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -82,6 +139,18 @@ STATIC_URL = "static/"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+STATIC_ROOT = os.environ.get("SAVIFY_STATIC_ROOT", str(BASE_DIR / "staticfiles"))
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    # content-hashed names for far-future caching, plus .gz/.br variants
+    # written at collectstatic time; see tracker/storage.py
+    "staticfiles": {
+        "BACKEND": "tracker.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
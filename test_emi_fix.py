@@ -9,7 +9,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'student_budget_tracker.settings
 django.setup()
 
 from decimal import Decimal, ROUND_HALF_UP
-from tracker.views import calculate_goal_plan
+from tracker.goals import calculate_goal_plan
 from tracker.models import SavingsGoal
 from django.contrib.auth.models import User
 
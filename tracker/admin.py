@@ -1,7 +1,8 @@
 from django.contrib import admin
 
 from .models import Transaction, MonthlyBudget
-from .models import SavingsGoal, AchievementBadge
+from .models import SavingsGoal, AchievementBadge, MonthlyRollup, DailyBalance, HealthScoreSnapshot
+from .models import RecurringTransaction
 
 
 @admin.register(Transaction)
@@ -36,3 +37,36 @@ class AchievementBadgeAdmin(admin.ModelAdmin):
     search_fields = ("user__username",)
     ordering = ("-awarded_at",)
 
+
+
+@admin.register(MonthlyRollup)
+class MonthlyRollupAdmin(admin.ModelAdmin):
+    list_display = ("user", "year", "month", "type", "category", "total", "count")
+    list_filter = ("type", "category", "year", "user")
+    search_fields = ("user__username",)
+    ordering = ("-year", "-month")
+
+
+@admin.register(DailyBalance)
+class DailyBalanceAdmin(admin.ModelAdmin):
+    list_display = ("user", "date", "net", "balance")
+    list_filter = ("user",)
+    search_fields = ("user__username",)
+    date_hierarchy = "date"
+    ordering = ("-date",)
+
+
+@admin.register(HealthScoreSnapshot)
+class HealthScoreSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("user", "year", "month", "score", "computed_at")
+    list_filter = ("year", "user")
+    search_fields = ("user__username",)
+    ordering = ("-year", "-month")
+
+
+@admin.register(RecurringTransaction)
+class RecurringTransactionAdmin(admin.ModelAdmin):
+    list_display = ("user", "type", "category", "amount", "frequency", "interval", "next_run_date")
+    list_filter = ("frequency", "type", "category", "user")
+    search_fields = ("user__username", "description")
+    ordering = ("next_run_date",)
@@ -0,0 +1,364 @@
+"""
+Dashboard analytics engine.
+
+Everything the dashboard needs about a user's history is read from the
+``MonthlyRollup`` table (one row per year/month/category/type) with a fixed
+number of queries, and all derived metrics are computed in Python from that
+in-memory result, so the query count does not grow with the length of the
+user's history. Amounts are held as integer paise (see ``tracker.money``);
+callers convert with ``from_minor`` when handing values to templates.
+"""
+import calendar
+import copy
+from datetime import date, timedelta
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from . import ledger
+from .models import MonthlyBudget, MonthlyRollup, Transaction
+from .money import HUNDRED_PERCENT, div_round, fraction, percent, to_minor
+
+
+CATEGORY_LABELS = dict(Transaction.CATEGORY_CHOICES)
+
+
+def previous_month(year, month, n=1):
+    """Return the (year, month) that lies ``n`` months before the given one."""
+    y = year
+    m = month - n
+    while m <= 0:
+        m += 12
+        y -= 1
+    return y, m
+
+
+def month_bounds(year, month):
+    """First and last day of the given month."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def report_period(year=None, month=None, today=None):
+    """
+    Resolve report filters to a ``(start, end)`` date range, or ``None`` when
+    unfiltered. A month without a year refers to the current year.
+    """
+    if not year and not month:
+        return None
+    year = year or (today or timezone.now().date()).year
+    if month:
+        return month_bounds(year, month)
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def rate_health(parts):
+    """
+    Total score, colour, label and suggestions for the health score component
+    scores ``parts`` (see :meth:`UserAnalytics.health`).
+    """
+    score = sum(parts.values())
+
+    color, label = "danger", "Poor"
+    if score >= 8000:
+        color, label = "success", "Excellent"
+    elif score >= 6000:
+        color, label = "primary", "Good"
+    elif score >= 4000:
+        color, label = "warning", "Average"
+
+    suggestions = []
+    if parts["savings"] < 600:
+        suggestions.append("Increase monthly savings: target at least 10-20% of income.")
+    if parts["budget"] < 800:
+        suggestions.append("Set or adjust monthly budgets and review top spending categories.")
+    if parts["consistency"] < 800:
+        suggestions.append("Track transactions consistently every month to improve insights.")
+    if parts["over_budget"] < 800:
+        suggestions.append("Reduce frequency of overspending months; automate small savings.")
+
+    return {"score": score, "color": color, "label": label, "suggestions": suggestions}
+
+
+class UserAnalytics:
+    """
+    In-memory monthly/category totals for one user plus the metrics derived
+    from them. Build it with :func:`load_user_analytics`.
+    """
+
+    def __init__(self, rows, budgets, today, net_since=None):
+        self.today = today
+        # (year, month) -> budget in paise
+        self.budgets = {key: to_minor(amount) for key, amount in budgets.items()}
+        self.net_since = net_since
+        # (year, month) -> {"income", "expense", "count"}
+        self.months = {}
+        # (year, month) -> {category: expense total}
+        self.month_categories = {}
+        # category -> {"total", "count"} (expenses only)
+        self.categories = {}
+
+        # rows are MonthlyRollup values: year, month, category, type, total, count
+        for row in rows:
+            key = (row["year"], row["month"])
+            month = self.months.setdefault(key, {"income": 0, "expense": 0, "count": 0})
+            total = to_minor(row["total"])
+            month["count"] += row["count"]
+            if row["type"] == Transaction.INCOME:
+                month["income"] += total
+                continue
+
+            month["expense"] += total
+            cats = self.month_categories.setdefault(key, {})
+            cats[row["category"]] = cats.get(row["category"], 0) + total
+            cat = self.categories.setdefault(row["category"], {"total": 0, "count": 0})
+            cat["total"] += total
+            cat["count"] += row["count"]
+
+        self.income_total = sum(m["income"] for m in self.months.values())
+        self.expense_total = sum(m["expense"] for m in self.months.values())
+
+    @property
+    def balance(self):
+        return self.income_total - self.expense_total
+
+    def month(self, year, month):
+        return self.months.get((year, month), {"income": 0, "expense": 0, "count": 0})
+
+    def recent_months(self, n):
+        """The ``n`` calendar months before the current one, most recent first."""
+        return [previous_month(self.today.year, self.today.month, i) for i in range(1, n + 1)]
+
+    def as_of(self, year, month):
+        """
+        These analytics as they stood at the end of ``year``/``month``, for
+        scoring past months: later months drop out of the income and expense
+        totals. Category totals are left all-time.
+        """
+        view = copy.copy(self)
+        view.today = month_bounds(year, month)[1]
+        past = [totals for key, totals in self.months.items() if key <= (year, month)]
+        view.income_total = sum(m["income"] for m in past)
+        view.expense_total = sum(m["expense"] for m in past)
+        return view
+
+    def top_categories(self, n, year=None, month=None):
+        """Top ``n`` expense categories as ``(code, total)``, all-time or for one month."""
+        if year is not None:
+            totals = self.month_categories.get((year, month), {})
+        else:
+            totals = {code: c["total"] for code, c in self.categories.items()}
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def category_averages(self):
+        return {
+            code: div_round(c["total"], c["count"])
+            for code, c in self.categories.items()
+            if c["count"]
+        }
+
+    # ----- derived metrics -----
+
+    def budget_evaluation(self):
+        """Evaluation dict for the current month's budget."""
+        year, month = self.today.year, self.today.month
+        budget_amount = self.budgets.get((year, month), 0)
+        expenses = self.month(year, month)["expense"]
+
+        if expenses <= budget_amount:
+            status = "within_budget"
+            message = "Great job! You are managing your spending well this month."
+        else:
+            status = "exceeded"
+            message = "You have exceeded your budget."
+
+        top_categories = []
+        if status == "exceeded":
+            top_categories = [
+                CATEGORY_LABELS.get(code, "Other")
+                for code, _ in self.top_categories(2, year, month)
+            ]
+
+        return {
+            "budget": budget_amount,
+            "expenses": expenses,
+            "remaining": budget_amount - expenses,
+            "status": status,
+            "message": message,
+            "top_categories": top_categories,
+        }
+
+    def budget_discipline(self, months=6):
+        """Return ``(checked, within)`` budget counts over the previous ``months``."""
+        checked = within = 0
+        for key in self.recent_months(months):
+            budget = self.budgets.get(key)
+            if budget is None:
+                continue
+            checked += 1
+            if self.month(*key)["expense"] <= budget:
+                within += 1
+        return checked, within
+
+    def health(self):
+        """
+        Financial Health Score (0-100) with its colour, label and suggestions.
+
+        Weights: savings_rate (30), expense_ratio (20), budget_discipline (20),
+        consistency (15), over_budget_freq (15). Computed in two-decimal fixed
+        point (``tracker.money``): 10000 == 100.00 points or 100.00%.
+        """
+        income, expense = self.income_total, self.expense_total
+
+        savings_rate = 0
+        expense_ratio = HUNDRED_PERCENT
+        if income > 0:
+            savings_rate = percent(income - expense, income)
+            expense_ratio = percent(expense, income)
+
+        # budget discipline rewards, and over-budget frequency penalises, the
+        # share of checked months that stayed within budget
+        checked, within = self.budget_discipline(6)
+        months_with_tx = sum(1 for key in self.recent_months(6) if self.month(*key)["count"])
+
+        parts = {
+            "savings": fraction(min(max(savings_rate, 0), 3000), 3, 10),
+            "expense": fraction(max(0, HUNDRED_PERCENT - expense_ratio), 2, 10),
+            "budget": fraction(2000, within, checked) if checked else 0,
+            "consistency": fraction(1500, months_with_tx, 6),
+            "over_budget": fraction(1500, within, checked) if checked else 1500,
+        }
+        return {
+            **rate_health(parts),
+            "parts": parts,
+            "savings_rate": savings_rate,
+            "budgets_checked": checked,
+            "budgets_within": within,
+        }
+
+    def monthly_expenses(self, months=3):
+        """Expense totals for the previous ``months``, most recent first."""
+        return [self.month(*key)["expense"] for key in self.recent_months(months)]
+
+
+def load_user_analytics(user, today=None, since=None):
+    """
+    Load a :class:`UserAnalytics` for ``user`` from the rollup table plus one
+    budget lookup.
+
+    When ``since`` is given the net amount saved from that date onwards is
+    exposed as ``net_since`` (one ledger lookup).
+    """
+    today = today or timezone.now().date()
+
+    rows = list(
+        MonthlyRollup.objects.filter(user=user)
+        .values("year", "month", "category", "type", "total", "count")
+        .order_by()
+    )
+
+    first_year, _ = previous_month(today.year, today.month, 6)
+    budgets = {
+        (b["year"], b["month"]): b["budget_amount"]
+        for b in MonthlyBudget.objects.filter(user=user, year__gte=first_year)
+        .values("year", "month", "budget_amount")
+        .order_by()
+    }
+
+    analytics = UserAnalytics(rows, budgets, today)
+    if since is not None:
+        analytics.net_since = net_saved_since(user, since, analytics.balance)
+    return analytics
+
+
+def load_many_user_analytics(user_ids=None, today=None, history=False, rollup_rows=None):
+    """
+    Batch variant of :func:`load_user_analytics`: one rollup query and one
+    budget query for all ``user_ids`` (or every user), returning a dict of
+    ``user_id -> UserAnalytics``. Only the budgets of the last six months are
+    loaded unless ``history`` is set (for scoring past months). Rollup value
+    dicts passed as ``rollup_rows`` (e.g. freshly grouped from transactions)
+    replace the rollup query.
+    """
+    today = today or timezone.now().date()
+    rollups = MonthlyRollup.objects.all()
+    budgets = MonthlyBudget.objects.all()
+    if user_ids is not None:
+        rollups = rollups.filter(user_id__in=user_ids)
+        budgets = budgets.filter(user_id__in=user_ids)
+    if rollup_rows is None:
+        rollup_rows = (
+            rollups.values("user_id", "year", "month", "category", "type", "total", "count")
+            .order_by()
+            .iterator()
+        )
+
+    rows_by_user = {}
+    for row in rollup_rows:
+        rows_by_user.setdefault(row["user_id"], []).append(row)
+
+    if not history:
+        first_year, _ = previous_month(today.year, today.month, 6)
+        budgets = budgets.filter(year__gte=first_year)
+    budgets_by_user = {}
+    for b in (
+        budgets
+        .values("user_id", "year", "month", "budget_amount")
+        .order_by()
+    ):
+        budgets_by_user.setdefault(b["user_id"], {})[(b["year"], b["month"])] = b["budget_amount"]
+
+    return {
+        user_id: UserAnalytics(rows_by_user.get(user_id, []), budgets_by_user.get(user_id, {}), today)
+        for user_id in (user_ids if user_ids is not None else set(rows_by_user) | set(budgets_by_user))
+    }
+
+
+def current_balance(user):
+    """All-time income minus expense (paise): the latest balance ledger row."""
+    return ledger.balance_on(user.pk)
+
+
+def net_saved_since(user, since, balance=None):
+    """
+    Income minus expense (paise) from ``since`` (inclusive) to date: the
+    current ``balance`` (looked up when not given) minus the ledger balance
+    the day before ``since``. Each is a single indexed lookup.
+    """
+    since = Transaction._meta.get_field("date").to_python(since)
+    if balance is None:
+        balance = ledger.balance_on(user.pk)
+    return balance - ledger.balance_on(user.pk, since - timedelta(days=1))
+
+
+def period_totals(user, year=None, month=None):
+    """
+    Income/expense totals and expense totals per category (paise) for an
+    optional year and/or month filter, read from the rollup table.
+    """
+    rollups = MonthlyRollup.objects.filter(user=user)
+    if year:
+        rollups = rollups.filter(year=year)
+    if month:
+        rollups = rollups.filter(month=month)
+
+    income = expense = 0
+    categories = {}
+    for row in rollups.values("type", "category").annotate(total=Sum("total")).order_by():
+        total = to_minor(row["total"])
+        if row["type"] == Transaction.INCOME:
+            income += total
+        else:
+            expense += total
+            categories[row["category"]] = categories.get(row["category"], 0) + total
+    return {"income": income, "expense": expense, "categories": categories}
+
+
+def top_expense_categories(user, n=2):
+    """Top ``n`` all-time expense categories as ``{"category", "total"}`` dicts (paise)."""
+    rows = (
+        MonthlyRollup.objects.filter(user=user, type=Transaction.EXPENSE)
+        .values("category")
+        .annotate(total=Sum("total"))
+        .order_by("-total")[:n]
+    )
+    return [{"category": r["category"], "total": to_minor(r["total"])} for r in rows]
@@ -0,0 +1,292 @@
+"""
+Anomaly and spike detection over a user's full expense history.
+
+The expenses are read once, in date order, into compact columns
+(:class:`ExpenseSeries`): NumPy arrays when NumPy is installed, otherwise
+``array`` module arrays. Both backends run the same arithmetic and return the
+same results:
+
+* **Unusual expenses**: each expense is compared with the median and MAD
+  (median absolute deviation) of the preceding ``window`` expenses in its
+  category. Scoring starts at the ``ANOMALY_MIN_HISTORY``-th expense of a
+  category, and the baseline is recomputed every ``step`` expenses from
+  there, so the cost is one small sort per step rather than per row, and a
+  short history is still checked. An expense is flagged when
+  its modified z-score ``0.6745 * (amount - median) / MAD`` reaches
+  ``threshold`` (Iglewicz and Hoaglin's 3.5 by default).
+* **Spending spikes**: each day's expense total is scored against the mean
+  and standard deviation of the previous ``window`` spending days. Running
+  sums make that one pass, and the sums are exact integer paise.
+
+Amounts are integer paise throughout; Decimals only appear in the results.
+"""
+from array import array
+from datetime import date
+from math import isqrt, sqrt
+
+from django.db import connection
+from django.db.models import CharField, F, IntegerField
+from django.db.models.functions import Cast, Round
+
+from .analytics import CATEGORY_LABELS
+from .models import Transaction
+from .money import from_minor
+
+try:
+    import numpy as np
+except ImportError:  # the array fallback gives the same results, more slowly
+    np = None
+
+CATEGORY_CODES = [code for code, _ in Transaction.CATEGORY_CHOICES]
+CATEGORY_INDEX = {code: index for index, code in enumerate(CATEGORY_CODES)}
+
+FETCH_SIZE = 2000
+
+ANOMALY_WINDOW = 90
+ANOMALY_STEP = 30
+ANOMALY_MIN_HISTORY = 10
+ANOMALY_THRESHOLD = 3.5
+# 0.6745 is the 75th percentile of the standard normal: MAD / 0.6745 ~ sigma
+MAD_TO_SIGMA = 0.6745
+
+SPIKE_WINDOW = 30
+SPIKE_MIN_HISTORY = 7
+SPIKE_THRESHOLD = 3.0
+
+
+class ExpenseSeries:
+    """A user's expenses in date order as parallel columns."""
+
+    def __init__(self, ids, days, categories, amounts):
+        self.ids = ids  # transaction pks
+        self.days = days  # date.toordinal()
+        self.categories = categories  # index into CATEGORY_CODES
+        self.amounts = amounts  # paise
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_expense_series(user):
+    """
+    Read every expense of ``user`` with one query. Amounts are converted to
+    paise in SQL and the query only touches the ``(user, type, date,
+    category, amount)`` index.
+    """
+    query = (
+        Transaction.objects.filter(user=user, type=Transaction.EXPENSE)
+        .order_by("date")
+        .annotate(
+            day=Cast("date", CharField()),
+            paise=Cast(Round(F("amount") * 100), IntegerField()),
+        )
+        .values_list("id", "day", "category", "paise")
+    )
+    # Per-row date and value converters would cost more than the fetch
+    # itself, so read plain values in chunks straight into the columns and
+    # parse each distinct day once.
+    sql, params = query.query.sql_with_params()
+    ids, days, categories, amounts = array("q"), array("q"), array("b"), array("q")
+    ordinals = {}
+    other = CATEGORY_INDEX[Transaction.CATEGORY_OTHER]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for rows in iter(lambda: cursor.fetchmany(FETCH_SIZE), []):
+            chunk_ids, chunk_days, chunk_codes, chunk_amounts = zip(*rows)
+            ids.extend(chunk_ids)
+            days.extend([
+                ordinals.get(value) or ordinals.setdefault(value, date.fromisoformat(value).toordinal())
+                for value in chunk_days
+            ])
+            categories.extend([CATEGORY_INDEX.get(code, other) for code in chunk_codes])
+            amounts.extend(chunk_amounts)
+
+    if np is not None:
+        # zero-copy views of the same buffers
+        return ExpenseSeries(
+            np.frombuffer(ids, dtype=np.int64),
+            np.frombuffer(days, dtype=np.int64),
+            np.frombuffer(categories, dtype=np.int8),
+            np.frombuffer(amounts, dtype=np.int64),
+        )
+    return ExpenseSeries(ids, days, categories, amounts)
+
+
+# ---------- unusual expenses ----------
+
+
+def _median(ordered):
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return float(ordered[middle])
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _baseline_python(values):
+    """(median, sigma estimate) of ``values``; sigma is 0 when they barely vary."""
+    median = _median(sorted(values))
+    mad = _median(sorted(abs(value - median) for value in values))
+    return median, mad / MAD_TO_SIGMA
+
+
+def _category_flags_python(amounts, window, step, threshold):
+    """[(position, score)] of the flagged expenses in one category's amounts."""
+    flagged = []
+    for start in range(ANOMALY_MIN_HISTORY, len(amounts), step):
+        baseline = amounts[max(0, start - window):start]
+        if len(baseline) < ANOMALY_MIN_HISTORY:
+            continue
+        median, sigma = _baseline_python(baseline)
+        if not sigma:
+            continue
+        for position in range(start, min(start + step, len(amounts))):
+            score = (amounts[position] - median) / sigma
+            if score >= threshold:
+                flagged.append((position, score))
+    return flagged
+
+
+def _category_flags_numpy(amounts, window, step, threshold):
+    if len(amounts) <= ANOMALY_MIN_HISTORY:
+        return []
+    values = amounts.astype(np.float64)
+    starts = np.arange(ANOMALY_MIN_HISTORY, len(values), step)
+    medians = np.zeros(len(starts))
+    sigmas = np.zeros(len(starts))
+
+    # full windows in one vectorized median; the first few blocks have a
+    # shorter history and go through the scalar path
+    full = starts >= window
+    if full.any():
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)[starts[full] - window]
+        medians[full] = np.median(windows, axis=1)
+        sigmas[full] = np.median(np.abs(windows - medians[full, None]), axis=1) / MAD_TO_SIGMA
+    for block in np.flatnonzero(~full):
+        medians[block], sigmas[block] = _baseline_python(values[:starts[block]].tolist())
+
+    positions = np.arange(ANOMALY_MIN_HISTORY, len(values))
+    blocks = (positions - ANOMALY_MIN_HISTORY) // step
+    usable = sigmas[blocks] > 0
+    positions, blocks = positions[usable], blocks[usable]
+    scores = (values[positions] - medians[blocks]) / sigmas[blocks]
+    hits = scores >= threshold
+    return list(zip(positions[hits].tolist(), scores[hits].tolist()))
+
+
+def unusual_expenses(series, window=ANOMALY_WINDOW, step=ANOMALY_STEP, threshold=ANOMALY_THRESHOLD):
+    """
+    Expenses far above the recent typical amount of their category, most
+    recent first, as ``{"id", "amount", "category", "date", "score", "reason"}``.
+    """
+    flagged = []
+    for index, code in enumerate(CATEGORY_CODES):
+        if np is not None:
+            members = np.flatnonzero(series.categories == index)
+            hits = _category_flags_numpy(series.amounts[members], window, step, threshold)
+        else:
+            members = [i for i, category in enumerate(series.categories) if category == index]
+            hits = _category_flags_python([series.amounts[i] for i in members], window, step, threshold)
+        label = CATEGORY_LABELS.get(code, "Other")
+        for position, score in hits:
+            row = int(members[position])
+            flagged.append({
+                "id": int(series.ids[row]),
+                "amount": from_minor(int(series.amounts[row])),
+                "category": label,
+                "date": date.fromordinal(int(series.days[row])),
+                "score": round(score, 2),
+                "reason": "High relative to recent amounts in this category",
+            })
+    flagged.sort(key=lambda item: (item["date"], item["id"]), reverse=True)
+    return flagged
+
+
+# ---------- spending spikes ----------
+
+
+def _daily_totals(series):
+    """(days, totals) of the days with any spending, in date order."""
+    if np is not None:
+        if not len(series):
+            return series.days, series.amounts
+        days, starts = np.unique(series.days, return_index=True)
+        return days, np.add.reduceat(series.amounts, starts)
+    days, totals = array("q"), array("q")
+    for day, amount in zip(series.days, series.amounts):
+        if days and days[-1] == day:
+            totals[-1] += amount
+        else:
+            days.append(day)
+            totals.append(amount)
+    return days, totals
+
+
+def _spike_flags_numpy(totals, window, threshold):
+    # Windowed sums as differences of running sums. The running sum of
+    # squares may wrap around int64 over a long history, but the window
+    # differences stay exact as long as n*q fits; beyond that, use Python ints.
+    if len(totals) and int(totals.max()) > isqrt(2**63 - 1) // (window + 1):
+        totals = totals.astype(object)
+    sums = np.concatenate([[0], np.cumsum(totals)])
+    with np.errstate(over="ignore"):
+        squares = np.concatenate([[0], np.cumsum(totals * totals)])
+    ends = np.arange(len(totals))
+    starts = np.maximum(ends - window, 0)
+    n = ends - starts
+    s = sums[ends] - sums[starts]
+    with np.errstate(over="ignore"):
+        q = squares[ends] - squares[starts]
+    spread = n * q - s * s
+    candidates = np.flatnonzero((n >= SPIKE_MIN_HISTORY) & (spread > 0))
+    scores = (n * totals - s)[candidates].astype(np.float64) / np.sqrt(
+        spread[candidates].astype(np.float64)
+    )
+    hits = scores >= threshold
+    return list(zip(candidates[hits].tolist(), scores[hits].tolist()))
+
+
+def _spike_flags_python(totals, window, threshold):
+    flagged = []
+    s = q = 0
+    for i, total in enumerate(totals):
+        n = min(i, window)
+        spread = n * q - s * s
+        if n >= SPIKE_MIN_HISTORY and spread > 0:
+            score = float(n * total - s) / sqrt(float(spread))
+            if score >= threshold:
+                flagged.append((i, score))
+        s += total
+        q += total * total
+        if i >= window:
+            dropped = totals[i - window]
+            s -= dropped
+            q -= dropped * dropped
+    return flagged
+
+
+def spending_spikes(series, window=SPIKE_WINDOW, threshold=SPIKE_THRESHOLD):
+    """
+    Days whose expense total is ``threshold`` standard deviations above the
+    mean of the previous ``window`` spending days, most recent first, as
+    ``{"date", "total", "score"}``.
+    """
+    days, totals = _daily_totals(series)
+    # z = (x - mean) / sd = (n*x - S) / sqrt(n*Q - S^2) for the window's n, S, Q
+    if np is not None:
+        hits = _spike_flags_numpy(totals, window, threshold)
+    else:
+        hits = _spike_flags_python(totals, window, threshold)
+    return [
+        {
+            "date": date.fromordinal(int(days[i])),
+            "total": from_minor(int(totals[i])),
+            "score": round(score, 2),
+        }
+        for i, score in reversed(hits)
+    ]
+
+
+def detect_anomalies(user):
+    """``(unusual expenses, spending spikes)`` for ``user`` from one query."""
+    series = load_expense_series(user)
+    return unusual_expenses(series), spending_spikes(series)
@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class TrackerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tracker"
 
+    def ready(self):
+        # register signal handlers
+        from . import signals  # noqa: F401
+        from .assets import check_vendored_assets
+
+        checks.register(check_vendored_assets, checks.Tags.staticfiles)
@@ -0,0 +1,95 @@
+"""
+Third-party front-end assets, served as this app's own static files.
+
+Every asset is pinned to a file of an npm package version.
+``manage.py vendor_assets`` downloads the missing ones, with the source maps
+they reference, into tracker/static/tracker/vendor/, where they are
+committed. collectstatic then fingerprints and precompresses them like any
+other static file (see tracker.storage).
+
+Pages never load an asset from a CDN when ``DEBUG`` is off: a missing one
+is a system check error (``tracker.E001``, :func:`check_vendored_assets`)
+and :func:`asset_url` raises ImproperlyConfigured. In development it is only
+a warning (``tracker.W001``), and the page loads the pinned jsDelivr URL.
+"""
+import functools
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.templatetags.static import static
+
+VENDOR_DIR = "tracker/vendor"
+CDN_URL = "https://cdn.jsdelivr.net/npm/{package}@{version}/{path}"
+
+# name -> (npm package, version, file in the package, path under VENDOR_DIR)
+VENDOR_ASSETS = {
+    "bootstrap.css": ("bootstrap", "5.3.2", "dist/css/bootstrap.min.css", "bootstrap/bootstrap.min.css"),
+    "bootstrap.js": ("bootstrap", "5.3.2", "dist/js/bootstrap.min.js", "bootstrap/bootstrap.min.js"),
+    "popper.js": ("@popperjs/core", "2.11.8", "dist/umd/popper.min.js", "popper/popper.min.js"),
+    "bootstrap-icons.css": (
+        "bootstrap-icons", "1.11.3", "font/bootstrap-icons.min.css", "bootstrap-icons/bootstrap-icons.min.css",
+    ),
+    # the fonts bootstrap-icons.css points at, relative to it
+    "bootstrap-icons.woff2": (
+        "bootstrap-icons", "1.11.3", "font/fonts/bootstrap-icons.woff2",
+        "bootstrap-icons/fonts/bootstrap-icons.woff2",
+    ),
+    "bootstrap-icons.woff": (
+        "bootstrap-icons", "1.11.3", "font/fonts/bootstrap-icons.woff",
+        "bootstrap-icons/fonts/bootstrap-icons.woff",
+    ),
+    # vendored without its trailing sourceMappingURL comment, as the map was
+    # not available; `vendor_assets --asset chart.js --force` restores both
+    "chart.js": ("chart.js", "4.4.0", "dist/chart.umd.js", "chart.js/chart.umd.js"),
+}
+
+
+def static_path(name):
+    """The asset's path relative to the static root."""
+    return f"{VENDOR_DIR}/{VENDOR_ASSETS[name][3]}"
+
+
+def cdn_url(name):
+    package, version, path, _ = VENDOR_ASSETS[name]
+    return CDN_URL.format(package=package, version=version, path=path)
+
+
+@functools.lru_cache(maxsize=None)
+def is_vendored(name):
+    return finders.find(static_path(name)) is not None
+
+
+def asset_url(name):
+    """URL of a vendored asset: the fingerprinted static file."""
+    if is_vendored(name):
+        return static(static_path(name))
+    if settings.DEBUG:
+        return cdn_url(name)
+    raise ImproperlyConfigured(
+        f"Front-end asset {name!r} is not vendored; run `manage.py vendor_assets`."
+    )
+
+
+def check_vendored_assets(app_configs=None, **kwargs):
+    """
+    System check: every pinned asset is vendored, so no page loads a CDN.
+    An error with DEBUG off, where :func:`asset_url` would raise.
+    """
+    messages = []
+    for name in VENDOR_ASSETS:
+        if finders.find(static_path(name)) is not None:
+            continue
+        hint = "Run `manage.py vendor_assets` and commit tracker/static/tracker/vendor/."
+        if settings.DEBUG:
+            messages.append(checks.Warning(
+                f"Front-end asset {name!r} is not vendored; pages load it from {cdn_url(name)}.",
+                hint=hint, obj=static_path(name), id="tracker.W001",
+            ))
+        else:
+            messages.append(checks.Error(
+                f"Front-end asset {name!r} is not vendored; pages using it fail.",
+                hint=hint, obj=static_path(name), id="tracker.E001",
+            ))
+    return messages
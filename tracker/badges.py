@@ -0,0 +1,49 @@
+"""
+Achievement badge evaluation.
+
+Badges are awarded when a user's data changes (see ``tracker.signals``) or in
+batch with ``manage.py evaluate_badges``, never on a dashboard read. Awards are
+written with ``bulk_create(ignore_conflicts=True)`` so re-evaluating is cheap
+and idempotent.
+"""
+from .analytics import load_many_user_analytics
+from .models import AchievementBadge
+
+
+def earned_badges(analytics):
+    """Badge keys ``analytics`` (a UserAnalytics) currently qualifies for."""
+    earned = set()
+    health = analytics.health()
+
+    # Savings Champion: average savings rate >= 15%
+    if health["savings_rate"] >= 1500:
+        earned.add(AchievementBadge.SAVINGS_CHAMPION)
+
+    # Budget Master: within budget for last 3 checked months
+    checked, within = health["budgets_checked"], health["budgets_within"]
+    if checked and within >= min(3, checked):
+        earned.add(AchievementBadge.BUDGET_MASTER)
+
+    # Expense Reducer: last-month expense < previous-month expense by >=10%
+    monthly_expenses = analytics.monthly_expenses(2)
+    if monthly_expenses[0] * 10 < monthly_expenses[1] * 9:
+        earned.add(AchievementBadge.EXPENSE_REDUCER)
+
+    return earned
+
+
+def evaluate_badges(user_ids=None, today=None, analytics_by_user=None):
+    """
+    Award every badge earned by ``user_ids`` (or all users) using the batch
+    analytics loader, or the already loaded ``analytics_by_user``. Returns the
+    number of badge rows offered for insert.
+    """
+    if analytics_by_user is None:
+        analytics_by_user = load_many_user_analytics(user_ids, today)
+    awards = [
+        AchievementBadge(user_id=user_id, badge=badge)
+        for user_id, analytics in analytics_by_user.items()
+        for badge in earned_badges(analytics)
+    ]
+    AchievementBadge.objects.bulk_create(awards, ignore_conflicts=True)
+    return len(awards)
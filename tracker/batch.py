@@ -0,0 +1,60 @@
+"""
+Helpers for management commands that process every user in parallel.
+
+Users are split into contiguous primary-key shards, and each shard is handed
+to a worker process. Workers only read and return plain results. The parent
+process writes them, so SQLite never sees concurrent writers. With a single
+worker, or on an in-memory database that other processes cannot open, the
+shards are processed inline instead.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def user_ids(usernames=None):
+    """Primary keys of every user (or of ``usernames``), in order."""
+    users = get_user_model().objects.order_by("pk")
+    if usernames:
+        users = users.filter(username__in=usernames)
+    return list(users.values_list("pk", flat=True))
+
+
+def shard(ids, size):
+    """Split ``ids`` into consecutive lists of at most ``size`` items."""
+    return [ids[start:start + size] for start in range(0, len(ids), size)]
+
+
+def _setup_worker():
+    # a no-op when the worker was forked from an already configured parent
+    django.setup()
+
+
+def _can_fork_workers():
+    return connection.vendor != "sqlite" or not connection.is_in_memory_db()
+
+
+def run_sharded(func, shards, workers, *args):
+    """
+    Call ``func(shard, *args)`` for every shard, in ``workers`` processes,
+    and yield ``(shard, result)`` as each finishes. ``func`` must be a
+    module-level function and its arguments and results picklable.
+    """
+    if workers <= 1 or len(shards) <= 1 or not _can_fork_workers():
+        for ids in shards:
+            yield ids, func(ids, *args)
+        return
+
+    # children must open their own connections, not share the parent's
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_setup_worker) as pool:
+        futures = {pool.submit(func, ids, *args): ids for ids in shards}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
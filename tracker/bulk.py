@@ -0,0 +1,147 @@
+"""
+Bulk insertion of transactions that keeps derived data in sync.
+
+Bulk inserts skip the per-row model signals, so
+:func:`bulk_insert_transactions` sends ``transactions_bulk_created`` once per
+call instead; its receivers apply the rollup deltas in the same database
+transaction and refresh caches and badges after commit.
+"""
+from operator import attrgetter
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Transaction
+from .signals import transactions_bulk_created
+
+# keeps ``dedupe_key IN (...)`` lookups well under SQLite's variable limit
+KEY_LOOKUP_CHUNK = 500
+
+
+def existing_dedupe_keys(user_id, keys):
+    """The subset of ``keys`` already stored for ``user_id``."""
+    keys = list(keys)
+    found = set()
+    for start in range(0, len(keys), KEY_LOOKUP_CHUNK):
+        # no ORDER BY: Meta.ordering would steer SQLite to the date index
+        found.update(
+            Transaction.objects.filter(
+                user_id=user_id,
+                dedupe_key__isnull=False,
+                dedupe_key__in=keys[start:start + KEY_LOOKUP_CHUNK],
+            )
+            .order_by()
+            .values_list("dedupe_key", flat=True)
+        )
+    return found
+
+
+def existing_dedupe_pairs(pairs):
+    """
+    The subset of ``(user_id, dedupe_key)`` pairs already stored, for keys
+    spread over many users: one OR of pairs per chunk, each term an index
+    seek on the ``(user, dedupe_key)`` constraint. Written as SQL because
+    compiling the equivalent Q objects costs far more than the query.
+    """
+    pairs = list(pairs)
+    quote = connection.ops.quote_name
+    user_column = quote(Transaction._meta.get_field("user").column)
+    key_column = quote(Transaction._meta.get_field("dedupe_key").column)
+    term = f"({user_column} = %s AND {key_column} = %s)"
+    found = set()
+    with connection.cursor() as cursor:
+        for start in range(0, len(pairs), KEY_LOOKUP_CHUNK):
+            chunk = pairs[start:start + KEY_LOOKUP_CHUNK]
+            cursor.execute(
+                f"SELECT {user_column}, {key_column} FROM {quote(Transaction._meta.db_table)} "
+                f"WHERE {key_column} IS NOT NULL AND ({' OR '.join([term] * len(chunk))})",
+                [value for pair in chunk for value in pair],
+            )
+            found.update(map(tuple, cursor.fetchall()))
+    return found
+
+
+def drop_duplicates(transactions):
+    """
+    Remove transactions whose ``(user, dedupe_key)`` is already stored or
+    repeated earlier in the list. Rows without a key are always kept.
+    """
+    keys_by_user = {}
+    for tx in transactions:
+        if tx.dedupe_key:
+            keys_by_user.setdefault(tx.user_id, set()).add(tx.dedupe_key)
+    if len(keys_by_user) == 1:
+        [(user_id, keys)] = keys_by_user.items()
+        seen = {(user_id, key) for key in existing_dedupe_keys(user_id, keys)}
+    else:
+        seen = existing_dedupe_pairs(
+            (user_id, key) for user_id, keys in keys_by_user.items() for key in keys
+        )
+
+    fresh = []
+    for tx in transactions:
+        if tx.dedupe_key:
+            marker = (tx.user_id, tx.dedupe_key)
+            if marker in seen:
+                continue
+            seen.add(marker)
+        fresh.append(tx)
+    return fresh
+
+
+def insert_rows(transactions):
+    """
+    Insert unsaved transactions with a single ``executemany``.
+
+    ``bulk_create`` prepares every value through the SQL compiler, which on
+    SQLite costs several times the insert itself and caps imports at a few
+    thousand rows a second. The objects must hold clean values (as produced
+    by the TransactionForm field rules), which the database adapters take
+    as they are. The timestamps are prepared like the ORM prepares them:
+    sqlite3 would store an aware datetime with its offset, and then
+    ``created_at`` equality (the keyset cursor) never matches these rows.
+    Primary keys are not fetched back.
+    """
+    now = timezone.now()
+    fields = [field for field in Transaction._meta.concrete_fields if not field.primary_key]
+    date_field = Transaction._meta.get_field("date")
+    values = attrgetter(*(field.attname for field in fields))
+    stamp = Transaction._meta.get_field("created_at").get_db_prep_save(now, connection)
+    stamped = [i for i, field in enumerate(fields) if field.attname in ("created_at", "updated_at")]
+
+    rows = []
+    for tx in transactions:
+        tx.created_at = tx.updated_at = now
+        # ``date`` may still be the timezone.now default (a datetime)
+        tx.date = date_field.to_python(tx.date)
+        row = list(values(tx))
+        for i in stamped:
+            row[i] = stamp
+        rows.append(row)
+
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(Transaction._meta.db_table),
+        ", ".join(quote(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def bulk_insert_transactions(transactions):
+    """
+    Insert unsaved Transaction objects, skipping already-imported dedupe keys,
+    and update rollups, caches and badges for them. Returns the inserted list.
+
+    The duplicate check runs in the inserting transaction. SQLite's IMMEDIATE
+    transactions (student_budget_tracker.db) take the write lock when it
+    begins, so a concurrent import of the same statement waits, then finds
+    these rows and skips them instead of failing on the unique constraint.
+    """
+    with transaction.atomic():
+        fresh = drop_duplicates(transactions)
+        if fresh:
+            insert_rows(fresh)
+            transactions_bulk_created.send(sender=Transaction, transactions=fresh)
+    return fresh
@@ -0,0 +1,124 @@
+"""
+Per-user versioned caching of computed analytics.
+
+Each user has a version number stored in the cache; every cached analytics
+entry embeds it in its key. Changing any of the user's transactions, budgets
+or goals bumps the version (see ``tracker.signals``), which makes all of that
+user's entries unreachable at once without having to enumerate them.
+"""
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+VERSION_KEY = "tracker:user-version:{user_id}"
+ENTRY_KEY = "tracker:{name}:{user_id}:v{version}:{suffix}"
+STATS_KEY = "tracker:cache-stats:{name}:{outcome}"
+
+
+def _timeout():
+    return getattr(settings, "TRACKER_ANALYTICS_CACHE_TIMEOUT", 60 * 60)
+
+
+def _initial_version():
+    # Time based, so a version key that was evicted never comes back with a
+    # value an older (stale) entry could still be stored under.
+    return int(time.time() * 1000)
+
+
+def get_user_version(user_id):
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_user_version(user_id):
+    """Invalidate every cached analytics entry of ``user_id``."""
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _initial_version()
+        cache.set(key, version, None)
+        return version
+
+
+def _count(name, outcome):
+    key = STATS_KEY.format(name=name, outcome=outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+# entry key -> lock held while building it; a lock disappears once unused
+_build_locks = weakref.WeakValueDictionary()
+_build_locks_guard = threading.Lock()
+
+
+def _build_lock(key):
+    with _build_locks_guard:
+        lock = _build_locks.get(key)
+        if lock is None:
+            lock = _build_locks[key] = threading.Lock()
+        return lock
+
+
+def cached_for_user(user_id, name, builder, suffix=""):
+    """
+    Return the cached value of ``name`` for the user's current data version,
+    computing it with ``builder()`` on a miss. ``suffix`` distinguishes
+    variants of the same entry (e.g. the current date or filter params).
+    """
+    key = ENTRY_KEY.format(
+        name=name, user_id=user_id, version=get_user_version(user_id), suffix=suffix
+    )
+    value = cache.get(key)
+    if value is None:
+        # threads that miss together (parallel dashboard panels sharing the
+        # analytics entry) wait for one build instead of each running it
+        with _build_lock(key):
+            value = cache.get(key)
+            if value is None:
+                _count(name, "misses")
+                value = builder()
+                cache.set(key, value, _timeout())
+                return value
+    _count(name, "hits")
+    return value
+
+
+def store_for_user(user_id, name, value, suffix=""):
+    """
+    Pre-fill the entry :func:`cached_for_user` would compute for the user's
+    current data version (batch jobs warming the cache ahead of requests).
+    """
+    key = ENTRY_KEY.format(
+        name=name, user_id=user_id, version=get_user_version(user_id), suffix=suffix
+    )
+    cache.set(key, value, _timeout())
+
+
+def is_shared():
+    """Whether other processes (web workers) see this process's cache entries."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def cache_stats(name):
+    """Hit/miss counters for ``name`` as a dict."""
+    hits = cache.get(STATS_KEY.format(name=name, outcome="hits")) or 0
+    misses = cache.get(STATS_KEY.format(name=name, outcome="misses")) or 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": (hits / total) if total else 0.0,
+    }
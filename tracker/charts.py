@@ -0,0 +1,187 @@
+"""
+Chart payloads: the compact JSON the report charts fetch, instead of data
+serialized into the page on every render.
+
+Every payload is ``{"labels": [...], "values": [...]}`` with amounts in
+rupees. Spending series also report ``"points"``, the length of the series
+before reduction. The daily, weekly and monthly series are zero-filled, so
+each point is one equal step of time. A series longer than the requested
+number of points is reduced with Largest-Triangle-Three-Buckets
+(:func:`lttb`). LTTB keeps the spikes and dips a plot of every point would
+show. :func:`chart_payload` serializes a payload once per user data version.
+"""
+import json
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from .analytics import CATEGORY_LABELS, period_totals, report_period
+from .cache import cached_for_user
+from .health import months_between
+from .models import MonthlyRollup, Transaction
+from .money import from_minor, to_minor
+
+DEFAULT_POINTS = 365
+MIN_POINTS = 3  # LTTB always keeps the first and last point
+MAX_POINTS = 2000
+
+
+def lttb(ys, threshold):
+    """
+    Indices of the ``threshold`` points of the evenly spaced series ``ys``
+    that LTTB keeps. The first and last points are always kept. From each
+    bucket in between, it keeps the point that forms the largest triangle
+    with the previously kept point and the average of the next bucket.
+    """
+    n = len(ys)
+    if threshold >= n or threshold < MIN_POINTS:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        avg_x = (end + next_end - 1) / 2
+        avg_y = sum(ys[end:next_end]) / (next_end - end)
+
+        px, py = previous, ys[previous]
+        best, best_area = start, -1
+        for i in range(start, end):
+            # twice the triangle's area; only the comparison matters
+            area = abs((px - avg_x) * (ys[i] - py) - (px - i) * (avg_y - py))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        previous = best
+    kept.append(n - 1)
+    return kept
+
+
+def _series_payload(series, points):
+    """``series`` of (label, paise) as a payload of at most ``points`` points."""
+    values = [total for _, total in series]
+    keep = lttb(values, points)
+    return {
+        "labels": [series[i][0] for i in keep],
+        "values": [float(from_minor(values[i])) for i in keep],
+        "points": len(series),
+    }
+
+
+def daily_spend(user, period=None, today=None):
+    """
+    ``(date, paise)`` for every day from the first expense (or the start of
+    ``period``) to the last day of ``period``, or today.
+    """
+    today = today or timezone.now().date()
+    rows = Transaction.objects.filter(user=user, type=Transaction.EXPENSE)
+    if period:
+        rows = rows.filter(date__range=period)
+    totals = {
+        row["date"]: to_minor(row["total"])
+        for row in rows.values("date").annotate(total=Sum("amount")).order_by()
+    }
+    if not totals:
+        return []
+    first = period[0] if period else min(totals)
+    last = max(min(period[1], today), max(totals)) if period else max(today, max(totals))
+    return [
+        (day, totals.get(day, 0))
+        for day in (first + timedelta(days=offset) for offset in range((last - first).days + 1))
+    ]
+
+
+def weekly_spend(user, period=None, today=None):
+    """``(monday, paise)`` per week of :func:`daily_spend`."""
+    weeks = {}
+    for day, total in daily_spend(user, period, today):
+        monday = day - timedelta(days=day.weekday())
+        weeks[monday] = weeks.get(monday, 0) + total
+    return list(weeks.items())
+
+
+def monthly_spend(user, period=None, today=None):
+    """``((year, month), paise)`` per month, from the rollups."""
+    today = today or timezone.now().date()
+    rows = MonthlyRollup.objects.filter(user=user, type=Transaction.EXPENSE)
+    if period:
+        rows = rows.filter(year__gte=period[0].year, year__lte=period[1].year)
+    totals = {}
+    for row in rows.values("year", "month").annotate(total=Sum("total")).order_by():
+        key = (row["year"], row["month"])
+        if not period or (period[0].year, period[0].month) <= key <= (period[1].year, period[1].month):
+            totals[key] = to_minor(row["total"])
+    if not totals:
+        return []
+    current = (today.year, today.month)
+    if period:
+        first = (period[0].year, period[0].month)
+        last = max(max(totals), min((period[1].year, period[1].month), current))
+    else:
+        first, last = min(totals), max(max(totals), current)
+    return [(key, totals.get(key, 0)) for key in months_between(first, last)]
+
+
+def _category_chart(user, year, month, period, points, today):
+    totals = period_totals(user, year, month)
+    rows = sorted(totals["categories"].items())
+    return {
+        "labels": [CATEGORY_LABELS.get(code, "Other") for code, _ in rows],
+        "values": [float(from_minor(total)) for _, total in rows],
+    }
+
+
+def _income_expense_chart(user, year, month, period, points, today):
+    totals = period_totals(user, year, month)
+    return {
+        "labels": ["Income", "Expense"],
+        "values": [float(from_minor(totals["income"])), float(from_minor(totals["expense"]))],
+    }
+
+
+def _daily_chart(user, year, month, period, points, today):
+    series = daily_spend(user, period, today)
+    return _series_payload([(day.isoformat(), total) for day, total in series], points)
+
+
+def _weekly_chart(user, year, month, period, points, today):
+    series = weekly_spend(user, period, today)
+    return _series_payload([(monday.isoformat(), total) for monday, total in series], points)
+
+
+def _monthly_chart(user, year, month, period, points, today):
+    series = monthly_spend(user, period, today)
+    return _series_payload([(f"{m:02d}/{y}", total) for (y, m), total in series], points)
+
+
+# name -> payload builder(user, year, month, period, points, today)
+CHARTS = {
+    "categories": _category_chart,
+    "income-expense": _income_expense_chart,
+    "spend-daily": _daily_chart,
+    "spend-weekly": _weekly_chart,
+    "spend-monthly": _monthly_chart,
+}
+
+
+def chart_payload(user, name, year=None, month=None, points=DEFAULT_POINTS, today=None):
+    """
+    The JSON text of chart ``name`` for the report filters ``year`` and
+    ``month``, reduced to at most ``points`` points, cached per user version.
+    """
+    today = today or timezone.now().date()
+    points = max(MIN_POINTS, min(points, MAX_POINTS))
+    period = report_period(year, month, today)
+    if period:
+        year = period[0].year
+
+    def build():
+        payload = CHARTS[name](user, year, month, period, points, today)
+        return json.dumps(payload, separators=(",", ":"))
+
+    return cached_for_user(
+        user.pk, f"chart-{name}", build, suffix=f"{today.isoformat()}:{year}:{month}:{points}"
+    )
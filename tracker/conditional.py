@@ -0,0 +1,110 @@
+"""
+Conditional GET support (ETag / Last-Modified) for per-user analytics views.
+
+A user's analytics only change when one of their transactions, budgets,
+goals or badges does, so the validator is derived from those tables alone:
+the latest ``updated_at`` (``awarded_at`` for badges) and the row count of
+each, read with one query of indexed scalar subqueries. The counts make
+deletions visible, which the timestamps alone would miss; the transaction
+count is the sum of the daily ledger's per-day counts, so it costs one read
+per active day rather than a scan over every transaction. Requests whose
+validator still matches are answered with 304 before the view, and so any
+aggregation, runs.
+
+Clients that only send ``If-Modified-Since`` can miss a deletion that left
+every timestamp unchanged. Browsers send ``If-None-Match`` alongside it, and
+Django lets the ETag decide whenever one is sent.
+"""
+import hashlib
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .models import AchievementBadge, DailyBalance, MonthlyBudget, SavingsGoal, Transaction
+
+# label -> (model, timestamp field, (counted model, count expression))
+TRACKED_TABLES = {
+    "transactions": (Transaction, "updated_at", (DailyBalance, Sum("count"))),
+    "budgets": (MonthlyBudget, "updated_at", (MonthlyBudget, Count("pk"))),
+    "goals": (SavingsGoal, "updated_at", (SavingsGoal, Count("pk"))),
+    "badges": (AchievementBadge, "awarded_at", (AchievementBadge, Count("pk"))),
+}
+
+
+def _latest(model, field):
+    # ORDER BY ... LIMIT 1 is a seek on the (user, timestamp) index
+    rows = model.objects.filter(user=OuterRef("pk")).order_by(f"-{field}")
+    return Subquery(rows.values(field)[:1])
+
+
+def _count(model, expression):
+    rows = model.objects.filter(user=OuterRef("pk")).order_by().values("user")
+    return Subquery(rows.annotate(total=expression).values("total"))
+
+
+def data_state(user_id):
+    """``{label: (latest timestamp, row count)}`` of the user's tracked tables."""
+    annotations = {}
+    for label, (model, field, (counted, expression)) in TRACKED_TABLES.items():
+        annotations[f"{label}_latest"] = _latest(model, field)
+        annotations[f"{label}_rows"] = _count(counted, expression)
+    row = (
+        get_user_model().objects.filter(pk=user_id)
+        .annotate(**annotations)
+        .values(*annotations)
+        .first()
+    ) or {}
+    return {
+        label: (row.get(f"{label}_latest"), row.get(f"{label}_rows") or 0)
+        for label in TRACKED_TABLES
+    }
+
+
+def _request_state(request):
+    # etag_func and last_modified_func both need it; query once per request
+    if not hasattr(request, "_tracker_data_state"):
+        request._tracker_data_state = data_state(request.user.pk)
+    return request._tracker_data_state
+
+
+def _last_modified(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    stamps = [latest for latest, _ in _request_state(request).values() if latest]
+    return max(stamps) if stamps else None
+
+
+def _etag(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    state = _request_state(request)
+    raw = "|".join([
+        str(request.user.pk),
+        request.path,
+        request.GET.urlencode(),
+        # "today" feeds the default periods and days-remaining figures
+        timezone.now().date().isoformat(),
+        *(f"{label}:{latest and latest.isoformat()}:{rows}" for label, (latest, rows) in sorted(state.items())),
+    ])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def conditional_for_user(view):
+    """
+    Answer GETs with 304 Not Modified while the user's data is unchanged.
+    Responses are marked private and must be revalidated, so browsers keep
+    them for back navigation and refreshes but always ask first.
+    """
+    conditional_view = condition(etag_func=_etag, last_modified_func=_last_modified)(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = conditional_view(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
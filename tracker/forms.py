@@ -2,7 +2,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
-from .models import Transaction, MonthlyBudget, SavingsGoal
+from .models import Transaction, MonthlyBudget, SavingsGoal, RecurringTransaction
 
 
 class UserRegistrationForm(UserCreationForm):
@@ -40,6 +40,33 @@ class TransactionForm(forms.ModelForm):
         }
 
 
+class RecurringTransactionForm(forms.ModelForm):
+    class Meta:
+        model = RecurringTransaction
+        fields = [
+            "amount", "type", "category", "description",
+            "frequency", "interval", "start_date", "end_date",
+        ]
+        labels = {"interval": "Every", "start_date": "First date", "end_date": "Last date"}
+        widgets = {
+            "amount": forms.NumberInput(attrs={"class": "form-control", "step": "0.01"}),
+            "type": forms.Select(attrs={"class": "form-select"}),
+            "category": forms.Select(attrs={"class": "form-select"}),
+            "description": forms.TextInput(attrs={"class": "form-control"}),
+            "frequency": forms.Select(attrs={"class": "form-select"}),
+            "interval": forms.NumberInput(attrs={"class": "form-control", "min": 1}),
+            "start_date": forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+            "end_date": forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+        }
+
+    def clean(self):
+        cleaned = super().clean()
+        start, end = cleaned.get("start_date"), cleaned.get("end_date")
+        if start and end and end < start:
+            self.add_error("end_date", "The last date cannot be before the first date.")
+        return cleaned
+
+
 class BudgetForm(forms.ModelForm):
     class Meta:
         model = MonthlyBudget
@@ -82,8 +109,66 @@ class ReportFilterForm(forms.Form):
             attrs={"class": "form-control", "placeholder": "Month (1-12)"}
         ),
     )
+    year = forms.IntegerField(
+        required=False,
+        min_value=2000,
+        widget=forms.NumberInput(
+            attrs={"class": "form-control", "placeholder": "Year"}
+        ),
+    )
 
 
+class TransactionFilterForm(forms.Form):
+    type = forms.ChoiceField(
+        required=False,
+        choices=[("", "All types")] + Transaction.TRANSACTION_TYPE_CHOICES,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    category = forms.ChoiceField(
+        required=False,
+        choices=[("", "All categories")] + Transaction.CATEGORY_CHOICES,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    start_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+    )
+    end_date = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+    )
+
+    def filter(self, queryset):
+        """Apply the cleaned filters to a Transaction queryset."""
+        data = self.cleaned_data
+        if data.get("type"):
+            queryset = queryset.filter(type=data["type"])
+        if data.get("category"):
+            queryset = queryset.filter(category=data["category"])
+        if data.get("start_date"):
+            queryset = queryset.filter(date__gte=data["start_date"])
+        if data.get("end_date"):
+            queryset = queryset.filter(date__lte=data["end_date"])
+        return queryset
+
+
+class TransactionSearchForm(TransactionFilterForm):
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={
+            "type": "search",
+            "class": "form-control",
+            "placeholder": "Search descriptions",
+        }),
+    )
+
+
+class StatementImportForm(forms.Form):
+    statement = forms.FileField(
+        label="Bank statement (CSV)",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".csv,text/csv"}),
+    )
 
 
 class SavingsGoalForm(forms.ModelForm):
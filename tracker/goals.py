@@ -0,0 +1,177 @@
+"""
+Savings goal planning.
+
+:func:`plan_goals` plans every goal of a user with a fixed number of
+queries: the goals themselves, the current balance, one ledger range read
+that yields the saved-since-start amount for every start date, and the top
+expense categories shared by all suggestions. The per-goal EMI maths is
+plain integer paise arithmetic on those values.
+"""
+from bisect import bisect_left
+from decimal import Decimal
+
+from django.db.models import DateField, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import ledger
+from .analytics import CATEGORY_LABELS, top_expense_categories
+from .models import DailyBalance, SavingsGoal
+from .money import div_round, fraction, from_minor, to_minor
+
+EMI_MONTHS = (3, 6, 9, 12)
+
+
+def calculate_goal_plan(goal, current_saved, top_expenses=None):
+    """
+    Intelligently calculate EMI plan for a savings goal.
+
+    Args:
+        goal: SavingsGoal instance
+        current_saved: Decimal value of current savings towards goal
+        top_expenses: optional precomputed list of {"category", "total"} dicts
+            (totals in paise) for the user's top expense categories
+
+    Returns:
+        dict with keys:
+            - monthly_commitment: calculated/input monthly amount
+            - planned_months: calculated/input number of months
+            - remaining_to_save: amount still needed
+            - is_feasible: whether goal can be achieved
+            - expense_suggestions: list of category cuts if insufficient commitment
+    """
+    # all arithmetic in integer paise; Decimals only in the returned dict
+    remaining = to_minor(goal.target_amount) - to_minor(current_saved)
+
+    result = {
+        "monthly_commitment": goal.monthly_commitment or Decimal("0.00"),
+        "planned_months": goal.planned_months or 0,
+        "remaining_to_save": from_minor(max(remaining, 0)),
+        "is_feasible": False,
+        "expense_suggestions": [],
+        "standard_emi_options": []  # 3, 6, 9, 12 months options
+    }
+
+    if remaining <= 0:
+        result["is_feasible"] = True
+        result["planned_months"] = 0
+        result["monthly_commitment"] = Decimal("0.00")
+        return result
+
+    # ===== If user provided planned_months, calculate monthly_commitment =====
+    if goal.planned_months and goal.planned_months > 0:
+        result["monthly_commitment"] = from_minor(div_round(remaining, goal.planned_months))
+        result["planned_months"] = goal.planned_months
+        result["is_feasible"] = True
+
+    # ===== If user provided monthly_commitment, calculate planned_months =====
+    elif goal.monthly_commitment and goal.monthly_commitment > 0:
+        commitment = to_minor(goal.monthly_commitment)
+        result["monthly_commitment"] = goal.monthly_commitment
+        result["planned_months"] = -(-remaining // commitment)  # ceil
+        result["is_feasible"] = True
+
+    # ===== Generate standard EMI options (3, 6, 9, 12 months) =====
+    result["standard_emi_options"] = [
+        {"months": months, "monthly_commitment": from_minor(div_round(remaining, months))}
+        for months in EMI_MONTHS
+    ]
+
+    # ===== INTELLIGENT SUGGESTION: Analyze expenses if insufficient commitment =====
+    # user_id, not user: planning many goals must not load the user per goal
+    if result["monthly_commitment"] > 0 and goal.user_id:
+        # Check top 2 expense categories
+        if top_expenses is None:
+            top_expenses = top_expense_categories(goal.user, 2)
+
+        # If we have expense data, suggest 10% and 20% reductions
+        for top_expense in top_expenses:
+            category_total = top_expense["total"]
+            cut_10_percent = fraction(category_total, 10, 100)
+            cut_20_percent = fraction(category_total, 20, 100)
+            result["expense_suggestions"].append({
+                "category": CATEGORY_LABELS.get(top_expense["category"], "Other"),
+                "current_total": from_minor(category_total),
+                "cut_10_percent": from_minor(cut_10_percent),
+                "cut_20_percent": from_minor(cut_20_percent),
+                "remaining_after_10": from_minor(category_total - cut_10_percent),
+                "remaining_after_20": from_minor(category_total - cut_20_percent),
+            })
+
+    return result
+
+
+def balances_before(user_id, days):
+    """
+    ``{day: balance (paise) at the end of the previous day}`` for every day in
+    ``days``, from a single read of the ledger rows spanning them.
+    """
+    days = sorted(set(days))
+    if not days:
+        return {}
+    rows = DailyBalance.objects.filter(user_id=user_id)
+    # start the range at the last ledger row before the earliest day
+    anchor = rows.filter(date__lt=days[0]).order_by("-date").values("date")[:1]
+    span = list(
+        rows.filter(
+            date__gte=Coalesce(Subquery(anchor), Value(days[0]), output_field=DateField()),
+            date__lt=days[-1],
+        )
+        .order_by("date")
+        .values_list("date", "balance")
+    )
+    dates = [row_date for row_date, _ in span]
+
+    opening = {}
+    for day in days:
+        position = bisect_left(dates, day)
+        opening[day] = to_minor(span[position - 1][1]) if position else 0
+    return opening
+
+
+def goal_summary(goal, saved, top_expenses):
+    """Everything the goal cards show for ``goal`` with ``saved`` paise put aside."""
+    target = to_minor(goal.target_amount)
+    current_saved = from_minor(saved)
+    plan = calculate_goal_plan(goal, current_saved, top_expenses)
+    return {
+        "id": goal.pk,
+        "name": goal.name,
+        "target": goal.target_amount,
+        "start_date": goal.start_date,
+        "end_date": goal.end_date,
+        "is_completed": goal.is_completed,
+        "current_saved": current_saved,
+        "days_remaining": goal.days_remaining,
+        "progress_pct": (saved * 100 / target) if target > 0 else 0.0,
+        "has_sufficient_balance": goal.has_sufficient_balance(current_saved),
+        "required_monthly_saving": goal.required_monthly_saving(saved=saved),
+        "remaining_to_save": plan["remaining_to_save"],
+        "monthly_commitment": plan["monthly_commitment"],
+        "planned_months": plan["planned_months"],
+        "standard_emi_options": plan["standard_emi_options"],  # 3, 6, 9, 12 months
+        "expense_suggestions": plan["expense_suggestions"],  # Category cut recommendations
+    }
+
+
+def plan_goals(user, today=None, top_expenses=None):
+    """
+    Plan every savings goal of ``user``: open goals first (nearest end date
+    first), then expired and completed ones. The query count does not grow
+    with the number of goals. ``top_expenses`` may supply the top two
+    expense categories (as for :func:`calculate_goal_plan`).
+    """
+    today = today or timezone.now().date()
+    goals = list(SavingsGoal.objects.filter(user=user).order_by("is_completed", "end_date"))
+    if not goals:
+        return []
+    goals.sort(key=lambda goal: (goal.is_completed, goal.end_date < today))
+
+    balance = ledger.balance_on(user.pk)
+    opening = balances_before(user.pk, [goal.start_date for goal in goals])
+    if top_expenses is None:
+        top_expenses = top_expense_categories(user, 2)
+    return [
+        goal_summary(goal, balance - opening[goal.start_date], top_expenses)
+        for goal in goals
+    ]
@@ -0,0 +1,123 @@
+"""
+Monthly Financial Health Score snapshots.
+
+The score of a past month is the score as it stood at the end of that month
+(:meth:`UserAnalytics.as_of`), so a user's whole history is scored from the
+same rollup and budget rows the dashboard loads, without any per-month
+query. :func:`refresh_snapshots` rewrites the snapshots of many users with
+one analytics load, one delete and one bulk insert; the dashboard then only
+reads them (:func:`recent_snapshots`).
+
+A month's score depends only on that month and the months before it, so
+after a change dated in some month only the snapshots from that month on
+need rewriting (the ``since`` arguments below).
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .analytics import load_many_user_analytics, rate_health
+from .models import HealthScoreSnapshot
+from .money import from_minor, to_minor
+
+PARTS = ("savings", "expense", "budget", "consistency", "over_budget")
+COLUMNS = ("user", "year", "month", "score", *PARTS, "computed_at")
+
+
+def months_between(first, last):
+    """Every (year, month) from ``first`` to ``last`` inclusive."""
+    year, month = first
+    while (year, month) <= last:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def monthly_snapshots(user_id, analytics, since=None):
+    """
+    Snapshot rows ``(user_id, year, month, score, *PARTS)`` for every month
+    from the user's first data, or from ``since`` (year, month) when that is
+    later, to ``analytics.today``.
+    """
+    current = (analytics.today.year, analytics.today.month)
+    months = [key for key in analytics.months if key <= current] + list(analytics.budgets)
+    if not months:
+        return []
+    first = max(min(months), since) if since else min(months)
+    rows = []
+    for year, month in months_between(first, current):
+        health = analytics.as_of(year, month).health()
+        rows.append((
+            user_id, year, month, from_minor(health["score"]),
+            *(from_minor(health["parts"][part]) for part in PARTS),
+        ))
+    return rows
+
+
+def compute_snapshots(user_ids, today=None, analytics_by_user=None, since=None):
+    """
+    Snapshot rows of ``user_ids``, from ``since`` on when given (analytics
+    loaded in one batch unless ``analytics_by_user`` is given, which must
+    include every budget).
+    """
+    if analytics_by_user is None:
+        analytics_by_user = load_many_user_analytics(user_ids, today, history=True)
+    return [
+        row
+        for user_id, analytics in analytics_by_user.items()
+        for row in monthly_snapshots(user_id, analytics, since)
+    ]
+
+
+def replace_snapshots(user_ids, rows, since=None):
+    """
+    Swap the stored snapshots of ``user_ids``, or those from ``since`` on,
+    for ``rows``. Inserted with ``executemany`` rather than ``bulk_create``:
+    building a model instance per row would cost more than computing it.
+    """
+    meta = HealthScoreSnapshot._meta
+    computed_at = meta.get_field("computed_at").get_db_prep_save(timezone.now(), connection)
+    quote = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(meta.db_table),
+        ", ".join(quote(meta.get_field(name).column) for name in COLUMNS),
+        ", ".join(["%s"] * len(COLUMNS)),
+    )
+    stale = HealthScoreSnapshot.objects.filter(user_id__in=user_ids)
+    if since:
+        year, month = since
+        stale = stale.filter(Q(year__gt=year) | Q(year=year, month__gte=month))
+    # joins an enclosing transaction without a savepoint, like bulk_create
+    with transaction.atomic(savepoint=False):
+        stale.delete()
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [(*row, computed_at) for row in rows])
+    return len(rows)
+
+
+def refresh_snapshots(user_ids, today=None, analytics_by_user=None, since=None):
+    """
+    Recompute and store the snapshots of ``user_ids``, only those from
+    ``since`` (year, month) on when given; returns the number written.
+    """
+    user_ids = list(user_ids)
+    rows = compute_snapshots(user_ids, today, analytics_by_user, since)
+    return replace_snapshots(user_ids, rows, since)
+
+
+def snapshot_health(snapshot):
+    """The :meth:`UserAnalytics.health`-style rating stored in ``snapshot``."""
+    return rate_health({part: to_minor(getattr(snapshot, part)) for part in PARTS})
+
+
+def recent_snapshots(user, months=12, today=None):
+    """
+    The user's last ``months`` snapshots up to ``today``'s month, oldest
+    first: one indexed read.
+    """
+    today = today or timezone.now().date()
+    rows = (
+        HealthScoreSnapshot.objects.filter(user=user, year__lte=today.year)
+        .exclude(year=today.year, month__gt=today.month)
+        .order_by("-year", "-month")[:months]
+    )
+    return list(reversed(rows))
@@ -0,0 +1,248 @@
+"""
+Streaming import of bank statement CSVs into :class:`~tracker.models.Transaction`.
+
+Rows are read one at a time from a text stream, mapped onto the transaction
+fields, validated with the ``TransactionForm`` field rules and inserted in
+batches through :func:`tracker.bulk.bulk_insert_transactions`. Each row gets a
+fingerprint stored in ``dedupe_key``, so importing the same (or an
+overlapping) statement again only adds rows that are not there yet.
+
+Recognised columns (case-insensitive) cover our own CSV export and common
+bank layouts: a date, a description/narration, and either a signed
+``amount``, an ``amount`` plus ``type``, or separate debit/credit columns.
+Unknown categories fall back to Other.
+"""
+import csv
+import hashlib
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+
+from django import forms
+
+from .bulk import bulk_insert_transactions
+from .forms import TransactionForm
+from .models import Transaction
+
+DEFAULT_BATCH_SIZE = 10000
+MAX_REPORTED_ERRORS = 50
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y", "%d %b %Y", "%d-%b-%Y", "%d %b %y", "%d/%m/%y")
+
+COLUMN_ALIASES = {
+    "date": ("date", "transaction date", "txn date", "value date", "posting date"),
+    "description": ("description", "narration", "details", "particulars", "remarks"),
+    "amount": ("amount", "transaction amount"),
+    "debit": ("debit", "withdrawal", "withdrawal amt", "withdrawal amount", "dr"),
+    "credit": ("credit", "deposit", "deposit amt", "deposit amount", "cr"),
+    "type": ("type", "dr/cr", "cr/dr"),
+    "category": ("category",),
+}
+
+# keys cover the stored codes (any case) as well as bank wording
+TYPE_ALIASES = {
+    "income": Transaction.INCOME,
+    "credit": Transaction.INCOME,
+    "cr": Transaction.INCOME,
+    "expense": Transaction.EXPENSE,
+    "debit": Transaction.EXPENSE,
+    "dr": Transaction.EXPENSE,
+}
+CATEGORY_ALIASES = {
+    key.lower(): code
+    for code, label in Transaction.CATEGORY_CHOICES
+    for key in (code, label)
+}
+
+# the same field rules TransactionCreateView applies, without a form per row
+FIELD_RULES = TransactionForm.base_fields
+DESCRIPTION_MAX_LENGTH = Transaction._meta.get_field("description").max_length
+
+
+class StatementError(Exception):
+    pass
+
+
+class RowError(ValueError):
+    pass
+
+
+class ImportResult:
+    """Counts from one import; only the first MAX_REPORTED_ERRORS errors are kept."""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []  # (line number, message)
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def resolve_columns(header):
+    """Map our field names to column positions in the CSV ``header``."""
+    positions = {}
+    normalised = [name.strip().lower() for name in header]
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalised:
+                positions[field] = normalised.index(alias)
+                break
+    if "date" not in positions:
+        raise StatementError("The statement has no date column.")
+    if "amount" not in positions and not {"debit", "credit"} & positions.keys():
+        raise StatementError("The statement needs an amount column or debit/credit columns.")
+    return positions
+
+
+def parse_amount(value):
+    cleaned = value.replace(",", "").replace("₹", "").replace("Rs.", "").replace("INR", "").strip()
+    if not cleaned:
+        return None
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    try:
+        amount = Decimal(cleaned.strip("()"))
+    except InvalidOperation:
+        raise RowError(f"Invalid amount {value!r}.")
+    return -amount if negative else amount
+
+
+@lru_cache(maxsize=4096)
+def _strptime(value, fmt):
+    # statement rows share a few hundred dates; strptime is the slow part of a row
+    try:
+        return datetime.strptime(value, fmt).date()
+    except ValueError:
+        return None
+
+
+def parse_date(value, date_formats):
+    """Parse ``value`` with the first matching format; ``date_formats`` is a list."""
+    value = value.strip()
+    for position, fmt in enumerate(date_formats):
+        parsed = _strptime(value, fmt)
+        if parsed is None:
+            continue
+        if position:
+            # a statement uses one format throughout; try it first from now on
+            date_formats.insert(0, date_formats.pop(position))
+        return parsed
+    raise RowError(f"Unrecognised date {value!r}.")
+
+
+def map_row(row, columns, date_formats):
+    """Turn one CSV row into transaction field values (not yet validated)."""
+    def cell(field):
+        index = columns.get(field)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    tx_type = TYPE_ALIASES.get(cell("type").lower())
+    if "amount" in columns:
+        amount = parse_amount(cell("amount"))
+        if amount is None:
+            raise RowError("Missing amount.")
+        if tx_type is None:
+            tx_type = Transaction.EXPENSE if amount < 0 else Transaction.INCOME
+    else:
+        debit, credit = parse_amount(cell("debit")), parse_amount(cell("credit"))
+        if debit:
+            amount, tx_type = debit, Transaction.EXPENSE
+        elif credit:
+            amount, tx_type = credit, Transaction.INCOME
+        else:
+            raise RowError("Missing debit/credit amount.")
+
+    return {
+        "amount": abs(amount),
+        "type": tx_type,
+        "category": CATEGORY_ALIASES.get(cell("category").lower(), Transaction.CATEGORY_OTHER),
+        "description": cell("description")[:DESCRIPTION_MAX_LENGTH],
+        "date": parse_date(cell("date"), date_formats),
+    }
+
+
+@lru_cache(maxsize=None)
+def _clean_choice(name, value):
+    # choice fields re-walk their choices on every clean; results only depend on the value
+    return FIELD_RULES[name].clean(value)
+
+
+def validate(values):
+    """Apply the TransactionForm field rules; raises RowError with the messages."""
+    cleaned = {}
+    for name, value in values.items():
+        try:
+            if name in ("type", "category"):
+                cleaned[name] = _clean_choice(name, value)
+            else:
+                cleaned[name] = FIELD_RULES[name].clean(value)
+        except forms.ValidationError as exc:
+            raise RowError(f"{name}: {' '.join(exc.messages)}")
+    return cleaned
+
+
+def row_identity(values):
+    """The fields that make two rows the same transaction, as one string."""
+    return "|".join([
+        values["date"].isoformat(),
+        values["type"],
+        values["category"],
+        f"{values['amount']:.2f}",
+        values["description"],
+    ])
+
+
+def fingerprint(identity, occurrence):
+    """
+    Stable key for a row with :func:`row_identity` ``identity``.
+    ``occurrence`` numbers identical rows in one statement (two equal
+    coffees on the same day) so they are kept apart.
+    """
+    return "import:" + hashlib.sha1(f"{identity}|{occurrence}".encode()).hexdigest()
+
+
+def import_transactions(user, stream, batch_size=DEFAULT_BATCH_SIZE, date_format=None):
+    """
+    Import a CSV statement from the text ``stream`` for ``user``.
+    Raises StatementError for an unusable header; bad rows are counted and skipped.
+    """
+    date_formats = [date_format] if date_format else list(DATE_FORMATS)
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if not header:
+        raise StatementError("The statement is empty.")
+    columns = resolve_columns(header)
+
+    result = ImportResult()
+    occurrences = {}
+    batch = []
+
+    def flush():
+        created = bulk_insert_transactions(batch)
+        result.created += len(created)
+        result.duplicates += len(batch) - len(created)
+        batch.clear()
+
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        result.rows += 1
+        try:
+            values = validate(map_row(row, columns, date_formats))
+        except RowError as exc:
+            result.add_error(reader.line_num, str(exc))
+            continue
+
+        identity = row_identity(values)
+        occurrence = occurrences.get(identity, 0)
+        occurrences[identity] = occurrence + 1
+        batch.append(Transaction(user_id=user.pk, dedupe_key=fingerprint(identity, occurrence), **values))
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+    return result
@@ -0,0 +1,225 @@
+"""
+Incremental maintenance of the :class:`~tracker.models.DailyBalance` ledger.
+
+Each row holds one day's net change and the balance at the end of that day,
+so "balance on day X" is the latest row on or before X: a single lookup on
+the ``(user, date)`` unique index. A change of ``delta`` on day X adjusts
+that day's row and shifts every later row by ``delta``; nothing before X is
+touched. Like the monthly rollups, rows carry a transaction count and are
+removed when their last transaction goes.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+
+from .models import DailyBalance, Transaction
+from .money import from_minor, to_minor
+
+_DATE_FIELD = Transaction._meta.get_field("date")
+_AMOUNT_FIELD = Transaction._meta.get_field("amount")
+_NET_FIELD = DecimalField(max_digits=14, decimal_places=2)
+# keeps ``user_id IN (...)`` lookups well under SQLite's variable limit
+USER_CHUNK = 500
+
+
+def signed_amount(values):
+    """The transaction's effect on the balance, in paise."""
+    amount = to_minor(_AMOUNT_FIELD.to_python(values["amount"]))
+    return amount if values["type"] == Transaction.INCOME else -amount
+
+
+def add_change(changes, values, sign):
+    """Accumulate ``sign`` (+1/-1) times the transaction ``values`` into ``changes``."""
+    key = (values["user_id"], _DATE_FIELD.to_python(values["date"]))
+    delta, count = changes.get(key, (0, 0))
+    changes[key] = (delta + sign * signed_amount(values), count + sign)
+    return changes
+
+
+def shift(user_id, day, delta, count):
+    """
+    Add ``delta`` paise (and ``count`` transactions) to ``day`` and shift the
+    balance of every later day by ``delta``.
+    """
+    amount = from_minor(delta)
+    with transaction.atomic():
+        rows = DailyBalance.objects.filter(user_id=user_id)
+        day_row = rows.filter(date=day)
+        updated = day_row.update(
+            net=F("net") + amount, balance=F("balance") + amount, count=F("count") + count
+        )
+        if not updated:
+            if count <= 0:
+                # the day is already gone: the user's ledger is being deleted
+                return
+            opening = balance_on(user_id, day - timedelta(days=1))
+            try:
+                with transaction.atomic():
+                    DailyBalance.objects.create(
+                        user_id=user_id, date=day, net=amount,
+                        balance=from_minor(opening + delta), count=count,
+                    )
+            except IntegrityError:
+                # Another writer created the day in the meantime.
+                day_row.update(
+                    net=F("net") + amount, balance=F("balance") + amount, count=F("count") + count
+                )
+        elif count < 0:
+            day_row.filter(count__lte=0).delete()
+        if delta:
+            rows.filter(date__gt=day).update(balance=F("balance") + amount)
+
+
+def record_change(previous, current):
+    """Apply the ledger effect of a transaction moving from ``previous`` to ``current``."""
+    changes = {}
+    if previous is not None:
+        add_change(changes, previous, -1)
+    if current is not None:
+        add_change(changes, current, 1)
+    for (user_id, day), (delta, count) in changes.items():
+        if delta or count:
+            shift(user_id, day, delta, count)
+
+
+def repair_suffix(user_id, since, changes):
+    """
+    Fold ``{date: (paise, count)}`` changes (all on or after ``since``) into
+    the ledger by rewriting only the rows from ``since`` onwards. Cheaper than
+    :func:`shift` per day when many days change at once (bulk imports).
+    """
+    repair_suffixes(since, {user_id: changes})
+
+
+def repair_suffixes(since, changes_by_user):
+    """
+    :func:`repair_suffix` for many users at once, with ``{user_id: changes}``
+    all on or after ``since``: one read, one opening balance lookup, one
+    delete and one bulk insert per chunk of users.
+    """
+    user_ids = sorted(changes_by_user)
+    with transaction.atomic():
+        for start in range(0, len(user_ids), USER_CHUNK):
+            chunk = user_ids[start:start + USER_CHUNK]
+            suffix = DailyBalance.objects.filter(user_id__in=chunk, date__gte=since)
+            days_by_user = {user_id: {} for user_id in chunk}
+            for user_id, day, net, count in suffix.order_by().values_list("user_id", "date", "net", "count"):
+                days_by_user[user_id][day] = (to_minor(net), count)
+            openings = opening_balances(chunk, since)
+
+            rows = []
+            for user_id in chunk:
+                days = days_by_user[user_id]
+                for day, (delta, count) in changes_by_user[user_id].items():
+                    net, existing = days.get(day, (0, 0))
+                    days[day] = (net + delta, existing + count)
+
+                balance = openings.get(user_id, 0)
+                for day in sorted(days):
+                    net, count = days[day]
+                    balance += net
+                    if count > 0:
+                        rows.append(DailyBalance(
+                            user_id=user_id, date=day, net=from_minor(net),
+                            balance=from_minor(balance), count=count,
+                        ))
+            suffix.delete()
+            DailyBalance.objects.bulk_create(rows, batch_size=1000)
+
+
+def record_inserted(transactions):
+    """
+    Ledger update for freshly bulk-inserted transactions (clean field values).
+    Users whose earliest new transaction falls on the same day are repaired
+    together, so a run touching many users on one day (recurring
+    transactions) costs a few queries per chunk of users.
+    """
+    changes_by_user = {}
+    for tx in transactions:
+        amount = to_minor(tx.amount)
+        changes = changes_by_user.setdefault(tx.user_id, {})
+        delta, count = changes.get(tx.date, (0, 0))
+        changes[tx.date] = (
+            delta + (amount if tx.type == Transaction.INCOME else -amount), count + 1
+        )
+    by_since = {}
+    for user_id, changes in changes_by_user.items():
+        by_since.setdefault(min(changes), {})[user_id] = changes
+    for since, group in sorted(by_since.items()):
+        repair_suffixes(since, group)
+
+
+def opening_balances(user_ids, since):
+    """
+    ``{user_id: paise}``: each user's balance at the end of the day before
+    ``since`` (one index seek per user). Users without earlier rows are left out.
+    """
+    latest = (
+        DailyBalance.objects.filter(user_id=OuterRef("pk"), date__lt=since)
+        .order_by("-date")
+        .values("balance")[:1]
+    )
+    rows = (
+        get_user_model().objects.filter(pk__in=user_ids)
+        .annotate(opening=Subquery(latest))
+        .values_list("pk", "opening")
+    )
+    return {user_id: to_minor(opening) for user_id, opening in rows if opening is not None}
+
+
+def balance_on(user_id, day=None):
+    """Balance (paise) at the end of ``day``, or including everything when ``day`` is None."""
+    rows = DailyBalance.objects.filter(user_id=user_id)
+    if day is not None:
+        rows = rows.filter(date__lte=day)
+    return to_minor(rows.order_by("-date").values_list("balance", flat=True).first())
+
+
+def rebuild(user_ids=None, batch_size=1000):
+    """
+    Recompute the ledger from scratch (for all users, or only ``user_ids``)
+    with one grouped query and bulk inserts. Returns the number of rows written.
+    """
+    transactions = Transaction.objects.all()
+    ledger = DailyBalance.objects.all()
+    if user_ids is not None:
+        transactions = transactions.filter(user_id__in=user_ids)
+        ledger = ledger.filter(user_id__in=user_ids)
+
+    daily = (
+        transactions.values("user_id", "date")
+        .annotate(
+            net=Sum(Case(
+                When(type=Transaction.INCOME, then=F("amount")),
+                default=F("amount") * Value(-1),
+                output_field=_NET_FIELD,
+            )),
+            count=Count("id"),
+        )
+        .order_by("user_id", "date")
+    )
+
+    written = 0
+    with transaction.atomic():
+        ledger.delete()
+        batch = []
+        user_id, balance = None, 0
+        for row in daily.iterator(chunk_size=batch_size):
+            if row["user_id"] != user_id:
+                user_id, balance = row["user_id"], 0
+            net = to_minor(row["net"])
+            balance += net
+            batch.append(DailyBalance(
+                user_id=user_id, date=row["date"], net=from_minor(net),
+                balance=from_minor(balance), count=row["count"],
+            ))
+            if len(batch) >= batch_size:
+                DailyBalance.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            DailyBalance.objects.bulk_create(batch)
+            written += len(batch)
+    return written
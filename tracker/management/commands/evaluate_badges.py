@@ -0,0 +1,36 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from tracker.badges import evaluate_badges
+
+
+class Command(BaseCommand):
+    help = "Evaluate and award achievement badges for all users in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of users evaluated per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        user_ids = list(
+            get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+        )
+
+        started = time.perf_counter()
+        offered = 0
+        for start in range(0, len(user_ids), batch_size):
+            offered += evaluate_badges(user_ids[start:start + batch_size])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Evaluated badges for {len(user_ids)} users "
+                f"({offered} earned badges) in {elapsed:.2f}s."
+            )
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.importer import DEFAULT_BATCH_SIZE, StatementError, import_transactions
+
+
+class Command(BaseCommand):
+    help = "Import a CSV bank statement into a user's transactions, skipping rows already imported."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("path", help="CSV statement to import.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--date-format",
+            help="strptime format of the date column (default: try common formats).",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+
+        started = time.perf_counter()
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as stream:
+                result = import_transactions(
+                    user,
+                    stream,
+                    batch_size=options["batch_size"],
+                    date_format=options["date_format"],
+                )
+        except (OSError, UnicodeDecodeError, StatementError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - started
+
+        for line, message in result.errors:
+            self.stderr.write(f"line {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... and {result.error_count - len(result.errors)} more")
+
+        rate = result.rows / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {result.rows} rows in {elapsed:.2f}s ({rate:.0f} rows/s): "
+            f"{result.created} imported, {result.duplicates} already present, "
+            f"{result.error_count} skipped."
+        ))
@@ -0,0 +1,54 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import batch, recurring
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the due occurrences of every recurring transaction, catching up "
+        "on any missed while the scheduler was not running. Safe to rerun; "
+        "schedule it daily (e.g. from cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only materialize this username's rules (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=recurring.DEFAULT_BATCH_SIZE,
+            help="Number of rules per database transaction.",
+        )
+        parser.add_argument(
+            "--date",
+            type=date.fromisoformat,
+            help="Materialize occurrences up to this day (YYYY-MM-DD) instead of today.",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options["usernames"]:
+            user_ids = batch.user_ids(options["usernames"])
+            if len(user_ids) != len(set(options["usernames"])):
+                raise CommandError("One or more usernames do not exist.")
+
+        started = time.perf_counter()
+        rules = created = 0
+        for batch_rules, batch_created in recurring.materialize_due(
+            options["date"], user_ids, options["batch_size"]
+        ):
+            rules += batch_rules
+            created += batch_created
+            self.stdout.write(f"{rules} rules, {created} transactions created")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Materialized {created} transactions from {rules} due rules in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,35 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MonthlyRollup table from Transaction rows in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only rebuild rollups for this username (repeatable).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options["usernames"]:
+            User = get_user_model()
+            users = User.objects.filter(username__in=options["usernames"])
+            user_ids = list(users.values_list("pk", flat=True))
+            if len(user_ids) != len(set(options["usernames"])):
+                raise CommandError("One or more usernames do not exist.")
+
+        started = time.perf_counter()
+        written = rollups.rebuild(user_ids, batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {written} rollup rows in {elapsed:.2f}s.")
+        )
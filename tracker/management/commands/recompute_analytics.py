@@ -0,0 +1,96 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tracker import batch, recompute
+from tracker.cache import is_shared
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every user's rollups, health score snapshots, badges and "
+        "cached goal plans in user shards spread over worker processes. "
+        "Progress is checkpointed, so an interrupted run resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only recompute this username (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of users per shard.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=batch.default_workers(),
+            help="Worker processes; 1 computes every shard in this process.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            default=os.path.join(settings.BASE_DIR, ".recompute_analytics.json"),
+            help="File recording the users already recomputed (default: %(default)s).",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and recompute every shard.",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = batch.user_ids(options["usernames"])
+        if options["usernames"] and len(user_ids) != len(set(options["usernames"])):
+            raise CommandError("One or more usernames do not exist.")
+
+        today = timezone.now().date()
+        checkpoint = recompute.Checkpoint(options["checkpoint"], today)
+        if not options["restart"] and checkpoint.load():
+            remaining = [user_id for user_id in user_ids if not checkpoint.is_done(user_id)]
+            self.stdout.write(
+                f"Resuming from {checkpoint.path}: {len(user_ids) - len(remaining)} users already done."
+            )
+            user_ids = remaining
+
+        # goal plans only pay off in a cache the web processes can read
+        with_goal_plans = is_shared()
+        if not with_goal_plans:
+            self.stdout.write("Process-local cache backend: goal plans are left to the first request.")
+
+        shards = batch.shard(user_ids, options["batch_size"])
+        started = time.perf_counter()
+        users_done = rows = 0
+        for index, (ids, result) in enumerate(
+            batch.run_sharded(recompute.compute_shard, shards, options["workers"], today, with_goal_plans),
+            start=1,
+        ):
+            result = recompute.store_shard(ids, result, today)
+            checkpoint.mark(ids)
+            users_done += len(ids)
+            rows += len(result.rollups) + len(result.snapshots)
+
+            elapsed = time.perf_counter() - started
+            rate = users_done / elapsed if elapsed else 0
+            eta = (len(user_ids) - users_done) / rate if rate else 0
+            self.stdout.write(
+                f"[{index}/{len(shards)}] {users_done}/{len(user_ids)} users "
+                f"{rate:.0f} users/s, eta {eta:.0f}s"
+            )
+
+        checkpoint.clear()
+        elapsed = time.perf_counter() - started
+        rate = users_done / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed analytics for {users_done} users ({rows} rollup and snapshot rows) "
+                f"with {options['workers']} workers in {elapsed:.2f}s ({rate:.0f} users/s)."
+            )
+        )
@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tracker import batch, health
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the monthly Financial Health Score snapshots of all users, "
+        "in user shards spread over worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only snapshot this username (repeatable).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of users per shard (one analytics load each).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=batch.default_workers(),
+            help="Worker processes; 1 computes every shard in this process.",
+        )
+
+    def handle(self, *args, **options):
+        user_ids = batch.user_ids(options["usernames"])
+        if options["usernames"] and len(user_ids) != len(set(options["usernames"])):
+            raise CommandError("One or more usernames do not exist.")
+
+        today = timezone.now().date()
+        shards = batch.shard(user_ids, options["batch_size"])
+        started = time.perf_counter()
+        written = 0
+        for ids, snapshots in batch.run_sharded(health.compute_snapshots, shards, options["workers"], today):
+            written += health.replace_snapshots(ids, snapshots)
+            if options["verbosity"] >= 2:
+                self.stdout.write(f"  {len(ids)} users, {len(snapshots)} snapshots")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written} health score snapshots for {len(user_ids)} users "
+                f"in {len(shards)} shards in {elapsed:.2f}s."
+            )
+        )
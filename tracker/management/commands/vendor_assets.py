@@ -0,0 +1,69 @@
+import os
+import re
+import urllib.request
+from urllib.error import URLError
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import assets
+
+# ManifestStaticFilesStorage rewrites these references, so the map must exist
+SOURCE_MAP = re.compile(rb"sourceMappingURL=([^\s*]+)")
+
+
+def _download(url):
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            return response.read()
+    except URLError as exc:
+        raise CommandError(f"Could not download {url}: {exc}")
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as fh:
+        fh.write(content)
+
+
+class Command(BaseCommand):
+    help = (
+        "Download the pinned third-party front-end assets (tracker.assets) into "
+        "tracker/static/tracker/vendor/, so pages never load them from a CDN."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--asset",
+            action="append",
+            dest="names",
+            choices=sorted(assets.VENDOR_ASSETS),
+            help="Only vendor this asset (repeatable).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Download assets that are already vendored again.",
+        )
+
+    def handle(self, *args, **options):
+        static_root = os.path.join(apps.get_app_config("tracker").path, "static")
+        fetched = 0
+        for name in options["names"] or assets.VENDOR_ASSETS:
+            target = os.path.join(static_root, assets.static_path(name))
+            if os.path.exists(target) and not options["force"]:
+                continue
+            url = assets.cdn_url(name)
+            content = _download(url)
+            _write(target, content)
+            fetched += 1
+            self.stdout.write(f"{name}: {len(content) / 1024:.1f} KB from {url}")
+
+            match = SOURCE_MAP.search(content[-512:])
+            if match and not match.group(1).startswith(b"data:"):
+                map_name = match.group(1).decode()
+                map_url = f"{url.rsplit('/', 1)[0]}/{map_name}"
+                _write(os.path.join(os.path.dirname(target), map_name), _download(map_url))
+                self.stdout.write(f"  + {map_name}")
+
+        self.stdout.write(self.style.SUCCESS(f"Vendored {fetched} asset(s) into {static_root}."))
@@ -0,0 +1,89 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import Template
+
+from .profiling import RequestProfile, current_profile, profile_queries, stats
+
+
+def _install_template_timer():
+    """Wrap the Django template backend so sampled requests record render time."""
+    if getattr(Template.render, "_tracker_profiled", False):
+        return
+    original = Template.render
+
+    def render(self, context=None, request=None):
+        profile = current_profile.get()
+        if profile is None:
+            return original(self, context, request)
+        started = time.perf_counter()
+        sql_before = profile.sql_ms
+        try:
+            return original(self, context, request)
+        finally:
+            # lazy querysets run while rendering; count them as SQL only
+            elapsed = (time.perf_counter() - started) * 1000
+            profile.template_ms += elapsed - (profile.sql_ms - sql_before)
+
+    render._tracker_profiled = True
+    Template.render = render
+
+
+class RequestProfilingMiddleware:
+    """
+    Opt-in per-request profiling: SQL count and time, slowest queries,
+    template render time and view time.
+
+    Results are recorded in the rolling stats store shown on the staff
+    profiling page, and sent back in a ``Server-Timing`` header to staff
+    users (to everyone with ``DEBUG``). Enable with
+    ``TRACKER_PROFILING_ENABLED``; ``TRACKER_PROFILING_SAMPLE_RATE`` (0-1)
+    limits the share of requests that are profiled.
+
+    Queries on the async dashboard's pool threads are counted
+    (``_in_dashboard_thread`` wraps its connection too). A streaming
+    response's body is not: it is generated after the response has left the
+    middleware, so the export views' figures leave out the queries that read
+    the exported rows.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "TRACKER_PROFILING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "TRACKER_PROFILING_SAMPLE_RATE", 1.0)
+        _install_template_timer()
+
+    def __call__(self, request):
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with profile_queries(connection):
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+        view_ms = max(total_ms - profile.sql_ms - profile.template_ms, 0.0)
+
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.view_name if match else request.path
+        stats.record(endpoint, total_ms, view_ms, profile)
+
+        # query counts and timings are internals: only staff see them
+        user = getattr(request, "user", None)
+        if not settings.DEBUG and not (user is not None and user.is_staff):
+            return response
+        response["Server-Timing"] = ", ".join([
+            f'sql;dur={profile.sql_ms:.1f};desc="{profile.sql_count} queries"',
+            f"tpl;dur={profile.template_ms:.1f}",
+            f"view;dur={view_ms:.1f}",
+            f"total;dur={total_ms:.1f}",
+        ])
+        return response
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:51
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, F, Sum, Value, When
+
+
+def backfill_ledger(apps, schema_editor):
+    Transaction = apps.get_model('tracker', 'Transaction')
+    DailyBalance = apps.get_model('tracker', 'DailyBalance')
+    daily = (
+        Transaction.objects.values('user_id', 'date')
+        .annotate(
+            net=Sum(Case(
+                When(type='INCOME', then=F('amount')),
+                default=F('amount') * Value(-1),
+                output_field=models.DecimalField(max_digits=14, decimal_places=2),
+            )),
+            count=Count('id'),
+        )
+        .order_by('user_id', 'date')
+    )
+    rows = []
+    user_id, balance = None, Decimal('0.00')
+    for row in daily.iterator():
+        if row['user_id'] != user_id:
+            user_id, balance = row['user_id'], Decimal('0.00')
+        net = Decimal(row['net']).quantize(Decimal('0.01'))
+        balance += net
+        rows.append(DailyBalance(
+            user_id=user_id, date=row['date'], net=net, balance=balance, count=row['count']
+        ))
+    DailyBalance.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_transaction_dedupe_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('net', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_balances', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0008_conditional_get_timestamps'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='tracker_tx_user_type_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='transaction',
+            name='tracker_tx_user_type_amt_idx',
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', 'type', 'date', 'category', 'amount'], name='tracker_tx_expense_series_idx'),
+        ),
+    ]
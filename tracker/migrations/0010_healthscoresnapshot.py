@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_expense_series_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HealthScoreSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('savings', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('expense', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('budget', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('consistency', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('over_budget', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='health_snapshots', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'unique_together': {('user', 'year', 'month')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from tracker import search
+
+    search.install(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from tracker import search
+
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_healthscoresnapshot'),
+    ]
+
+    # the FTS5 index over transaction descriptions (tracker.search); SQLite only
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index, elidable=False),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def strip_utc_offsets(apps, schema_editor):
+    # bulk-inserted rows were stored with a "+00:00" suffix; the ORM stores
+    # naive UTC, and the keyset cursor compares created_at for equality
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for column in ("created_at", "updated_at"):
+            cursor.execute(
+                f"UPDATE tracker_transaction SET {column} = substr({column}, 1, length({column}) - 6) "
+                f"WHERE {column} LIKE '%+00:00'"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_recurringtransaction'),
+    ]
+
+    operations = [
+        migrations.RunPython(strip_utc_offsets, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,8 @@
 from django.conf import settings
+from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils import timezone
-from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from decimal import Decimal
 
 
 class Transaction(models.Model):
@@ -40,9 +41,31 @@ class Transaction(models.Model):
     date = models.DateField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Fingerprint of bulk-inserted rows (statement imports), so re-importing
+    # the same data is a no-op. Manually entered transactions leave it empty.
+    dedupe_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-date", "-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "dedupe_key"],
+                condition=models.Q(dedupe_key__isnull=False),
+                name="tracker_tx_user_dedupe_uniq",
+            ),
+        ]
+        indexes = [
+            # latest/recent lists and date-range filters (reports, goal period)
+            models.Index(fields=["user", "date", "created_at"], name="tracker_tx_user_date_idx"),
+            # per-type date scans; covers the expense series read by
+            # tracker.anomalies, so it never touches the table itself
+            models.Index(
+                fields=["user", "type", "date", "category", "amount"],
+                name="tracker_tx_expense_series_idx",
+            ),
+            # last-change lookup for conditional GETs (tracker.conditional)
+            models.Index(fields=["user", "updated_at"], name="tracker_tx_user_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.type} - {self.amount}"
@@ -57,10 +80,15 @@ class MonthlyBudget(models.Model):
     month = models.PositiveSmallIntegerField()
     year = models.PositiveIntegerField()
     budget_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("user", "month", "year")
         ordering = ["-year", "-month"]
+        indexes = [
+            # last-change lookup for conditional GETs (tracker.conditional)
+            models.Index(fields=["user", "updated_at"], name="tracker_budget_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.month}/{self.year} - {self.budget_amount}"
@@ -81,6 +109,7 @@ class SavingsGoal(models.Model):
     start_date = models.DateField(default=timezone.now)
     end_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # ===== NEW FIELDS FOR EMI PLANNING =====
     # User can input either monthly_commitment or planned_months, the other auto-calculates
@@ -100,6 +129,14 @@ class SavingsGoal(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # active goal lookup: user, not completed, nearest end date
+            models.Index(
+                fields=["user", "is_completed", "end_date"], name="tracker_goal_user_active_idx"
+            ),
+            # last-change lookup for conditional GETs (tracker.conditional)
+            models.Index(fields=["user", "updated_at"], name="tracker_goal_user_upd_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.name} ({self.target_amount})"
@@ -111,42 +148,33 @@ class SavingsGoal(models.Model):
     # ===== NEW METHOD FOR CHECKING SUFFICIENT BALANCE =====
     def has_sufficient_balance(self, current_saved: Decimal) -> bool:
         """Check if current_saved >= target_amount"""
-        return Decimal(str(current_saved)) >= Decimal(str(self.target_amount))
+        from .money import to_minor
+
+        return to_minor(current_saved) >= to_minor(self.target_amount)
     # ===== END CHECK METHOD =====
 
-    def required_monthly_saving(self) -> Decimal:
+    def required_monthly_saving(self, saved=None) -> Decimal:
+        """
+        Monthly amount still needed to reach the target by ``end_date``.
+        ``saved`` (paise saved since ``start_date``) skips the lookup when
+        the caller already has it, as :func:`tracker.goals.plan_goals` does.
+        """
+        # imported lazily: the analytics helpers import these models
+        from .analytics import net_saved_since
+        from .money import div_round, from_minor, to_minor
+
         remaining_days = self.days_remaining
         if remaining_days <= 0:
             return Decimal("0.00")
         # compute months remaining as integer number of 30-day periods (ceil), at least 1
         months_count = max((remaining_days + 29) // 30, 1)
-        # compute amount already saved towards goal
-        saved = (
-            self.user.transactions.filter(type=Transaction.INCOME, date__gte=self.start_date)
-            .aggregate(total=models.Sum("amount"))["total"]
-            or Decimal("0.00")
-        ) - (
-            self.user.transactions.filter(type=Transaction.EXPENSE, date__gte=self.start_date)
-            .aggregate(total=models.Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
-        # normalize types to Decimal to avoid issues when values are strings
-        target = Decimal(str(self.target_amount))
-        saved = Decimal(saved)
-        remaining = target - saved
-        if remaining <= Decimal("0.00"):
+        # amount already saved towards goal, in paise
+        if saved is None:
+            saved = net_saved_since(self.user, self.start_date)
+        remaining = to_minor(self.target_amount) - saved
+        if remaining <= 0:
             return Decimal("0.00")
-        # divide by integer month count to avoid Decimal division edge-cases
-        per_month = remaining / Decimal(months_count)
-        try:
-            return per_month.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        except InvalidOperation:
-            # Fallback: convert to float and round, then to Decimal
-            try:
-                val = float(per_month)
-            except Exception:
-                return Decimal("0.00")
-            return Decimal(str(round(val, 2)))
+        return from_minor(div_round(remaining, months_count))
 
 
 class AchievementBadge(models.Model):
@@ -174,3 +202,138 @@ class AchievementBadge(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.get_badge_display()}"
 
+
+
+class MonthlyRollup(models.Model):
+    """
+    Per-user monthly totals by category and type, maintained incrementally by
+    the Transaction signal handlers in ``tracker.signals``. Rebuild with
+    ``manage.py rebuild_rollups``.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="monthly_rollups",
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    category = models.CharField(max_length=20, choices=Transaction.CATEGORY_CHOICES)
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPE_CHOICES)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "year", "month", "category", "type")
+        ordering = ["-year", "-month"]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month}/{self.year} - {self.type} {self.category} - {self.total}"
+
+
+class DailyBalance(models.Model):
+    """
+    Per-user ledger: the net change and the running balance at the end of
+    each day that has transactions. Maintained incrementally by
+    ``tracker.ledger``; rebuild with ``manage.py rebuild_ledger``.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_balances",
+    )
+    date = models.DateField()
+    net = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    balance = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal("0.00"))
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "date")
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.date} - {self.balance}"
+
+
+class HealthScoreSnapshot(models.Model):
+    """
+    A user's Financial Health Score as it stood at the end of each month,
+    with its component scores, so the dashboard and the score trend are read
+    rather than recomputed. Refreshed for a user when their data changes
+    (``tracker.signals``); rebuild with ``manage.py snapshot_health_scores``.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="health_snapshots",
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    # points out of 100; the components add up to the score
+    score = models.DecimalField(max_digits=5, decimal_places=2)
+    savings = models.DecimalField(max_digits=5, decimal_places=2)
+    expense = models.DecimalField(max_digits=5, decimal_places=2)
+    budget = models.DecimalField(max_digits=5, decimal_places=2)
+    consistency = models.DecimalField(max_digits=5, decimal_places=2)
+    over_budget = models.DecimalField(max_digits=5, decimal_places=2)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "year", "month")
+        ordering = ["-year", "-month"]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month}/{self.year} - {self.score}"
+
+
+class RecurringTransaction(models.Model):
+    """
+    A transaction that repeats on a schedule (rent, a monthly stipend).
+    ``manage.py materialize_recurring`` creates its due occurrences as
+    Transactions and advances ``next_run_date`` (``tracker.recurring``).
+    """
+
+    DAILY = "DAILY"
+    WEEKLY = "WEEKLY"
+    MONTHLY = "MONTHLY"
+    YEARLY = "YEARLY"
+
+    FREQUENCY_CHOICES = [
+        (DAILY, "Daily"),
+        (WEEKLY, "Weekly"),
+        (MONTHLY, "Monthly"),
+        (YEARLY, "Yearly"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="recurring_transactions",
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    type = models.CharField(max_length=10, choices=Transaction.TRANSACTION_TYPE_CHOICES)
+    category = models.CharField(max_length=20, choices=Transaction.CATEGORY_CHOICES)
+    description = models.CharField(max_length=255, blank=True)
+    # schedule rule: every ``interval`` days/weeks/months/years from start_date;
+    # monthly and yearly occurrences keep start_date's day (or the month's last)
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default=MONTHLY)
+    interval = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
+    start_date = models.DateField(default=timezone.now)
+    end_date = models.DateField(null=True, blank=True)
+    # the first occurrence not yet materialized; None once the schedule has ended
+    next_run_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["next_run_date"]
+        indexes = [
+            # due rules for the scheduler (tracker.recurring.due_rule_ids)
+            models.Index(fields=["next_run_date"], name="tracker_recurring_due_idx"),
+            models.Index(fields=["user", "next_run_date"], name="tracker_recurring_user_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.get_frequency_display()} {self.type} - {self.amount}"
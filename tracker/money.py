@@ -0,0 +1,52 @@
+"""
+Money arithmetic in integer minor units (paise).
+
+Analytics code converts amounts to paise once with :func:`to_minor`, does all
+sums, ratios and splits on plain ints, and converts back with
+:func:`from_minor` only when values reach a template or JSON response. This
+avoids repeated ``Decimal(str(...))``/``quantize`` calls in hot loops and
+never depends on (or mutates) the thread's Decimal context.
+
+Percentages and scores use the same two-decimal fixed point: 1500 means
+15.00 (%, or points).
+"""
+from decimal import ROUND_HALF_UP, Decimal
+
+MINOR_UNITS = 100
+HUNDRED_PERCENT = 100 * MINOR_UNITS
+
+
+def to_minor(value):
+    """Convert a Decimal/str/int/float amount (or None) to integer paise."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int((value * MINOR_UNITS).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_minor(units):
+    """Convert integer paise back to a 2-place Decimal (template boundary)."""
+    return Decimal(units).scaleb(-2)
+
+
+def div_round(numerator, denominator):
+    """Integer division rounded half away from zero, like ROUND_HALF_UP."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def percent(part, whole):
+    """``part / whole`` as a fixed-point percentage (10000 == 100.00%)."""
+    return div_round(part * HUNDRED_PERCENT, whole)
+
+
+def fraction(units, numerator, denominator):
+    """``units * numerator / denominator`` rounded, e.g. a 20% cut of an amount."""
+    return div_round(units * numerator, denominator)
@@ -0,0 +1,60 @@
+"""
+Keyset (seek) pagination over transactions.
+
+Pages are ordered by ``(date, created_at, id)`` descending and the cursor is
+the key of the last row served, so fetching any page is an index seek on
+``tracker_tx_user_date_idx`` (id is SQLite's rowid and rides along in the
+index) instead of an OFFSET scan over every earlier row.
+"""
+import base64
+import json
+from datetime import date, datetime
+
+from django.db.models import Q
+
+KEYSET_ORDERING = ("-date", "-created_at", "-id")
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(tx):
+    key = [tx.date.isoformat(), tx.created_at.isoformat(), tx.pk]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return ``(date, created_at, id)`` for a cursor, or raise InvalidCursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        day, created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(day), datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor.") from exc
+
+
+def keyset_page(queryset, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return ``(rows, next_cursor)`` for the page after ``cursor``;
+    ``next_cursor`` is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if cursor:
+        day, created_at, pk = decode_cursor(cursor)
+        # the outer date__lte bound lets SQLite seek on the index
+        queryset = queryset.filter(date__lte=day).filter(
+            Q(date__lt=day)
+            | Q(date=day, created_at__lt=created_at)
+            | Q(date=day, created_at=created_at, pk__lt=pk)
+        )
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    return rows, next_cursor
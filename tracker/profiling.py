@@ -0,0 +1,131 @@
+"""
+Rolling in-process request statistics for the profiling middleware.
+
+Each endpoint keeps the last ``window`` samples in a deque; percentiles are
+computed on demand for the staff profiling page. Everything is per process,
+which keeps recording lock-cheap and free of I/O.
+"""
+import contextvars
+import heapq
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+# Profile of the request being served on this thread/task, if sampled.
+current_profile = contextvars.ContextVar("tracker_request_profile", default=None)
+
+
+class RequestProfile:
+    """
+    Timings collected while serving one request (milliseconds). Queries may
+    be recorded from several threads at once (the async dashboard's pool),
+    so their SQL time can add up to more than the request took.
+    """
+
+    SLOWEST_KEPT = 3
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.slowest = []  # min-heap of (ms, sql)
+        self._lock = threading.Lock()
+
+    def record_query(self, sql, ms):
+        item = (ms, sql[:300])
+        with self._lock:
+            self.sql_count += 1
+            self.sql_ms += ms
+            if len(self.slowest) < self.SLOWEST_KEPT:
+                heapq.heappush(self.slowest, item)
+            elif item > self.slowest[0]:
+                heapq.heapreplace(self.slowest, item)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    profile = current_profile.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if profile is not None:
+            profile.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+def profile_queries(connection):
+    """
+    Record the queries run on ``connection`` into the current request's
+    profile; a no-op when the request is not sampled. Threads that serve
+    part of a request on their own connection wrap their work in this too.
+    """
+    if current_profile.get() is None:
+        return nullcontext()
+    return connection.execute_wrapper(_timed_execute)
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100.0 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class ProfileStats:
+    """Thread-safe rolling window of request samples per endpoint."""
+
+    def __init__(self, window=500, slowest_kept=5):
+        self.window = window
+        self.slowest_kept = slowest_kept
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._slowest = {}
+
+    def record(self, endpoint, total_ms, view_ms, profile):
+        sample = (total_ms, view_ms, profile.sql_ms, profile.sql_count, profile.template_ms)
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append(sample)
+
+            slowest = self._slowest.setdefault(endpoint, [])
+            for item in profile.slowest:
+                if len(slowest) < self.slowest_kept:
+                    heapq.heappush(slowest, item)
+                elif item > slowest[0]:
+                    heapq.heapreplace(slowest, item)
+
+    def summary(self):
+        """Per-endpoint aggregates, slowest p95 first."""
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._samples.items()}
+            slowest = {k: sorted(v, reverse=True) for k, v in self._slowest.items()}
+
+        rows = []
+        for endpoint, samples in snapshot.items():
+            totals = [s[0] for s in samples]
+            n = len(samples)
+            rows.append({
+                "endpoint": endpoint,
+                "count": n,
+                "p50_ms": percentile(totals, 50),
+                "p95_ms": percentile(totals, 95),
+                "view_ms": sum(s[1] for s in samples) / n,
+                "sql_ms": sum(s[2] for s in samples) / n,
+                "sql_count": sum(s[3] for s in samples) / n,
+                "template_ms": sum(s[4] for s in samples) / n,
+                "slowest_queries": [{"ms": ms, "sql": sql} for ms, sql in slowest.get(endpoint, [])],
+            })
+        rows.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._slowest.clear()
+
+
+stats = ProfileStats()
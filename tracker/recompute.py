@@ -0,0 +1,172 @@
+"""
+Offline recompute of every user's derived analytics (``manage.py
+recompute_analytics``), so the first dashboard view after new data finds
+everything ready instead of building it.
+
+Per shard of users, a worker process (with its own database connection)
+groups the shard's transactions into fresh rollup rows and derives
+everything else from those rows in memory: the health score snapshots, the
+earned badges and, when the cache is shared with the web processes, the
+goal plans. The parent process stores each shard's results in one
+transaction, bumps the users' cache versions and pre-fills the goal plan
+entries under the new versions.
+"""
+import json
+import os
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Max
+
+from . import health, rollups
+from .analytics import load_many_user_analytics
+from .badges import earned_badges
+from .cache import bump_user_version, store_for_user
+from .goals import plan_goals
+from .models import AchievementBadge, MonthlyBudget, Transaction
+
+
+class ShardResult:
+    """What a worker computed for one shard; plain data, so it pickles cheaply."""
+
+    def __init__(self, state, rollups, snapshots, badges):
+        self.state = state  # shard_state() before reading
+        self.rollups = rollups  # rollup value dicts
+        self.snapshots = snapshots  # health.monthly_snapshots() rows
+        self.badges = badges  # (user_id, badge key)
+        self.goal_plans = {}  # user_id -> plan_goals() list
+
+
+def shard_state(user_ids):
+    """
+    Row counts and latest changes of the shard's transactions and budgets
+    (the health snapshots read both): any write alters it.
+    """
+    transactions = Transaction.objects.filter(user_id__in=user_ids).aggregate(
+        count=Count("pk"), latest=Max("updated_at")
+    )
+    budgets = MonthlyBudget.objects.filter(user_id__in=user_ids).aggregate(
+        count=Count("pk"), latest=Max("updated_at")
+    )
+    return (
+        transactions["count"],
+        transactions["latest"],
+        budgets["count"],
+        budgets["latest"],
+    )
+
+
+def compute_shard(user_ids, today, with_goal_plans=False):
+    """Worker side: read the shard's data and derive its analytics."""
+    state = shard_state(user_ids)
+    rows = list(rollups.grouped(user_ids))
+    analytics_by_user = load_many_user_analytics(user_ids, today, history=True, rollup_rows=rows)
+    result = ShardResult(
+        state=state,
+        rollups=rows,
+        snapshots=health.compute_snapshots(user_ids, analytics_by_user=analytics_by_user),
+        badges=[
+            (user_id, badge)
+            for user_id, analytics in analytics_by_user.items()
+            for badge in earned_badges(analytics)
+        ],
+    )
+    if with_goal_plans:
+        User = get_user_model()
+        for user_id, analytics in analytics_by_user.items():
+            top_expenses = [
+                {"category": code, "total": total} for code, total in analytics.top_categories(2)
+            ]
+            result.goal_plans[user_id] = plan_goals(User(pk=user_id), today, top_expenses)
+    return result
+
+
+def store_shard(user_ids, result, today):
+    """
+    Parent side: write a shard's results, then refresh its users' caches.
+    A shard whose transactions or budgets changed since the worker read them is
+    recomputed here, so the rollups never lose a concurrent write. Returns
+    the result actually stored.
+    """
+    with transaction.atomic():
+        if shard_state(user_ids) != result.state:
+            result = compute_shard(user_ids, today, bool(result.goal_plans))
+        rollups.replace(user_ids, result.rollups)
+        health.replace_snapshots(user_ids, result.snapshots)
+        AchievementBadge.objects.bulk_create(
+            [AchievementBadge(user_id=user_id, badge=badge) for user_id, badge in result.badges],
+            ignore_conflicts=True,
+        )
+    for user_id in user_ids:
+        bump_user_version(user_id)
+        if user_id in result.goal_plans:
+            # the entry views._user_goal_plans reads
+            store_for_user(user_id, "goals", result.goal_plans[user_id], suffix=today.isoformat())
+    return result
+
+
+class Checkpoint:
+    """
+    The users already stored by an interrupted run, so a rerun on the same
+    day skips them. The file is JSON lines: a header with the day, then one
+    line of user pks per stored shard, appended as the shard is stored, so a
+    run writes each pk once. The pks are kept one by one, not as ranges: a
+    run limited with ``--user`` skips the users between the selected ones,
+    and a later run must still recompute those.
+    """
+
+    def __init__(self, path, today):
+        self.path = path
+        self.today = today.isoformat()
+        self.done = set()
+        self.appending = False
+
+    def load(self):
+        """Read the file; returns False (and starts over) when it is missing or from another day."""
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                lines = fh.read().splitlines()
+            header = json.loads(lines[0]) if lines else {}
+        except (OSError, ValueError):
+            return False
+        if not isinstance(header, dict) or header.get("date") != self.today:
+            return False
+        for line in lines[1:]:
+            try:
+                self.done.update(json.loads(line))
+            except ValueError:
+                # the shard being appended when the run was killed: it is
+                # redone, and the file rewritten before the next append
+                break
+        else:
+            self.appending = True
+        return True
+
+    def is_done(self, user_id):
+        return user_id in self.done
+
+    def mark(self, user_ids):
+        if not self.appending:
+            # first shard of this run: start the file over, keeping what a
+            # resumed run already had
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as fh:
+                fh.write(json.dumps({"date": self.today}) + "\n")
+                if self.done:
+                    fh.write(json.dumps(sorted(self.done)) + "\n")
+            self.appending = True
+        self.done.update(user_ids)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(list(user_ids)) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def clear(self):
+        self.done = set()
+        self.appending = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,128 @@
+"""
+Recurring transactions: the schedule rule and bulk materialization.
+
+A :class:`~tracker.models.RecurringTransaction` repeats every ``interval``
+days, weeks, months or years from its ``start_date``. ``next_run_date`` is
+its first occurrence not yet created. :func:`materialize_due` creates every
+due occurrence of every due rule. It works in batches of rules, not users:
+each batch is one insert through
+:func:`tracker.bulk.bulk_insert_transactions` (rollups, ledger, badges and
+caches included) and one update of ``next_run_date``, in a single
+database transaction. A run after downtime catches up on every missed
+occurrence the same way.
+
+Each occurrence carries the dedupe key ``recurring:<rule id>:<date>``.
+Running again, or two runs at once, never creates an occurrence twice.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .batch import shard
+from .bulk import bulk_insert_transactions
+from .models import RecurringTransaction, Transaction
+
+OCCURRENCE_KEY = "recurring:{rule_id}:{day}"
+DEFAULT_BATCH_SIZE = 1000
+
+
+def next_occurrence(rule, day):
+    """The occurrence of ``rule`` following ``day``, one of its occurrences."""
+    if rule.frequency == RecurringTransaction.DAILY:
+        return day + timedelta(days=rule.interval)
+    if rule.frequency == RecurringTransaction.WEEKLY:
+        return day + timedelta(weeks=rule.interval)
+    months = rule.interval * (12 if rule.frequency == RecurringTransaction.YEARLY else 1)
+    year, month = divmod(day.year * 12 + day.month - 1 + months, 12)
+    month += 1
+    # anchored to start_date, so Jan 31 -> Feb 29 -> Mar 31 does not drift
+    return date(year, month, min(rule.start_date.day, calendar.monthrange(year, month)[1]))
+
+
+def due_occurrences(rule, until):
+    """
+    ``(days, next_run_date)``: the occurrences of ``rule`` from its
+    ``next_run_date`` through ``until``, and the one after them, or None
+    when the schedule ends first.
+    """
+    days = []
+    day = rule.next_run_date
+    while day is not None and day <= until:
+        if rule.end_date and day > rule.end_date:
+            break
+        days.append(day)
+        day = next_occurrence(rule, day)
+    if day is not None and rule.end_date and day > rule.end_date:
+        day = None
+    return days, day
+
+
+def occurrence(rule, day):
+    """The unsaved Transaction of ``rule`` on ``day``."""
+    return Transaction(
+        user_id=rule.user_id,
+        amount=rule.amount,
+        type=rule.type,
+        category=rule.category,
+        description=rule.description,
+        date=day,
+        dedupe_key=OCCURRENCE_KEY.format(rule_id=rule.pk, day=day.isoformat()),
+    )
+
+
+def due_rule_ids(today, user_ids=None):
+    """Primary keys of the rules with an occurrence on or before ``today``."""
+    rules = RecurringTransaction.objects.filter(next_run_date__lte=today)
+    if user_ids is not None:
+        rules = rules.filter(user_id__in=user_ids)
+    return sorted(rules.order_by().values_list("pk", flat=True))
+
+
+def advance_rules(rules, now):
+    """
+    Store the rules' new ``next_run_date`` with one ``executemany``;
+    ``bulk_update`` builds a CASE over every row of the batch instead.
+    """
+    ops = connection.ops
+    table = ops.quote_name(RecurringTransaction._meta.db_table)
+    updated_at = ops.adapt_datetimefield_value(now)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"UPDATE {table} SET next_run_date = %s, updated_at = %s WHERE id = %s",
+            [(ops.adapt_datefield_value(rule.next_run_date), updated_at, rule.pk) for rule in rules],
+        )
+
+
+def materialize_rules(rule_ids, today):
+    """
+    Create the due occurrences of the rules ``rule_ids`` and advance their
+    ``next_run_date``, in one database transaction. Returns the number of
+    transactions created.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # re-read under the write lock: a concurrent run may have advanced them
+        rules = list(
+            RecurringTransaction.objects.select_for_update()
+            .filter(pk__in=rule_ids, next_run_date__lte=today)
+            .order_by()
+        )
+        pending = []
+        for rule in rules:
+            days, rule.next_run_date = due_occurrences(rule, today)
+            pending.extend(occurrence(rule, day) for day in days)
+        created = bulk_insert_transactions(pending)
+        advance_rules(rules, now)
+    return len(created)
+
+
+def materialize_due(today=None, user_ids=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Materialize every rule due by ``today`` (of all users, or ``user_ids``),
+    ``batch_size`` rules per transaction. Yields ``(rules, created)`` per batch.
+    """
+    today = today or timezone.now().date()
+    for rule_ids in shard(due_rule_ids(today, user_ids), batch_size):
+        yield len(rule_ids), materialize_rules(rule_ids, today)
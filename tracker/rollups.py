@@ -0,0 +1,191 @@
+"""
+Incremental maintenance of :class:`~tracker.models.MonthlyRollup`.
+
+Every change to a transaction is expressed as a set of deltas keyed by
+``(user_id, year, month, category, type)``; :func:`apply_deltas` folds them
+into the rollup table with ``F()`` updates so concurrent writers don't lose
+increments.
+"""
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import MonthlyRollup, Transaction
+
+
+_DATE_FIELD = Transaction._meta.get_field("date")
+_AMOUNT_FIELD = Transaction._meta.get_field("amount")
+
+
+def rollup_key(user_id, tx_date, tx_type, category):
+    # ``date`` may still be the ``timezone.now`` default (a datetime) on
+    # unsaved instances; normalise it the same way the DateField does.
+    tx_date = _DATE_FIELD.to_python(tx_date)
+    return (user_id, tx_date.year, tx_date.month, category, tx_type)
+
+
+def snapshot(tx):
+    """The rollup-relevant fields of a transaction, as stored."""
+    return {
+        "user_id": tx.user_id,
+        "date": tx.date,
+        "type": tx.type,
+        "category": tx.category,
+        "amount": tx.amount,
+    }
+
+
+def add_delta(deltas, values, sign):
+    """Accumulate ``sign`` (+1/-1) times the transaction ``values`` into ``deltas``."""
+    key = rollup_key(values["user_id"], values["date"], values["type"], values["category"])
+    amount = _AMOUNT_FIELD.to_python(values["amount"]) or Decimal("0.00")
+    total, count = deltas.get(key, (Decimal("0.00"), 0))
+    deltas[key] = (total + sign * amount, count + sign)
+    return deltas
+
+
+def deltas_for_inserted(transactions):
+    """
+    Deltas for freshly bulk-inserted transactions. Their fields already hold
+    clean values, so this skips the per-row normalisation of :func:`add_delta`.
+    """
+    deltas = {}
+    for tx in transactions:
+        key = (tx.user_id, tx.date.year, tx.date.month, tx.category, tx.type)
+        total, count = deltas.get(key, (Decimal("0.00"), 0))
+        deltas[key] = (total + tx.amount, count + 1)
+    return deltas
+
+
+def apply_deltas(deltas):
+    """Fold ``{key: (amount, count)}`` deltas into the rollup table."""
+    with transaction.atomic():
+        for (user_id, year, month, category, tx_type), (amount, count) in deltas.items():
+            if not amount and not count:
+                continue
+            lookup = {
+                "user_id": user_id,
+                "year": year,
+                "month": month,
+                "category": category,
+                "type": tx_type,
+            }
+            rows = MonthlyRollup.objects.filter(**lookup)
+            updated = rows.update(total=F("total") + amount, count=F("count") + count)
+            if not updated and count > 0:
+                try:
+                    with transaction.atomic():
+                        MonthlyRollup.objects.create(total=amount, count=count, **lookup)
+                except IntegrityError:
+                    # Another writer created the row in the meantime.
+                    rows.update(total=F("total") + amount, count=F("count") + count)
+            elif count < 0:
+                rows.filter(count__lte=0).delete()
+
+
+def apply_deltas_bulk(deltas):
+    """
+    :func:`apply_deltas` for large sets of positive deltas (bulk inserts,
+    so no row ever drops to zero): one query
+    finds the existing rows, one ``executemany`` increments them in place
+    and the missing rows are bulk-created. Falls back to a rebuild of the
+    affected users if a concurrent writer removed or added a row meanwhile.
+    """
+    if not deltas:
+        return
+    user_ids = {key[0] for key in deltas}
+    years = [key[1] for key in deltas]
+    existing = set(
+        MonthlyRollup.objects.filter(
+            user_id__in=user_ids, year__gte=min(years), year__lte=max(years)
+        )
+        .order_by()
+        .values_list("user_id", "year", "month", "category", "type")
+    )
+
+    updates = [
+        (amount, count, *key) for key, (amount, count) in deltas.items() if key in existing
+    ]
+    created = [
+        MonthlyRollup(
+            user_id=user_id, year=year, month=month, category=category, type=tx_type,
+            total=amount, count=count,
+        )
+        for (user_id, year, month, category, tx_type), (amount, count) in deltas.items()
+        if (user_id, year, month, category, tx_type) not in existing
+    ]
+
+    table = MonthlyRollup._meta.db_table
+    try:
+        with transaction.atomic():
+            if updates:
+                with connection.cursor() as cursor:
+                    cursor.executemany(
+                        f"UPDATE {table} SET total = total + %s, count = count + %s "
+                        "WHERE user_id = %s AND year = %s AND month = %s AND category = %s AND type = %s",
+                        updates,
+                    )
+                    if cursor.rowcount != len(updates):
+                        raise IntegrityError("rollup rows changed concurrently")
+            MonthlyRollup.objects.bulk_create(created)
+    except IntegrityError:
+        rebuild(sorted(user_ids))
+
+
+def record_change(previous, current):
+    """Apply the rollup effect of a transaction moving from ``previous`` to ``current``."""
+    deltas = {}
+    if previous is not None:
+        add_delta(deltas, previous, -1)
+    if current is not None:
+        add_delta(deltas, current, 1)
+    apply_deltas(deltas)
+
+
+def grouped(user_ids=None):
+    """Rollup rows (value dicts) computed from the transactions of ``user_ids`` or all users."""
+    transactions = Transaction.objects.all()
+    if user_ids is not None:
+        transactions = transactions.filter(user_id__in=user_ids)
+    return (
+        transactions.annotate(year=ExtractYear("date"), month=ExtractMonth("date"))
+        .values("user_id", "year", "month", "category", "type")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+
+def replace(user_ids, rows, batch_size=1000):
+    """
+    Swap the rollups of ``user_ids`` (all users when None) for ``rows``
+    (value dicts). Returns the number of rows written.
+    """
+    existing = MonthlyRollup.objects.all()
+    if user_ids is not None:
+        existing = existing.filter(user_id__in=user_ids)
+
+    written = 0
+    with transaction.atomic():
+        existing.delete()
+        batch = []
+        for row in rows:
+            batch.append(MonthlyRollup(**row))
+            if len(batch) >= batch_size:
+                MonthlyRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            MonthlyRollup.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+def rebuild(user_ids=None, batch_size=1000):
+    """
+    Recompute rollups from scratch (for all users, or only ``user_ids``) with
+    one grouped query and bulk inserts. Returns the number of rows written.
+    """
+    # lazy: the grouped query runs inside replace(), after the delete
+    return replace(user_ids, grouped(user_ids).iterator(chunk_size=batch_size), batch_size)
@@ -0,0 +1,210 @@
+"""
+Full-text search over ``Transaction.description``.
+
+On SQLite the descriptions are indexed in the FTS5 table
+``tracker_transaction_fts``. It is an external-content table over
+``tracker_transaction``: it stores only the index, keyed by the transaction
+id (the rowid), and triggers on ``tracker_transaction`` keep it in sync. The
+triggers cover every write, including raw bulk inserts and
+``QuerySet.update()``/``delete()``, which bypass the model signals.
+
+The owner's id is indexed as a second column, ``user_id``. A search matches
+``user_id:"<id>"`` together with the terms, so FTS5 intersects the term
+lists with that user's own rows instead of every user's matches. Results are
+ranked by ``bm25()`` on the description alone. The type, category and date
+filters are applied on the joined transaction rows.
+
+Other databases, or a SQLite build without FTS5, fall back to an
+``icontains`` scan ordered by date (:func:`search_transactions`).
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import Transaction
+
+FTS_TABLE = "tracker_transaction_fts"
+TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON tracker_transaction BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, description, user_id)
+            VALUES (new.id, new.description, new.user_id);
+        END""",
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON tracker_transaction BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, user_id)
+            VALUES ('delete', old.id, old.description, old.user_id);
+        END""",
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF description, user_id ON tracker_transaction BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description, user_id)
+            VALUES ('delete', old.id, old.description, old.user_id);
+            INSERT INTO {FTS_TABLE}(rowid, description, user_id)
+            VALUES (new.id, new.description, new.user_id);
+        END""",
+}
+# prefix indexes serve the "coff"* queries typed into the search box
+CREATE_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        description, user_id,
+        content='tracker_transaction', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )"""
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+MAX_TERMS = 8
+TERM = re.compile(r"\w+")
+
+# databases whose FTS table is known to exist (it is never dropped at runtime)
+_available = set()
+
+
+def _table_exists(cursor):
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE]
+    )
+    return cursor.fetchone() is not None
+
+
+def _missing_triggers(cursor):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tracker_transaction'"
+    )
+    present = {row[0] for row in cursor.fetchall()}
+    return [name for name in TRIGGERS if name not in present]
+
+
+def install(connection):
+    """Create the FTS table and its triggers, and index the existing rows."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(CREATE_TABLE)
+        for sql in TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall(connection):
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name in TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    _available.discard(connection.settings_dict["NAME"])
+
+
+def repair(connection):
+    """
+    Recreate missing triggers and reindex; returns whether anything was done.
+
+    Django alters a SQLite table by copying it into a new table and dropping
+    the old one, and the triggers are dropped with it. This runs after every
+    ``migrate`` (tracker.signals), so a later migration of Transaction does not
+    leave the index silently out of date.
+    """
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        if not _table_exists(cursor) or not _missing_triggers(cursor):
+            return False
+    install(connection)
+    return True
+
+
+def fts_available(using=DEFAULT_DB_ALIAS):
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    name = connection.settings_dict["NAME"]
+    if name not in _available:
+        with connection.cursor() as cursor:
+            if not _table_exists(cursor):
+                return False
+        _available.add(name)
+    return True
+
+
+def search_terms(query):
+    """The words of ``query``, lower-cased, without duplicates."""
+    terms = []
+    for term in TERM.findall(query.lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_TERMS]
+
+
+def match_expression(user_id, terms):
+    """
+    FTS5 query for the user's rows containing every term, as a prefix.
+    Terms are quoted, so FTS5 operators typed by the user stay plain words.
+    """
+    phrases = " ".join(f'description:"{term}"*' for term in terms)
+    return f'user_id:"{user_id}" {phrases}'
+
+
+def _fts_search(user, terms, filters, limit, offset):
+    conditions, params = ["tracker_transaction.user_id = %s"], [user.pk]
+    if filters.get("type"):
+        conditions.append("tracker_transaction.type = %s")
+        params.append(filters["type"])
+    if filters.get("category"):
+        conditions.append("tracker_transaction.category = %s")
+        params.append(filters["category"])
+    if filters.get("start_date"):
+        conditions.append("tracker_transaction.date >= %s")
+        params.append(filters["start_date"].isoformat())
+    if filters.get("end_date"):
+        conditions.append("tracker_transaction.date <= %s")
+        params.append(filters["end_date"].isoformat())
+    # bm25 weights: the user_id column only scopes the match, so it scores 0
+    sql = f"""
+        SELECT tracker_transaction.*, bm25({FTS_TABLE}, 1.0, 0.0) AS rank
+        FROM {FTS_TABLE}
+        JOIN tracker_transaction ON tracker_transaction.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s AND {" AND ".join(conditions)}
+        ORDER BY rank, tracker_transaction.date DESC, tracker_transaction.id DESC
+        LIMIT %s OFFSET %s
+    """
+    params = [match_expression(user.pk, terms), *params, limit + 1, offset]
+    return list(Transaction.objects.raw(sql, params))
+
+
+def _scan_search(user, terms, filters, limit, offset):
+    rows = Transaction.objects.filter(user=user)
+    for term in terms:
+        rows = rows.filter(description__icontains=term)
+    if filters.get("type"):
+        rows = rows.filter(type=filters["type"])
+    if filters.get("category"):
+        rows = rows.filter(category=filters["category"])
+    if filters.get("start_date"):
+        rows = rows.filter(date__gte=filters["start_date"])
+    if filters.get("end_date"):
+        rows = rows.filter(date__lte=filters["end_date"])
+    rows = list(rows.order_by("-date", "-created_at", "-id")[offset:offset + limit + 1])
+    for tx in rows:
+        tx.rank = None
+    return rows
+
+
+def search_transactions(user, query, filters=None, limit=DEFAULT_LIMIT, offset=0):
+    """
+    ``(transactions, next_offset)``: the user's transactions whose description
+    contains every word of ``query`` (as a word prefix), best bm25 match first.
+    ``filters`` holds the optional TransactionFilterForm values. Each
+    transaction carries its ``rank``, or None from the fallback scan.
+    ``next_offset`` is None on the last page.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return [], None
+    limit = max(1, min(limit, MAX_LIMIT))
+    offset = max(0, offset)
+    search = _fts_search if fts_available() else _scan_search
+    rows = search(user, terms, filters or {}, limit, offset)
+    next_offset = offset + limit if len(rows) > limit else None
+    return rows[:limit], next_offset
@@ -0,0 +1,146 @@
+"""
+Signal handlers keeping derived tables, badges, health score snapshots and
+cached analytics in sync with ``Transaction``, ``MonthlyBudget`` and
+``SavingsGoal``, and the transaction search index in sync with migrations.
+
+``QuerySet.update()``/``bulk_create()`` bypass the model signals. Bulk inserts
+should go through :func:`tracker.bulk.bulk_insert_transactions`, which sends
+``transactions_bulk_created``; run ``manage.py rebuild_rollups``,
+``manage.py rebuild_ledger`` and ``manage.py snapshot_health_scores`` after
+any other raw bulk change.
+"""
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from . import health, ledger, rollups, search
+from .analytics import load_many_user_analytics
+from .badges import evaluate_badges
+from .cache import bump_user_version
+from .models import MonthlyBudget, SavingsGoal, Transaction
+
+# Sent inside the inserting transaction with ``transactions``: the list of
+# Transaction objects that were just bulk-created.
+transactions_bulk_created = Signal()
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, raw=False, **kwargs):
+    """Stash the stored values so post_save can undo them on edits."""
+    instance._stored_values = None
+    if raw or instance.pk is None:
+        return
+    instance._stored_values = (
+        Transaction.objects.filter(pk=instance.pk)
+        .values("user_id", "date", "type", "category", "amount")
+        .first()
+    )
+
+
+@receiver(post_save, sender=Transaction)
+def update_derived_tables_on_save(sender, instance, raw=False, **kwargs):
+    """Move the rollups and the balance ledger from the stored to the new values."""
+    if raw:
+        return
+    previous = getattr(instance, "_stored_values", None)
+    current = rollups.snapshot(instance)
+    rollups.record_change(previous, current)
+    ledger.record_change(previous, current)
+
+
+@receiver(post_delete, sender=Transaction)
+def update_derived_tables_on_delete(sender, instance, **kwargs):
+    stored = rollups.snapshot(instance)
+    rollups.record_change(stored, None)
+    ledger.record_change(stored, None)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=MonthlyBudget)
+@receiver(post_delete, sender=MonthlyBudget)
+def reevaluate_scores(sender, instance, raw=False, **kwargs):
+    """
+    Award newly earned badges and refresh the health score snapshots after
+    the change is committed. Connected before invalidate_user_analytics so
+    both land before the cache bump and no cached panel misses them.
+    """
+    if raw:
+        return
+    user_id = instance.user_id
+    since = rescore_since(sender, instance, kwargs.get("created"))
+    transaction.on_commit(lambda: refresh_scores([user_id], since))
+
+
+def rescore_since(sender, instance, created=None):
+    """
+    The first (year, month) whose health score the change can move, or None
+    for every month. An edited transaction moves the months from the
+    earlier of its old and new dates. An edited budget may have been moved
+    to another month by BudgetForm, and its old month is not known.
+    """
+    if sender is MonthlyBudget:
+        if created is False:
+            return None
+        return instance.year, instance.month
+    dates = [Transaction._meta.get_field("date").to_python(instance.date)]
+    previous = getattr(instance, "_stored_values", None)
+    if previous:
+        dates.append(previous["date"])
+    first = min(dates)
+    return first.year, first.month
+
+
+def refresh_scores(user_ids, since=None):
+    """
+    Badges and health snapshots of ``user_ids`` from one analytics load,
+    written in one transaction; only the snapshots from ``since`` (year,
+    month) on are rewritten when given.
+    """
+    analytics_by_user = load_many_user_analytics(user_ids, history=True)
+    with transaction.atomic():
+        evaluate_badges(user_ids, analytics_by_user=analytics_by_user)
+        health.refresh_snapshots(user_ids, analytics_by_user=analytics_by_user, since=since)
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+@receiver(post_save, sender=MonthlyBudget)
+@receiver(post_delete, sender=MonthlyBudget)
+@receiver(post_save, sender=SavingsGoal)
+@receiver(post_delete, sender=SavingsGoal)
+def invalidate_user_analytics(sender, instance, raw=False, **kwargs):
+    """Bump the owner's cache version once the change is committed."""
+    if raw:
+        return
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_user_version(user_id))
+
+
+@receiver(transactions_bulk_created, sender=Transaction)
+def update_derived_tables_on_bulk_create(sender, transactions, **kwargs):
+    rollups.apply_deltas_bulk(rollups.deltas_for_inserted(transactions))
+    ledger.record_inserted(transactions)
+
+
+@receiver(transactions_bulk_created, sender=Transaction)
+def refresh_users_on_bulk_create(sender, transactions, **kwargs):
+    """One cache bump and one badge and snapshot refresh per affected user."""
+    user_ids = sorted({tx.user_id for tx in transactions})
+    if not user_ids:
+        return
+    first = min(tx.date for tx in transactions)
+
+    def refresh():
+        refresh_scores(user_ids, (first.year, first.month))
+        for user_id in user_ids:
+            bump_user_version(user_id)
+
+    transaction.on_commit(refresh)
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, app_config, using, **kwargs):
+    """Restore the search triggers if a migration rebuilt tracker_transaction."""
+    if app_config.label == "tracker":
+        search.repair(connections[using])
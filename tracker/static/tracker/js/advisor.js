@@ -0,0 +1,47 @@
+// Smart Spending Advisor: ask the JSON endpoint instead of re-posting the dashboard
+document.addEventListener("DOMContentLoaded", function () {
+    const form = document.getElementById("smartSpendingForm");
+    const result = document.getElementById("advisorResult");
+    const error = document.getElementById("advisorError");
+    if (!form || !result || !window.fetch) {
+        return;
+    }
+
+    form.addEventListener("submit", function (event) {
+        event.preventDefault();
+        const data = new FormData(form);
+        error.textContent = "";
+
+        fetch(form.dataset.advisorUrl, {
+            method: "POST",
+            body: data,
+            headers: {
+                "X-CSRFToken": data.get("csrfmiddlewaretoken"),
+                "X-Requested-With": "XMLHttpRequest",
+            },
+            credentials: "same-origin",
+        })
+            .then(function (response) {
+                return response.json().then(function (payload) {
+                    return { ok: response.ok, payload: payload };
+                });
+            })
+            .then(function (res) {
+                result.innerHTML = "";
+                if (!res.ok) {
+                    const errors = res.payload.errors || {};
+                    const messages = errors.planned_amount || ["Please enter a valid planned amount."];
+                    error.textContent = messages[0];
+                    return;
+                }
+                const alert = document.createElement("div");
+                alert.className = "alert alert-" + res.payload.status + " mt-3 mb-0";
+                alert.textContent = res.payload.message;
+                result.appendChild(alert);
+            })
+            .catch(function (e) {
+                console.error("Error fetching spending advice", e);
+                form.submit();
+            });
+    });
+});
@@ -1,17 +1,97 @@
-document.addEventListener("DOMContentLoaded", function () {
-    const expenseCanvas = document.getElementById("expenseCategoryChart");
-    if (expenseCanvas && window.Chart) {
-        try {
-            const labels = JSON.parse(expenseCanvas.dataset.labels || "[]");
-            const values = JSON.parse(expenseCanvas.dataset.values || "[]");
+// Chart initialisers take the element to search, so panels.js can run them on
+// fragments inserted after page load; a canvas is only initialised once.
+function findCanvas(root, id) {
+    const canvas = root.querySelector("#" + id);
+    if (!canvas || canvas.dataset.chartReady || !window.Chart) {
+        return null;
+    }
+    canvas.dataset.chartReady = "1";
+    return canvas;
+}
+
+// {labels, values} from the chart_data endpoint in data-chart-url, or from
+// the data-labels/data-values attributes of small server-rendered charts
+function chartData(element) {
+    if (element.dataset.chartUrl) {
+        return fetch(element.dataset.chartUrl, { credentials: "same-origin" }).then(function (response) {
+            if (!response.ok) {
+                throw new Error("HTTP " + response.status);
+            }
+            return response.json();
+        });
+    }
+    return Promise.resolve({
+        labels: JSON.parse(element.dataset.labels || "[]"),
+        values: JSON.parse(element.dataset.values || "[]"),
+    });
+}
+
+// Spending over time: the granularity buttons swap the series in place
+function initSpendTrend(root) {
+    const canvas = findCanvas(root, "spendTrendChart");
+    const buttons = root.querySelectorAll("#spendTrendGranularity [data-chart-url]");
+    if (!canvas || !buttons.length) {
+        return;
+    }
+    const chart = new Chart(canvas.getContext("2d"), {
+        type: "line",
+        data: {
+            labels: [],
+            datasets: [
+                {
+                    label: "Spent",
+                    data: [],
+                    borderColor: "#ef4444",
+                    backgroundColor: "rgba(239,68,68,0.12)",
+                    fill: true,
+                    tension: 0.2,
+                    pointRadius: 0,
+                },
+            ],
+        },
+        options: {
+            animation: false,
+            plugins: { legend: { display: false } },
+            scales: { y: { beginAtZero: true }, x: { ticks: { maxTicksLimit: 12 } } },
+        },
+    });
+
+    function show(button) {
+        buttons.forEach(function (other) {
+            other.classList.toggle("active", other === button);
+        });
+        chartData(button)
+            .then(function (data) {
+                chart.data.labels = data.labels;
+                chart.data.datasets[0].data = data.values;
+                chart.update();
+            })
+            .catch(function (e) {
+                console.error("Error loading spending chart", e);
+            });
+    }
+
+    buttons.forEach(function (button) {
+        button.addEventListener("click", function () {
+            show(button);
+        });
+    });
+    show(root.querySelector("#spendTrendGranularity .active") || buttons[0]);
+}
+
+function initCharts(root) {
+    initSpendTrend(root);
 
+    const expenseCanvas = findCanvas(root, "expenseCategoryChart");
+    if (expenseCanvas) {
+        chartData(expenseCanvas).then(function (data) {
             new Chart(expenseCanvas.getContext("2d"), {
                 type: "pie",
                 data: {
-                    labels: labels,
+                    labels: data.labels,
                     datasets: [
                         {
-                            data: values,
+                            data: data.values,
                             backgroundColor: [
                                 "#3b82f6",
                                 "#10b981",
@@ -32,14 +112,14 @@ document.addEventListener("DOMContentLoaded", function () {
                     }
                 }
             });
-        } catch (e) {
+        }).catch(function (e) {
             console.error("Error initializing expense category chart", e);
-        }
+        });
     }
 
     // Health score donut
-    const healthCanvas = document.getElementById("healthScoreChart");
-    if (healthCanvas && window.Chart) {
+    const healthCanvas = findCanvas(root, "healthScoreChart");
+    if (healthCanvas) {
         try {
             const score = parseFloat(healthCanvas.dataset.score || "0");
             const colorKey = healthCanvas.dataset.color || "danger";
@@ -73,9 +153,41 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    // Health score over the last months (monthly snapshots)
+    const trendCanvas = findCanvas(root, "healthTrendChart");
+    if (trendCanvas) {
+        try {
+            const labels = JSON.parse(trendCanvas.dataset.labels || "[]");
+            const values = JSON.parse(trendCanvas.dataset.values || "[]");
+            new Chart(trendCanvas.getContext("2d"), {
+                type: "line",
+                data: {
+                    labels: labels,
+                    datasets: [
+                        {
+                            label: "Health Score",
+                            data: values,
+                            borderColor: "#0ea5e9",
+                            backgroundColor: "rgba(14,165,233,0.15)",
+                            fill: true,
+                            tension: 0.3,
+                            pointRadius: 2,
+                        },
+                    ],
+                },
+                options: {
+                    plugins: { legend: { display: false } },
+                    scales: { y: { min: 0, max: 100 } },
+                },
+            });
+        } catch (e) {
+            console.error("Error initializing health trend chart", e);
+        }
+    }
+
     // Projected balance small chart
-    const projectedCanvas = document.getElementById("projectedBalanceChart");
-    if (projectedCanvas && window.Chart) {
+    const projectedCanvas = findCanvas(root, "projectedBalanceChart");
+    if (projectedCanvas) {
         try {
             const predicted = parseFloat(projectedCanvas.dataset.predicted || "0");
             const ctx = projectedCanvas.getContext("2d");
@@ -111,37 +223,17 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
-    // Dark mode toggle persistence
-    const darkToggle = document.getElementById('darkModeToggle');
-    if (darkToggle) {
-        const applyMode = (mode) => {
-            if (mode === 'dark') document.documentElement.classList.add('dark');
-            else document.documentElement.classList.remove('dark');
-        };
-        const stored = localStorage.getItem('sb_dark_mode');
-        if (stored) applyMode(stored);
-        darkToggle.addEventListener('click', function () {
-            const isDark = document.documentElement.classList.toggle('dark');
-            localStorage.setItem('sb_dark_mode', isDark ? 'dark' : 'light');
-        });
-    }
-
-    // PDF download removed
-
-    const incomeExpenseCanvas = document.getElementById("incomeExpenseChart");
-    if (incomeExpenseCanvas && window.Chart) {
-        try {
-            const labels = JSON.parse(incomeExpenseCanvas.dataset.labels || "[]");
-            const values = JSON.parse(incomeExpenseCanvas.dataset.values || "[]");
-
+    const incomeExpenseCanvas = findCanvas(root, "incomeExpenseChart");
+    if (incomeExpenseCanvas) {
+        chartData(incomeExpenseCanvas).then(function (data) {
             new Chart(incomeExpenseCanvas.getContext("2d"), {
                 type: "bar",
                 data: {
-                    labels: labels,
+                    labels: data.labels,
                     datasets: [
                         {
                             label: "Amount",
-                            data: values,
+                            data: data.values,
                             backgroundColor: [
                                 "#16a34a",
                                 "#dc2626"
@@ -163,9 +255,14 @@ document.addEventListener("DOMContentLoaded", function () {
                     }
                 }
             });
-        } catch (e) {
+        }).catch(function (e) {
             console.error("Error initializing income vs expense chart", e);
-        }
+        });
     }
-});
+}
 
+window.savifyCharts = { init: initCharts };
+
+document.addEventListener("DOMContentLoaded", function () {
+    initCharts(document);
+});
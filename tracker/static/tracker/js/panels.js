@@ -0,0 +1,57 @@
+// Dashboard panels: each one is fetched as an HTML fragment after the page shell
+// renders, unless the page (dashboard_full) arrived with them already rendered
+document.addEventListener("DOMContentLoaded", function () {
+    function activate(panel) {
+        // set widths via JS to avoid CSS lint errors
+        panel.querySelectorAll(".goal-progress").forEach(function (bar) {
+            bar.style.width = Math.min(parseInt(bar.dataset.progress, 10) || 0, 100) + "%";
+        });
+        if (window.savifyCharts) {
+            window.savifyCharts.init(panel);
+        }
+    }
+
+    document.querySelectorAll(".dashboard-panel:not([data-panel-url])").forEach(activate);
+
+    const panels = document.querySelectorAll(".dashboard-panel[data-panel-url]");
+    if (!panels.length || !window.fetch) {
+        return;
+    }
+
+    function failed(panel) {
+        const alert = document.createElement("div");
+        alert.className = "alert alert-light border small mb-4";
+        alert.textContent = "This panel could not be loaded. ";
+        const retry = document.createElement("a");
+        retry.href = panel.dataset.panelUrl;
+        retry.textContent = "Open it directly";
+        alert.appendChild(retry);
+        panel.replaceChildren(alert);
+    }
+
+    function render(panel, html) {
+        panel.innerHTML = html;
+        activate(panel);
+    }
+
+    // all requests start at once; each panel renders as soon as its own response arrives
+    panels.forEach(function (panel) {
+        fetch(panel.dataset.panelUrl, {
+            credentials: "same-origin",
+            headers: { "X-Requested-With": "XMLHttpRequest" },
+        })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error("HTTP " + response.status);
+                }
+                return response.text();
+            })
+            .then(function (html) {
+                render(panel, html);
+            })
+            .catch(function (e) {
+                console.error("Error loading dashboard panel " + panel.id, e);
+                failed(panel);
+            });
+    });
+});
@@ -0,0 +1,16 @@
+// Dark mode toggle persistence; loaded on every page
+document.addEventListener("DOMContentLoaded", function () {
+    const darkToggle = document.getElementById('darkModeToggle');
+    if (darkToggle) {
+        const applyMode = (mode) => {
+            if (mode === 'dark') document.documentElement.classList.add('dark');
+            else document.documentElement.classList.remove('dark');
+        };
+        const stored = localStorage.getItem('sb_dark_mode');
+        if (stored) applyMode(stored);
+        darkToggle.addEventListener('click', function () {
+            const isDark = document.documentElement.classList.toggle('dark');
+            localStorage.setItem('sb_dark_mode', isDark ? 'dark' : 'light');
+        });
+    }
+});
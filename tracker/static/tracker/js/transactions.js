@@ -0,0 +1,117 @@
+// Transaction history: infinite scroll over the keyset-paginated JSON API
+document.addEventListener("DOMContentLoaded", function () {
+    const pager = document.getElementById("transactionPager");
+    const rows = document.getElementById("transactionRows");
+    if (!pager || !rows || !window.fetch) {
+        return;
+    }
+
+    const more = document.getElementById("transactionMore");
+    let cursor = pager.dataset.nextCursor;
+    let loading = false;
+    let observer = null;
+
+    function cell(text, className) {
+        const td = document.createElement("td");
+        if (className) {
+            td.className = className;
+        }
+        td.textContent = text;
+        return td;
+    }
+
+    function iconLink(href, className, icon) {
+        const a = document.createElement("a");
+        a.href = href;
+        a.className = "btn btn-sm btn-link " + className;
+        const i = document.createElement("i");
+        i.className = "bi " + icon;
+        a.appendChild(i);
+        return a;
+    }
+
+    function renderRow(tx) {
+        const tr = document.createElement("tr");
+        const isIncome = tx.type === "INCOME";
+        const date = new Date(tx.date + "T00:00:00");
+
+        tr.appendChild(cell(date.toLocaleDateString("en-US", { month: "short", day: "2-digit", year: "numeric" })));
+
+        const typeCell = document.createElement("td");
+        const badge = document.createElement("span");
+        badge.className = "badge " + (isIncome ? "bg-success" : "bg-danger");
+        badge.textContent = tx.type_display;
+        typeCell.appendChild(badge);
+        tr.appendChild(typeCell);
+
+        tr.appendChild(cell(tx.category_display));
+        tr.appendChild(cell(tx.description || "-"));
+
+        const amountCell = document.createElement("td");
+        amountCell.className = "text-end";
+        const amount = document.createElement("span");
+        amount.className = isIncome ? "text-success" : "text-danger";
+        amount.textContent = (isIncome ? "+" : "-") + "₹" + tx.amount;
+        amountCell.appendChild(amount);
+        tr.appendChild(amountCell);
+
+        const actions = document.createElement("td");
+        actions.className = "text-end";
+        actions.appendChild(iconLink(tx.edit_url, "text-secondary", "bi-pencil-square"));
+        actions.appendChild(iconLink(tx.delete_url, "text-danger", "bi-trash"));
+        tr.appendChild(actions);
+        return tr;
+    }
+
+    function loadNext() {
+        if (loading || !cursor) {
+            return;
+        }
+        loading = true;
+        const query = pager.dataset.filterQuery;
+        const url = pager.dataset.apiUrl + "?" + (query ? query + "&" : "") + "cursor=" + encodeURIComponent(cursor);
+
+        fetch(url, { credentials: "same-origin", headers: { "X-Requested-With": "XMLHttpRequest" } })
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error("HTTP " + response.status);
+                }
+                return response.json();
+            })
+            .then(function (payload) {
+                payload.results.forEach(function (tx) {
+                    rows.appendChild(renderRow(tx));
+                });
+                cursor = payload.next_cursor;
+                if (!cursor) {
+                    pager.remove();
+                } else if (observer) {
+                    // re-observing re-checks the pager if it is still on screen
+                    observer.unobserve(pager);
+                    observer.observe(pager);
+                }
+            })
+            .catch(function (e) {
+                console.error("Error loading transactions", e);
+            })
+            .finally(function () {
+                loading = false;
+            });
+    }
+
+    if (more) {
+        more.addEventListener("click", function (event) {
+            event.preventDefault();
+            loadNext();
+        });
+    }
+
+    if ("IntersectionObserver" in window) {
+        observer = new IntersectionObserver(function (entries) {
+            if (entries.some(function (entry) { return entry.isIntersecting; })) {
+                loadNext();
+            }
+        }, { rootMargin: "300px" });
+        observer.observe(pager);
+    }
+});
@@ -0,0 +1,62 @@
+"""
+Static files storage with content-hashed names and precompressed variants.
+
+ManifestStaticFilesStorage names every collected file after a hash of its
+content (``style.55e7cbb9ba48.css``) and rewrites the references between
+files (CSS ``url()``, source maps). The web server can therefore send them
+with far-future headers (``Cache-Control: public, max-age=31536000,
+immutable``), and a deploy only changes the URLs of the files that changed.
+
+After hashing, collectstatic also writes a ``.gz`` variant of every hashed
+text asset, plus a ``.br`` variant when the optional ``brotli`` package is
+installed. A server configured with ``gzip_static``/``brotli_static`` (nginx)
+then serves those files as they are, instead of compressing on every request.
+"""
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # optional: gzip variants only
+    brotli = None
+
+COMPRESSIBLE = (".css", ".js", ".map", ".svg", ".json", ".txt", ".html")
+# smaller files, or variants saving less than this share, are not worth a second file
+MIN_SIZE = 512
+MIN_SAVING = 0.05
+
+
+def _variants(content):
+    yield ".gz", gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress(content)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE):
+                self._compress(name)
+
+    def _compress(self, name):
+        path = self.path(name)
+        # hashed names are content addressed: existing variants are current
+        pending = [
+            suffix for suffix in (".gz", ".br")
+            if not os.path.exists(path + suffix) and (suffix == ".gz" or brotli is not None)
+        ]
+        if not pending:
+            return
+        with self.open(name) as fh:
+            content = fh.read()
+        if len(content) < MIN_SIZE:
+            return
+        for suffix, compressed in _variants(content):
+            if suffix in pending and len(compressed) <= len(content) * (1 - MIN_SAVING):
+                with open(path + suffix, "wb") as fh:
+                    fh.write(compressed)
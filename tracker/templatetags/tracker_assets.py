@@ -0,0 +1,11 @@
+from django import template
+
+from tracker.assets import asset_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_asset(name):
+    """``{% vendor_asset "chart.js" %}``: URL of a pinned third-party asset."""
+    return asset_url(name)
@@ -6,7 +6,17 @@ app_name = "tracker"
 
 urlpatterns = [
     path("dashboard/", views.dashboard, name="dashboard"),
+    path("dashboard/full/", views.dashboard_full, name="dashboard_full"),
+    path("dashboard/panels/<str:name>/", views.dashboard_panel, name="dashboard_panel"),
+    path("advisor/", views.spending_advisor, name="spending_advisor"),
+    path("goals/", views.goal_list, name="goal_list"),
+    path("api/goals/", views.goal_list_api, name="goal_list_api"),
     path("goals/add/", views.SavingsGoalCreateView.as_view(), name="goal_add"),
+    path("transactions/", views.transaction_list, name="transaction_list"),
+    path("api/transactions/", views.transaction_list_api, name="transaction_list_api"),
+    path("transactions/search/", views.transaction_search, name="transaction_search"),
+    path("api/transactions/search/", views.transaction_search_api, name="transaction_search_api"),
+    path("transactions/import/", views.import_statement, name="import_statement"),
     path("transactions/add/", views.TransactionCreateView.as_view(), name="transaction_add"),
     path(
         "transactions/<int:pk>/edit/",
@@ -18,7 +28,12 @@ urlpatterns = [
         views.TransactionDeleteView.as_view(),
         name="transaction_delete",
     ),
+    path("recurring/", views.recurring_list, name="recurring_list"),
+    path("recurring/<int:pk>/delete/", views.recurring_delete, name="recurring_delete"),
     path("budget/", views.manage_budget, name="manage_budget"),
     path("reports/", views.reports, name="reports"),
+    path("api/charts/<str:name>/", views.chart_data, name="chart_data"),
+    path("reports/export/<str:fmt>/", views.export_transactions, name="export_transactions"),
+    path("profiling/", views.profiling_report, name="profiling"),
 ]
 
@@ -1,17 +1,25 @@
+import asyncio
+import io
 import json
-from decimal import Decimal, ROUND_HALF_UP
-import math
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Sum
+from django.db import close_old_connections, connection
 from django.shortcuts import redirect, render
-from django.http import HttpResponse
-from django.urls import reverse_lazy
+from django.template.loader import render_to_string
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
-from django.utils.safestring import mark_safe
+from django.utils.http import urlencode
+from django.views.decorators.http import require_POST
 from django.views.generic import CreateView, DeleteView, UpdateView
 
 
@@ -22,180 +30,62 @@ from .forms import (
     SmartSpendingForm,
     ReportFilterForm,
     SavingsGoalForm,
+    StatementImportForm,
+    TransactionFilterForm,
+    TransactionSearchForm,
+    RecurringTransactionForm,
 )
 from .models import Transaction, MonthlyBudget
-from .models import SavingsGoal, AchievementBadge
+from .models import SavingsGoal, AchievementBadge, RecurringTransaction
+from .cache import cache_stats, cached_for_user
+from .charts import CHARTS, DEFAULT_POINTS, chart_payload
+from .conditional import conditional_for_user
+from .exports import EXPORT_FORMATS, stream_export
+from .goals import goal_summary, plan_goals
+from .health import recent_snapshots, snapshot_health
+from .importer import StatementError, import_transactions
+from .money import from_minor, to_minor
+from .pagination import DEFAULT_PAGE_SIZE, InvalidCursor, keyset_page
+from .profiling import profile_queries, stats as profile_stats
+from .recurring import materialize_due
+from .search import search_transactions
+from .analytics import (
+    CATEGORY_LABELS,
+    current_balance,
+    load_user_analytics,
+    net_saved_since,
+    period_totals,
+    report_period,
+)
+from .anomalies import detect_anomalies
 
 
 # ===== NEW HELPER FOR BUDGET EVALUATION =====
-def evaluate_budget(user):
+def evaluate_budget(user, analytics=None):
     """Return evaluation dict for the user's current monthly budget."""
-    from django.utils import timezone
-    from django.db.models import Sum
-
-    today = timezone.now().date()
-    month = today.month
-    year = today.year
-
-    mb = MonthlyBudget.objects.filter(user=user, month=month, year=year).first()
-    budget_amount = mb.budget_amount if mb else Decimal("0.00")
-
-    expenses = (
-        Transaction.objects.filter(
-            user=user,
-            type=Transaction.EXPENSE,
-            date__year=year,
-            date__month=month,
-        )
-        .aggregate(total=Sum("amount"))["total"]
-        or Decimal("0.00")
-    )
-
-    remaining = budget_amount - expenses
-    if expenses <= budget_amount:
-        status = "within_budget"
-        message = "Great job! You are managing your spending well this month."
-    else:
-        status = "exceeded"
-        message = "You have exceeded your budget."
-
-    top_categories = []
-    if status == "exceeded":
-        top_qs = (
-            Transaction.objects.filter(
-                user=user,
-                type=Transaction.EXPENSE,
-                date__year=year,
-                date__month=month,
-            )
-            .values("category")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")[:2]
-        )
-        top_categories = [
-            dict(Transaction.CATEGORY_CHOICES).get(i["category"], "Other")
-            for i in top_qs
-        ]
-
-    return {
-        "budget": budget_amount,
-        "expenses": expenses,
-        "remaining": remaining,
-        "status": status,
-        "message": message,
-        "top_categories": top_categories,
-    }
+    if analytics is None:
+        analytics = load_user_analytics(user)
+    evaluation = analytics.budget_evaluation()
+    for key in ("budget", "expenses", "remaining"):
+        evaluation[key] = from_minor(evaluation[key])
+    return evaluation
 
 # ===== END BUDGET HELPER =====
 
 
-
-# ===== NEW HELPER FUNCTION FOR SAVINGS GOAL EMI PLANNING =====
-def calculate_goal_plan(goal, current_saved):
+def spending_advice(current_balance, planned_amount):
     """
-    Intelligently calculate EMI plan for a savings goal.
-    
-    Args:
-        goal: SavingsGoal instance
-        current_saved: Decimal value of current savings towards goal
-    
-    Returns:
-        dict with keys:
-            - monthly_commitment: calculated/input monthly amount
-            - planned_months: calculated/input number of months
-            - remaining_to_save: amount still needed
-            - is_feasible: whether goal can be achieved
-            - expense_suggestions: list of category cuts if insufficient commitment
+    Classify a planned spend against the balance (both in paise); returns
+    (message, status).
     """
-    current_saved = Decimal(str(current_saved))
-    target = Decimal(str(goal.target_amount))
-    remaining = target - current_saved
-    
-    result = {
-        "monthly_commitment": goal.monthly_commitment or Decimal("0.00"),
-        "planned_months": goal.planned_months or 0,
-        "remaining_to_save": max(remaining, Decimal("0.00")),
-        "is_feasible": False,
-        "expense_suggestions": [],
-        "standard_emi_options": []  # 3, 6, 9, 12 months options
-    }
-    
-    if remaining <= 0:
-        result["is_feasible"] = True
-        result["planned_months"] = 0
-        result["monthly_commitment"] = Decimal("0.00")
-        return result
-    
-    # ===== If user provided planned_months, calculate monthly_commitment =====
-    if goal.planned_months and goal.planned_months > 0:
-        try:
-            monthly_needed = remaining / Decimal(str(goal.planned_months))
-            result["monthly_commitment"] = monthly_needed.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            result["planned_months"] = goal.planned_months
-            result["is_feasible"] = True
-        except Exception:
-            pass
-    
-    # ===== If user provided monthly_commitment, calculate planned_months =====
-    elif goal.monthly_commitment and goal.monthly_commitment > 0:
-        try:
-            commitment_decimal = Decimal(str(goal.monthly_commitment))
-            months_needed = math.ceil(float(remaining / commitment_decimal))
-            result["monthly_commitment"] = goal.monthly_commitment
-            result["planned_months"] = months_needed
-            result["is_feasible"] = True
-        except Exception:
-            pass
-    
-    # ===== Generate standard EMI options (3, 6, 9, 12 months) =====
-    for months in [3, 6, 9, 12]:
-        try:
-            # FIX: Convert months to string first to avoid Decimal InvalidOperation
-            emi = (remaining / Decimal(str(months))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-            result["standard_emi_options"].append({
-                "months": months,
-                "monthly_commitment": emi
-            })
-        except Exception:
-            # Fallback: skip if calculation fails
-            pass
-    
-    # ===== INTELLIGENT SUGGESTION: Analyze expenses if insufficient commitment =====
-    if result["monthly_commitment"] > 0 and goal.user:
-        # Check top 2 expense categories
-        top_expenses = (
-            Transaction.objects.filter(user=goal.user, type=Transaction.EXPENSE)
-            .values("category")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")[:2]
-        )
-        
-        # If we have expense data, suggest cuts
-        if top_expenses:
-            for top_expense in top_expenses:
-                try:
-                    category_name = dict(Transaction.CATEGORY_CHOICES).get(top_expense["category"], "Other")
-                    category_total = Decimal(str(top_expense["total"]))
-                    
-                    # Suggest 10% and 20% reduction
-                    cut_10_percent = (category_total * Decimal("0.10")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    cut_20_percent = (category_total * Decimal("0.20")).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                    
-                    result["expense_suggestions"].append({
-                        "category": category_name,
-                        "current_total": category_total,
-                        "cut_10_percent": cut_10_percent,
-                        "cut_20_percent": cut_20_percent,
-                        "remaining_after_10": category_total - cut_10_percent,
-                        "remaining_after_20": category_total - cut_20_percent,
-                    })
-                except Exception:
-                    pass
-    
-    return result
-# ===== END HELPER FUNCTION =====
-
+    remaining_balance = current_balance - planned_amount
 
+    if remaining_balance < 0:
+        return "Not Recommended: This spending would exceed your balance.", "danger"
+    # retain at least 20% of the balance: remaining >= balance / 5
+    if remaining_balance * 5 >= current_balance:
+        return "Safe to Spend: You will still retain at least 20% savings.", "success"
+    return "Warning: Low Savings. You will have less than 20% savings.", "warning"
 
 
 def register(request):
@@ -216,355 +106,236 @@ def register(request):
     return render(request, "registration/register.html", {"form": form})
 
 
-@login_required
-def dashboard(request):
-    today = timezone.now().date()
-    month = today.month
-    year = today.year
-
-    user_transactions = Transaction.objects.filter(user=request.user)
-
-    income_total = (
-        user_transactions.filter(type=Transaction.INCOME).aggregate(
-            total=Sum("amount")
-        )["total"]
-        or Decimal("0.00")
-    )
-    expense_total = (
-        user_transactions.filter(type=Transaction.EXPENSE).aggregate(
-            total=Sum("amount")
-        )["total"]
-        or Decimal("0.00")
+def _dashboard_analytics(user, today):
+    """Rollup analytics shared by the summary, health, goal and insights panels."""
+    return cached_for_user(
+        user.pk, "analytics", lambda: load_user_analytics(user, today), suffix=today.isoformat()
     )
-    current_balance = income_total - expense_total
 
-    # REMOVED: Monthly budget calculations (monthly_budget, budget_amount, month_expenses, budget_usage_percentage, budget_exceeded)
-
-    smart_form = SmartSpendingForm()
-    advisor_result = None
-    advisor_status = None
 
-    # projection feature removed
-    # (previous month and projection variables no longer used)
+def _current_balance(user):
+    return cached_for_user(user.pk, "balance", lambda: current_balance(user))
 
-    if request.method == "POST":
-        smart_form = SmartSpendingForm(request.POST)
-        if smart_form.is_valid():
-            planned_amount = smart_form.cleaned_data["planned_amount"]
-            remaining_balance = current_balance - planned_amount
-            savings_threshold = current_balance * Decimal("0.20")
 
-            if remaining_balance < 0:
-                advisor_result = (
-                    "Not Recommended: This spending would exceed your balance."
-                )
-                advisor_status = "danger"
-            elif remaining_balance >= savings_threshold:
-                advisor_result = (
-                    "Safe to Spend: You will still retain at least 20% savings."
-                )
-                advisor_status = "success"
-            else:
-                advisor_result = (
-                    "Warning: Low Savings. You will have less than 20% savings."
-                )
-                advisor_status = "warning"
-        else:
-            messages.error(request, "Please enter a valid planned amount.")
+def summary_panel(user, today):
+    analytics = _dashboard_analytics(user, today)
+    # single conversion from paise at the template boundary
+    return {
+        "income_total": from_minor(analytics.income_total),
+        "expense_total": from_minor(analytics.expense_total),
+        "budget_eval": evaluate_budget(user, analytics),
+    }
 
-    # projection calculations removed; no longer applicable
 
-    latest_transactions = user_transactions.select_related("user")[:5]
-    # form for modal goal creation
-    try:
-        goal_form = SavingsGoalForm()
-    except Exception:
-        goal_form = None
-    # base context (keeps core values separate from computed analytics)
-    # evaluate budget for new feature
-    budget_eval = evaluate_budget(request.user)
-
-    base_context = {
-        "income_total": income_total,
-        "expense_total": expense_total,
-        "current_balance": current_balance,
-        # keep the new evaluation dict
-        "budget_eval": budget_eval,
-        "smart_form": smart_form,
-        "advisor_result": advisor_result,
-        "advisor_status": advisor_status,
-        "latest_transactions": latest_transactions,
-        "form": goal_form,
+def health_panel(user, today):
+    # Financial Health Score (0-100) and its trend, read from the monthly
+    # snapshots that tracker.signals keeps current; computed from the rollups
+    # only when the current month has no snapshot yet
+    snapshots = recent_snapshots(user, 12, today)
+    trend = [(f"{s.month:02d}/{s.year}", float(s.score)) for s in snapshots]
+    if snapshots and (snapshots[-1].year, snapshots[-1].month) == (today.year, today.month):
+        health = snapshot_health(snapshots[-1])
+    else:
+        health = _dashboard_analytics(user, today).health()
+        trend = trend[-11:] + [(f"{today.month:02d}/{today.year}", float(from_minor(health["score"])))]
+    return {
+        "health_score": float(from_minor(health["score"])),
+        "health_color": health["color"],
+        "health_label": health["label"],
+        "health_suggestions": health["suggestions"],
+        "health_trend_labels": json.dumps([label for label, _ in trend]),
+        "health_trend_values": json.dumps([score for _, score in trend]),
     }
 
-    # --- Advanced Financial Intelligence ---
-    from decimal import getcontext
-    from datetime import date, timedelta
-
-    getcontext().prec = 6
-
-    today_date = today
-    # helper: last n months boundaries
-    def month_start(year, month):
-        return date(year, month, 1)
-
-    def previous_month(year, month, n=1):
-        y = year
-        m = month - n
-        while m <= 0:
-            m += 12
-            y -= 1
-        return y, m
-
-    # gather last 3 and 6 months transactions
-    last_3_months = []
-    last_6_months = []
-    for i in range(1, 7):
-        y, m = previous_month(year, month, i)
-        last_6_months.append((y, m))
-    last_3_months = last_6_months[:3]
-
-    def sum_for_month(y, m, ttype=None):
-        qs = user_transactions.filter(date__year=y, date__month=m)
-        if ttype:
-            qs = qs.filter(type=ttype)
-        return qs.aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-
-    # month-over-month and 3-month rolling averages
-    monthly_incomes = []
-    monthly_expenses = []
-    for (y, m) in last_3_months:
-        monthly_incomes.append(sum_for_month(y, m, Transaction.INCOME))
-        monthly_expenses.append(sum_for_month(y, m, Transaction.EXPENSE))
-    def rolling_avg(values):
-        cleaned_values = [v for v in values if v is not None]
-        if not cleaned_values:
-            return Decimal("0.00")
-
-        try:
-            avg = sum(cleaned_values, Decimal("0.00")) / Decimal(len(cleaned_values))
-            return avg.quantize(Decimal("0.01"))
-        except Exception:
-            return Decimal("0.00")
-    
-    # REMOVED: Predicted balance calculations (predicted_income, predicted_expense, predicted_balance, mom_change)
 
-    # top 3 spending categories
-    top_categories_qs = (
-        user_transactions.filter(type=Transaction.EXPENSE)
-        .values("category")
-        .annotate(total=Sum("amount"))
-        .order_by("-total")[:3]
-    )
-    top_categories = [ (dict(Transaction.CATEGORY_CHOICES).get(i['category'], 'Other'), float(i['total'])) for i in top_categories_qs ]
-
-    # abnormal transactions ( > 150% of category average)
-    abnormal = []
-    from django.db.models import Avg
-    category_avgs = (
-        user_transactions.filter(type=Transaction.EXPENSE)
-        .values("category")
-        .annotate(avg=Avg("amount"))
-    )
-    cat_avg_map = {c['category']: (c['avg'] or Decimal('0.00')) for c in category_avgs}
-    for t in user_transactions.filter(type=Transaction.EXPENSE).order_by("-amount")[:50]:
-        avg = cat_avg_map.get(t.category, Decimal("0.00"))
-        if avg and t.amount > (avg * Decimal("1.5")):
-            abnormal.append({"id": t.id, "amount": t.amount, "category": t.get_category_display(), "date": t.date, "reason": "High relative to category average"})
-
-    # spending spikes detection (daily spikes)
-    spikes = []
-    daily_totals = (
-        user_transactions.filter(type=Transaction.EXPENSE)
-        .values("date")
-        .annotate(total=Sum("amount"))
-        .order_by("-total")[:30]
-    )
-    if daily_totals:
-        avg_daily = sum([d['total'] for d in daily_totals]) / Decimal(len(daily_totals))
-        for d in daily_totals:
-            if d['total'] > (avg_daily * Decimal("1.5")):
-                spikes.append({"date": d['date'], "total": d['total']})
-
-    # Financial Health Score calculation (0-100)
-    # Components weights: savings_rate (30), expense_ratio (20), budget_discipline (20), consistency (15), over_budget_freq (15)
-    health_score = Decimal("0.00")
-    suggestions = []
-
-    # savings rate
-    total_income_all = user_transactions.filter(type=Transaction.INCOME).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-    total_expense_all = user_transactions.filter(type=Transaction.EXPENSE).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-    savings = total_income_all - total_expense_all
-    savings_rate = Decimal("0.00")
-    if total_income_all and total_income_all > Decimal("0.00"):
-        savings_rate = (savings / total_income_all) * Decimal("100.0")
-    # normalized to 0-30
-    score_savings = min(max(savings_rate, Decimal("0.0")), Decimal("30.0")) * Decimal("0.3")
-
-    # expense-to-income: lower is better
-    expense_ratio = Decimal("100.0")
-    if total_income_all and total_income_all > Decimal("0.00"):
-        expense_ratio = (total_expense_all / total_income_all) * Decimal("100.0")
-    # map to 0-20 where lower ratio gives higher score
-    score_expense = max(Decimal("0.0"), (Decimal("100.0") - expense_ratio)) * Decimal("0.2")
-
-    # budget discipline: proportion of months within budget in last 6 months
-    budgets_checked = 0
-    budgets_within = 0
-    for (y, m) in last_6_months:
-        mb = MonthlyBudget.objects.filter(user=request.user, year=y, month=m).first()
-        if mb:
-            budgets_checked += 1
-            exp = user_transactions.filter(type=Transaction.EXPENSE, date__year=y, date__month=m).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-            if exp <= mb.budget_amount:
-                budgets_within += 1
-    budget_discipline = Decimal("0.0")
-    if budgets_checked:
-        budget_discipline = (Decimal(budgets_within) / Decimal(budgets_checked)) * Decimal("100.0")
-    score_budget = (budget_discipline / Decimal("100.0")) * Decimal("20.0")
-
-    # consistency: months with at least one transaction
-    months_with_tx = 0
-    months_total = 6
-    for (y, m) in last_6_months:
-        if user_transactions.filter(date__year=y, date__month=m).exists():
-            months_with_tx += 1
-    consistency = (Decimal(months_with_tx) / Decimal(months_total)) * Decimal("100.0")
-    score_consistency = (consistency / Decimal("100.0")) * Decimal("15.0")
-
-    # over-budget frequency: penalize for months over budget
-    over_budget = Decimal(budgets_checked - budgets_within) if budgets_checked else Decimal("0.0")
-    over_budget_freq = (over_budget / (Decimal(budgets_checked) if budgets_checked else Decimal(1))) * Decimal("100.0")
-    # lower is better, so invert to score out of 15
-    score_over_budget = max(Decimal("0.0"), (Decimal("100.0") - over_budget_freq)) / Decimal("100.0") * Decimal("15.0")
-
-    health_score = (score_savings + score_expense + score_budget + score_consistency + score_over_budget).quantize(Decimal("0.01"))
-
-    # color coding
-    health_color = "danger"
-    health_label = "Poor"
-    if health_score >= 80:
-        health_color = "success"
-        health_label = "Excellent"
-    elif health_score >= 60:
-        health_color = "primary"
-        health_label = "Good"
-    elif health_score >= 40:
-        health_color = "warning"
-        health_label = "Average"
-
-    # suggestions based on weak components
-    if score_savings < Decimal("6.0"):
-        suggestions.append("Increase monthly savings: target at least 10-20% of income.")
-    if score_budget < Decimal("8.0"):
-        suggestions.append("Set or adjust monthly budgets and review top spending categories.")
-    if score_consistency < Decimal("8.0"):
-        suggestions.append("Track transactions consistently every month to improve insights.")
-    if score_over_budget < Decimal("8.0"):
-        suggestions.append("Reduce frequency of overspending months; automate small savings.")
-
-    # ===== UPDATED GOAL INTELLIGENCE - NO AUTO-ACHIEVEMENT =====
+def goal_panel(user, today):
     # Pick active goal if any (only if not manually completed)
     active_goal = SavingsGoal.objects.filter(
-        user=request.user, 
-        end_date__gte=today_date,
-        is_completed=False  # NEW: Only show active, non-completed goals
+        user=user,
+        end_date__gte=today,
+        is_completed=False,
     ).order_by("end_date").first()
-    
-    goal_info = None
-    if active_goal:
-        # Compute current saved towards goal period
-        saved = (
-            user_transactions.filter(type=Transaction.INCOME, date__gte=active_goal.start_date)
-            .aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        ) - (
-            user_transactions.filter(type=Transaction.EXPENSE, date__gte=active_goal.start_date)
-            .aggregate(total=Sum("amount"))["total"]
-            or Decimal("0.00")
-        )
-        saved = Decimal(str(saved))
-        
-        # ===== NEW: Check if sufficient balance without auto-completing =====
-        has_sufficient = active_goal.has_sufficient_balance(saved)
-        
-        # ===== NEW: Use helper to calculate EMI plan =====
-        goal_plan = calculate_goal_plan(active_goal, saved)
-        
-        goal_info = {
-            "name": active_goal.name,
-            "target": active_goal.target_amount,
-            "current_saved": saved,
-            "days_remaining": active_goal.days_remaining,
-            "progress_pct": float((saved / active_goal.target_amount * Decimal('100.0')) if active_goal.target_amount and active_goal.target_amount > 0 else Decimal('0.0')),
-            # ===== NEW FIELDS =====
-            "has_sufficient_balance": has_sufficient,  # Show message instead of auto-complete
-            "remaining_to_save": goal_plan["remaining_to_save"],
-            "monthly_commitment": goal_plan["monthly_commitment"],
-            "planned_months": goal_plan["planned_months"],
-            "standard_emi_options": goal_plan["standard_emi_options"],  # 3, 6, 9, 12 months
-            "expense_suggestions": goal_plan["expense_suggestions"],  # Category cut recommendations
-            # ===== END NEW FIELDS =====
-        }
-    # ===== END UPDATED GOAL INTELLIGENCE =====
-
-    # Award simple badges
-    def award_badge_if_needed(user, badge_key):
-        if not AchievementBadge.objects.filter(user=user, badge=badge_key).exists():
-            AchievementBadge.objects.create(user=user, badge=badge_key)
-
-    # Savings Champion: average savings rate >= 15%
-    try:
-        if savings_rate >= Decimal("15.0"):
-            award_badge_if_needed(request.user, AchievementBadge.SAVINGS_CHAMPION)
-    except Exception:
-        pass
+    if not active_goal:
+        return {"goal_info": None}
 
-    # Budget Master: within budget for last 3 checked months
-    try:
-        if budgets_checked and budgets_within >= min(3, budgets_checked):
-            award_badge_if_needed(request.user, AchievementBadge.BUDGET_MASTER)
-    except Exception:
-        pass
+    # ===== UPDATED GOAL INTELLIGENCE - NO AUTO-ACHIEVEMENT =====
+    saved = net_saved_since(user, active_goal.start_date, _current_balance(user))
+    top_expenses = [
+        {"category": code, "total": total}
+        for code, total in _dashboard_analytics(user, today).top_categories(2)
+    ]
+    return {"goal_info": goal_summary(active_goal, saved, top_expenses)}
 
-    # Expense Reducer: last-month expense < previous-month expense by >=10%
-    try:
-        if len(monthly_expenses) >= 2 and monthly_expenses[0] < monthly_expenses[1] * Decimal("0.9"):
-            award_badge_if_needed(request.user, AchievementBadge.EXPENSE_REDUCER)
-    except Exception:
-        pass
 
-    badges = AchievementBadge.objects.filter(user=request.user)
+def insights_panel(user, today):
+    """The slowest panel: anomaly detection reads the whole expense history."""
+    analytics = _dashboard_analytics(user, today)
+
+    # top 3 spending categories
+    top_categories = [
+        (CATEGORY_LABELS.get(code, "Other"), float(from_minor(total)))
+        for code, total in analytics.top_categories(3)
+    ]
+
+    # unusual expenses (rolling per-category median/MAD) and daily spikes
+    abnormal, spikes = detect_anomalies(user)
 
     insights = []
     # Build a few natural insights
-    # REMOVED: Month-over-month expense change insight (mom_change)
     if top_categories:
         insights.append(f"Top spending categories: {', '.join([c[0] for c in top_categories])}.")
     if spikes:
-        insights.append(f"Detected {len(spikes)} spending spikes in recent data.")
+        insights.append(f"Detected {len(spikes)} spending spikes in your history.")
     if abnormal:
         insights.append(f"{len(abnormal)} transactions appear unusually large for their category.")
 
-    # computed analytics context
-    computed_context = {
-        "health_score": float(health_score),
-        "health_color": health_color,
-        "health_label": health_label,
-        "health_suggestions": suggestions,
-        # REMOVED: predicted_income, predicted_expense, predicted_balance, financial_risk
-        "goal_info": goal_info,
-        "badges": badges,
+    return {
         "insights": insights,
         "top_categories": top_categories,
         "abnormal_transactions": abnormal,
         "spikes": spikes,
     }
 
-    # merge base and computed contexts for final render
-    final_context = {**base_context, **computed_context}
-    return render(request, "tracker/dashboard.html", final_context)
 
+def badges_panel(user, today):
+    # Badges are awarded by tracker.badges when data changes, not on reads.
+    return {"badges": list(AchievementBadge.objects.filter(user=user))}
+
+
+def transactions_panel(user, today):
+    return {"latest_transactions": list(Transaction.objects.filter(user=user)[:5])}
+
+
+# name -> context builder; each renders tracker/partials/panels/<name>.html
+DASHBOARD_PANELS = {
+    "summary": summary_panel,
+    "health": health_panel,
+    "goal": goal_panel,
+    "insights": insights_panel,
+    "badges": badges_panel,
+    "transactions": transactions_panel,
+}
+
+
+def _panel_html(user, name, today):
+    """One dashboard panel rendered as an HTML fragment, cached per user version."""
+    builder = DASHBOARD_PANELS[name]
+    return cached_for_user(
+        user.pk,
+        f"panel-{name}",
+        lambda: render_to_string(f"tracker/partials/panels/{name}.html", builder(user, today)),
+        suffix=today.isoformat(),
+    )
+
+
+def _dashboard_page(request, balance, panels=None):
+    """Render the dashboard; ``panels`` maps names to prerendered fragments."""
+    smart_form = SmartSpendingForm()
+    advisor_result = None
+    advisor_status = None
+
+    if request.method == "POST":
+        smart_form = SmartSpendingForm(request.POST)
+        # non-JS fallback; the dashboard normally posts to spending_advisor
+        if smart_form.is_valid():
+            advisor_result, advisor_status = spending_advice(
+                balance, to_minor(smart_form.cleaned_data["planned_amount"])
+            )
+        else:
+            messages.error(request, "Please enter a valid planned amount.")
+
+    return render(request, "tracker/dashboard.html", {
+        "current_balance": from_minor(balance),
+        "panels": panels,
+        "smart_form": smart_form,
+        "advisor_result": advisor_result,
+        "advisor_status": advisor_status,
+        # form for modal goal creation
+        "form": SavingsGoalForm(),
+    })
+
+
+@login_required
+def dashboard(request):
+    """
+    Page shell: only the balance is looked up here. panels.js fills in
+    the panels from dashboard_panel, so the slowest analytic no longer
+    delays the page.
+    """
+    return _dashboard_page(request, _current_balance(request.user))
+
+
+# Bounded pool the async dashboard builds its panels on. Every thread holds
+# its own database connection, so this also caps the connections it opens.
+DASHBOARD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(settings, "TRACKER_DASHBOARD_THREADS", 4),
+    thread_name_prefix="dashboard",
+)
+
+
+def _in_dashboard_thread(func, *args):
+    # pool threads live outside the request cycle, so recycle their database
+    # connections the way request_started/request_finished do; the request's
+    # profile (if sampled) comes along in the context sync_to_async copies
+    close_old_connections()
+    try:
+        with profile_queries(connection):
+            return func(*args)
+    finally:
+        close_old_connections()
+
+
+def _in_dashboard_pool(func, *args):
+    return sync_to_async(_in_dashboard_thread, thread_sensitive=False, executor=DASHBOARD_EXECUTOR)(
+        func, *args
+    )
+
+
+@login_required
+async def dashboard_full(request):
+    """
+    The whole dashboard in one response, for clients without JavaScript.
+    The balance and the panels are independent query groups, so they are
+    built concurrently on DASHBOARD_EXECUTOR; the page renders once all of
+    them are done.
+    """
+    user = await request.auser()
+    today = timezone.now().date()
+    names = list(DASHBOARD_PANELS)
+    balance, *fragments = await asyncio.gather(
+        _in_dashboard_pool(_current_balance, user),
+        *(_in_dashboard_pool(_panel_html, user, name, today) for name in names),
+    )
+    # sessions, messages and the auth context processor are synchronous
+    return await sync_to_async(_dashboard_page)(request, balance, dict(zip(names, fragments)))
+
+
+@login_required
+@conditional_for_user
+def dashboard_panel(request, name):
+    """One dashboard panel as an HTML fragment, cached per user version."""
+    if name not in DASHBOARD_PANELS:
+        raise Http404("Unknown dashboard panel.")
+    return HttpResponse(_panel_html(request.user, name, timezone.now().date()))
+
+
+@login_required
+@require_POST
+def spending_advisor(request):
+    """Smart Spending advisor verdict as JSON; only needs the current balance."""
+    form = SmartSpendingForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    planned_amount = to_minor(form.cleaned_data["planned_amount"])
+    balance = _current_balance(request.user)
+    message, status = spending_advice(balance, planned_amount)
+    return JsonResponse({
+        "message": message,
+        "status": status,
+        "current_balance": str(from_minor(balance)),
+        "remaining_balance": str(from_minor(balance - planned_amount)),
+    })
 
 
 class SavingsGoalCreateView(LoginRequiredMixin, CreateView):
@@ -584,8 +355,43 @@ class SavingsGoalCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+def _user_goal_plans(user):
+    today = timezone.now().date()
+    return cached_for_user(
+        user.pk, "goals", lambda: plan_goals(user, today), suffix=today.isoformat()
+    )
+
+
+def goal_json(plan):
+    money = ("target", "current_saved", "required_monthly_saving", "remaining_to_save", "monthly_commitment")
+    data = {key: str(value) if key in money else value for key, value in plan.items()}
+    data["start_date"] = plan["start_date"].isoformat()
+    data["end_date"] = plan["end_date"].isoformat()
+    data["progress_pct"] = round(float(plan["progress_pct"]), 2)
+    data["standard_emi_options"] = [
+        {"months": option["months"], "monthly_commitment": str(option["monthly_commitment"])}
+        for option in plan["standard_emi_options"]
+    ]
+    data["expense_suggestions"] = [
+        {key: value if key == "category" else str(value) for key, value in suggestion.items()}
+        for suggestion in plan["expense_suggestions"]
+    ]
+    return data
 
 
+@login_required
+def goal_list(request):
+    """Every savings goal with its EMI plan, planned together in one pass."""
+    return render(request, "tracker/goal_list.html", {
+        "goals": _user_goal_plans(request.user),
+        "form": SavingsGoalForm(),
+    })
+
+
+@login_required
+def goal_list_api(request):
+    return JsonResponse({"results": [goal_json(plan) for plan in _user_goal_plans(request.user)]})
+
 
 class TransactionCreateView(LoginRequiredMixin, CreateView):
     model = Transaction
@@ -626,6 +432,189 @@ class TransactionDeleteView(LoginRequiredMixin, DeleteView):
         return super().delete(request, *args, **kwargs)
 
 
+def transaction_json(tx):
+    return {
+        "id": tx.pk,
+        "date": tx.date.isoformat(),
+        "type": tx.type,
+        "type_display": tx.get_type_display(),
+        "category": tx.category,
+        "category_display": tx.get_category_display(),
+        "description": tx.description,
+        "amount": str(tx.amount),
+        "edit_url": reverse("tracker:transaction_edit", args=[tx.pk]),
+        "delete_url": reverse("tracker:transaction_delete", args=[tx.pk]),
+    }
+
+
+def _filtered_transactions(request):
+    """The user's transactions narrowed by TransactionFilterForm (GET params)."""
+    filter_form = TransactionFilterForm(request.GET or None)
+    transactions = Transaction.objects.filter(user=request.user)
+    if filter_form.is_valid():
+        transactions = filter_form.filter(transactions)
+    return filter_form, transactions
+
+
+def _page_size(request):
+    try:
+        return int(request.GET.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return DEFAULT_PAGE_SIZE
+
+
+@login_required
+def transaction_list(request):
+    """
+    Full transaction history. transactions.js appends further pages from
+    transaction_list_api; without JS the "Load more" link follows the cursor.
+    """
+    filter_form, transactions = _filtered_transactions(request)
+    try:
+        rows, next_cursor = keyset_page(
+            transactions, request.GET.get("cursor"), _page_size(request)
+        )
+    except InvalidCursor:
+        rows, next_cursor = keyset_page(transactions, limit=_page_size(request))
+
+    query = request.GET.copy()
+    query.pop("cursor", None)
+    return render(request, "tracker/transaction_list.html", {
+        "filter_form": filter_form,
+        "transactions": rows,
+        "next_cursor": next_cursor,
+        "filter_query": query.urlencode(),
+    })
+
+
+@login_required
+def transaction_list_api(request):
+    """JSON page of transactions: ?cursor=&limit=&type=&category=&start_date=&end_date="""
+    filter_form, transactions = _filtered_transactions(request)
+    if filter_form.is_bound and not filter_form.is_valid():
+        return JsonResponse({"errors": filter_form.errors}, status=400)
+    try:
+        rows, next_cursor = keyset_page(
+            transactions, request.GET.get("cursor"), _page_size(request)
+        )
+    except InvalidCursor as exc:
+        return JsonResponse({"errors": {"cursor": [str(exc)]}}, status=400)
+
+    return JsonResponse({
+        "results": [transaction_json(tx) for tx in rows],
+        "next_cursor": next_cursor,
+    })
+
+
+def _search(request):
+    """(form, transactions, next_offset) for TransactionSearchForm (GET params)."""
+    form = TransactionSearchForm(request.GET or None)
+    if not form.is_valid():
+        return form, [], None
+    try:
+        offset = int(request.GET.get("offset", 0))
+    except ValueError:
+        offset = 0
+    rows, next_offset = search_transactions(
+        request.user, form.cleaned_data["q"], form.cleaned_data, _page_size(request), offset
+    )
+    return form, rows, next_offset
+
+
+@login_required
+def transaction_search(request):
+    """Transactions whose description matches ?q=, best match first."""
+    form, rows, next_offset = _search(request)
+    query = request.GET.copy()
+    query.pop("offset", None)
+    return render(request, "tracker/transaction_search.html", {
+        "search_form": form,
+        "transactions": rows,
+        "next_offset": next_offset,
+        "search_query": query.urlencode(),
+    })
+
+
+@login_required
+def transaction_search_api(request):
+    """JSON search results: ?q=&offset=&limit=&type=&category=&start_date=&end_date="""
+    form, rows, next_offset = _search(request)
+    if form.is_bound and not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+    return JsonResponse({
+        "results": [{**transaction_json(tx), "rank": tx.rank} for tx in rows],
+        "next_offset": next_offset,
+    })
+
+
+@login_required
+def import_statement(request):
+    """Upload a CSV bank statement; rows already imported are skipped."""
+    result = None
+    if request.method == "POST":
+        form = StatementImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data["statement"]
+            stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+            try:
+                result = import_transactions(request.user, stream)
+            except StatementError as exc:
+                form.add_error("statement", str(exc))
+            except UnicodeDecodeError:
+                form.add_error("statement", "The statement must be a UTF-8 encoded CSV file.")
+            else:
+                messages.success(
+                    request,
+                    f"Imported {result.created} transactions "
+                    f"({result.duplicates} already present, {result.error_count} skipped).",
+                )
+    else:
+        form = StatementImportForm()
+
+    return render(request, "tracker/import_statement.html", {"form": form, "result": result})
+
+
+@login_required
+def recurring_list(request):
+    """
+    The user's recurring transactions, with a form adding one. Occurrences
+    already due are created right away; later ones by materialize_recurring.
+    """
+    if request.method == "POST":
+        form = RecurringTransactionForm(request.POST)
+        if form.is_valid():
+            rule = form.save(commit=False)
+            rule.user = request.user
+            rule.next_run_date = rule.start_date
+            rule.save()
+            created = sum(
+                count for _, count in materialize_due(user_ids=[request.user.pk])
+            )
+            messages.success(
+                request, f"Recurring transaction added ({created} occurrences created so far)."
+            )
+            return redirect("tracker:recurring_list")
+        messages.error(request, "Please correct the errors below.")
+    else:
+        form = RecurringTransactionForm()
+
+    return render(request, "tracker/recurring_list.html", {
+        "form": form,
+        "rules": RecurringTransaction.objects.filter(user=request.user),
+    })
+
+
+@login_required
+@require_POST
+def recurring_delete(request, pk):
+    """Stop a recurring transaction; the occurrences already created stay."""
+    deleted, _ = RecurringTransaction.objects.filter(user=request.user, pk=pk).delete()
+    if not deleted:
+        raise Http404("No such recurring transaction.")
+    messages.success(request, "Recurring transaction stopped.")
+    return redirect("tracker:recurring_list")
+
+
 @login_required
 def manage_budget(request):
     today = timezone.now().date()
@@ -655,62 +644,52 @@ def manage_budget(request):
     )
 
 
-@login_required
-def reports(request):
+def _report_filters(request):
+    """
+    ReportFilterForm (GET) resolved to
+    ``(filter_form, selected_year, selected_month, period)``.
+    """
     filter_form = ReportFilterForm(request.GET or None)
-    transactions = Transaction.objects.filter(user=request.user)
-
-    selected_month = None
-    selected_year = None
-
+    selected_year = selected_month = period = None
     if filter_form.is_valid():
         selected_month = filter_form.cleaned_data.get("month")
         selected_year = filter_form.cleaned_data.get("year")
+        period = report_period(selected_year, selected_month)
+        if period:
+            selected_year = period[0].year
+    return filter_form, selected_year, selected_month, period
 
-        if selected_year:
-            transactions = transactions.filter(date__year=selected_year)
-        if selected_month:
-            transactions = transactions.filter(date__month=selected_month)
 
-    total_income = (
-        transactions.filter(type=Transaction.INCOME).aggregate(total=Sum("amount"))[
-            "total"
-        ]
-        or Decimal("0.00")
-    )
-    total_expense = (
-        transactions.filter(type=Transaction.EXPENSE).aggregate(total=Sum("amount"))[
-            "total"
-        ]
-        or Decimal("0.00")
-    )
-
-    category_data = (
-        transactions.filter(type=Transaction.EXPENSE)
-        .values("category")
-        .annotate(total=Sum("amount"))
-        .order_by("category")
-    )
+def _report_transactions(request):
+    """
+    Apply ReportFilterForm (GET) to the user's transactions. Returns
+    ``(filter_form, transactions, selected_year, selected_month)``.
+    """
+    filter_form, selected_year, selected_month, period = _report_filters(request)
+    transactions = Transaction.objects.filter(user=request.user)
+    if period:
+        # date-range filters (rather than __year/__month) keep index range scans
+        transactions = transactions.filter(date__range=period)
+    return filter_form, transactions, selected_year, selected_month
 
-    category_labels = []
-    category_values = []
 
-    category_display_map = dict(Transaction.CATEGORY_CHOICES)
-    for item in category_data:
-        category_labels.append(category_display_map.get(item["category"], "Other"))
-        category_values.append(float(item["total"]))
+@login_required
+@conditional_for_user
+def reports(request):
+    filter_form, transactions, selected_year, selected_month = _report_transactions(request)
 
-    income_expense_labels = ["Income", "Expense"]
-    income_expense_values = [float(total_income), float(total_expense)]
+    # totals come from the monthly rollups rather than scanning transactions
+    totals = period_totals(request.user, selected_year, selected_month)
 
     context = {
         "filter_form": filter_form,
-        "total_income": total_income,
-        "total_expense": total_expense,
-        "category_labels_json": mark_safe(json.dumps(category_labels)),
-        "category_values_json": mark_safe(json.dumps(category_values)),
-        "income_expense_labels_json": mark_safe(json.dumps(income_expense_labels)),
-        "income_expense_values_json": mark_safe(json.dumps(income_expense_values)),
+        "total_income": from_minor(totals["income"]),
+        "total_expense": from_minor(totals["expense"]),
+        # the charts fetch their data from chart_data with the same filters
+        "chart_query": urlencode(
+            {key: value for key, value in (("year", selected_year), ("month", selected_month)) if value}
+        ),
+        "spend_granularity": "daily" if selected_month else "monthly",
         "selected_month": selected_month,
         "selected_year": selected_year,
         "transactions": transactions.order_by("-date", "-created_at")[:50],
@@ -718,3 +697,60 @@ def reports(request):
 
     return render(request, "tracker/reports.html", context)
 
+
+@login_required
+@conditional_for_user
+def chart_data(request, name):
+    """
+    One report chart's data as compact JSON (tracker.charts), for the report
+    filters in the query string; ``points`` caps the length of a series.
+    """
+    if name not in CHARTS:
+        raise Http404("Unknown chart.")
+    _, selected_year, selected_month, _ = _report_filters(request)
+    try:
+        points = int(request.GET.get("points", DEFAULT_POINTS))
+    except ValueError:
+        return JsonResponse({"errors": {"points": ["Enter a whole number."]}}, status=400)
+    payload = chart_payload(request.user, name, selected_year, selected_month, points)
+    return HttpResponse(payload, content_type="application/json")
+
+
+@login_required
+def export_transactions(request, fmt):
+    """Stream the report's transactions (same month/year filters) as CSV or JSONL."""
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export format.")
+    _, transactions, selected_year, selected_month = _report_transactions(request)
+
+    filename = "savify-transactions"
+    if selected_year:
+        filename += f"-{selected_year}"
+    if selected_month:
+        filename += f"-{selected_month:02d}"
+
+    response = StreamingHttpResponse(
+        stream_export(transactions, fmt), content_type=EXPORT_FORMATS[fmt]
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
+
+
+
+@staff_member_required
+def profiling_report(request):
+    """Staff-only table of the slowest endpoints from the profiling middleware."""
+    if request.method == "POST" and request.POST.get("reset"):
+        profile_stats.reset()
+        return redirect("tracker:profiling")
+
+    context = {
+        "enabled": settings.TRACKER_PROFILING_ENABLED,
+        "sample_rate": settings.TRACKER_PROFILING_SAMPLE_RATE,
+        "endpoints": profile_stats.summary(),
+        "cache_stats": {
+            name: cache_stats(name)
+            for name in ("analytics", "balance", *(f"panel-{panel}" for panel in DASHBOARD_PANELS))
+        },
+    }
+    return render(request, "tracker/profiling.html", context)